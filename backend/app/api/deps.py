@@ -1,38 +1,99 @@
-from typing import Generator, Optional
+from typing import Any, AsyncGenerator, Callable, Generator, TypeVar
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlmodel import Session, select
+from jose import JWTError
+from pydantic import ValidationError
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
-from app.core.security import get_password_hash
-from app.db.session import session_scope
+from app.core.security import decode_access_token
+from app.db.session import async_read_session_scope, async_session_scope, read_session_scope, session_scope
 from app.models.user import User
-from app.schemas.auth import TokenPayload
+from app.services.audit import audit_actor
+from app.services.users import DEFAULT_USER_EMAIL, ensure_default_user, get_cached_user, load_user_for_auth
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
+T = TypeVar("T")
+
+
+class Database:
+    """Runs synchronous service functions against the request's session.
+
+    With an ``AsyncSession`` the function is driven by ``run_sync`` on the event
+    loop's aiosqlite connection, so no threadpool worker is held for the round trip.
+    A plain ``Session`` keeps the previous behaviour and runs in the threadpool.
+
+    Read-only handles close the session after every call. Returned objects stay
+    loaded but detached, and the pooled connection goes back to the pool instead
+    of being held while the request does non-database work.
+    """
+
+    def __init__(self, session: Session | AsyncSession, release_after_run: bool = False) -> None:
+        self.session = session
+        self.release_after_run = release_after_run
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if isinstance(self.session, AsyncSession):
+            try:
+                return await self.session.run_sync(fn, *args, **kwargs)
+            finally:
+                if self.release_after_run:
+                    await self.session.close()
+        return await run_in_threadpool(self._run_sync, fn, *args, **kwargs)
+
+    def _run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        try:
+            return fn(self.session, *args, **kwargs)
+        finally:
+            if self.release_after_run:
+                self.session.close()
+
 
 def get_session() -> Generator[Session, None, None]:
     with session_scope() as session:
         yield session
 
 
-def get_current_user(
+def get_read_session() -> Generator[Session, None, None]:
+    with read_session_scope() as session:
+        yield session
+
+
+async def _get_sync_db(session: Session = Depends(get_session)) -> Database:
+    return Database(session)
+
+
+async def _get_sync_read_db(session: Session = Depends(get_read_session)) -> Database:
+    return Database(session, release_after_run=True)
+
+
+async def _get_async_db() -> AsyncGenerator[Database, None]:
+    async with async_session_scope() as session:
+        yield Database(session)
+
+
+async def _get_async_read_db() -> AsyncGenerator[Database, None]:
+    async with async_read_session_scope() as session:
+        yield Database(session, release_after_run=True)
+
+
+get_db = _get_async_db if settings.database_async else _get_sync_db
+get_read_db = _get_async_read_db if settings.database_async else _get_sync_read_db
+
+
+async def get_current_user(
     request: Request,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     token: str | None = Depends(oauth2_scheme),
 ) -> User:
     if not settings.app_auth_enabled:
-        default_user = session.exec(select(User).where(User.email == "default@local")).first()
-        if default_user is None:
-            user = User(name="Household", role="admin", email="default@local", password_hash=get_password_hash("changeme"))
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-            return user
-        return default_user
+        user = get_cached_user(DEFAULT_USER_EMAIL) or await db.run(ensure_default_user)
+        audit_actor.set(user.id)
+        return user
     if token is None and request is not None:
         token = request.cookies.get("homeportal_token")
     if token is None:
@@ -48,12 +109,12 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        token_data = TokenPayload(**payload)
-    except JWTError as exc:
+        token_data = decode_access_token(token)
+    except (JWTError, ValidationError) as exc:
         raise credentials_exception from exc
 
-    user: Optional[User] = session.exec(select(User).where(User.email == token_data.sub)).first()
+    user = get_cached_user(token_data.sub) or await db.run(load_user_for_auth, token_data.sub)
     if user is None:
         raise credentials_exception
+    audit_actor.set(user.id)
     return user
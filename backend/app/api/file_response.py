@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# Read size when the server cannot send the file itself; the only per-download buffer.
+CHUNK_BYTES = 256 * 1024
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """The inclusive byte range requested by a single-range ``Range`` header, or None for the whole file.
+
+    Multiple ranges are answered with the whole file, which RFC 9110 allows.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes=") :].strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes.
+            length = int(last)
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if not first:
+        if length <= 0 or size == 0:
+            # An empty file has no last bytes to send.
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """Serves a file, or one byte range of it, without loading it into memory.
+
+    With a server that offers the ASGI zero-copy send extension the kernel
+    copies the file to the socket (``sendfile``); otherwise it is streamed in
+    ``CHUNK_BYTES`` reads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        etag: str,
+        media_type: Optional[str] = None,
+        byte_range: Optional[Tuple[int, int]] = None,
+        head: bool = False,
+    ) -> None:
+        self.path = path
+        self.start, end = byte_range if byte_range is not None else (0, size - 1)
+        self.length = max(end - self.start + 1, 0)
+        self.head = head
+        super().__init__(
+            status_code=206 if byte_range is not None else 200,
+            media_type=media_type or "application/octet-stream",
+            headers={"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "no-cache"},
+        )
+        self.headers["Content-Length"] = str(self.length)
+        if byte_range is not None:
+            self.headers["Content-Range"] = f"bytes {self.start}-{end}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.head or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({"type": ZEROCOPY_EXTENSION, "file": file.fileno(), "offset": self.start, "count": self.length})
+            return
+        async with await anyio.open_file(self.path, "rb") as file:
+            await file.seek(self.start, os.SEEK_SET)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # The file shrank underneath us; end the body rather than hang the client.
+            await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,60 @@
+from typing import Any, Callable, List, Optional, Type
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.api.deps import Database
+from app.services.pagination import InvalidCursor, Page
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    def __init__(self, limit: Optional[int], cursor: Optional[str], fields: Optional[List[str]]) -> None:
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+
+def page_params(schema: Type[BaseModel]) -> Callable[..., PageParams]:
+    """Build the ``limit``/``cursor``/``fields`` dependency for a list endpoint returning ``schema``."""
+    allowed = set(schema.model_fields)
+
+    def dependency(
+        limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for all rows"),
+        cursor: Optional[str] = Query(default=None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+        fields: Optional[str] = Query(default=None, description="Comma-separated fields to return (id is always included)"),
+    ) -> PageParams:
+        names = None
+        if fields:
+            names = list(dict.fromkeys(["id", *(name.strip() for name in fields.split(",") if name.strip())]))
+            unknown = sorted(set(names) - allowed)
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown fields: {', '.join(unknown)}"
+                )
+        return PageParams(limit, cursor, names)
+
+    return dependency
+
+
+async def fetch_page(db: Database, fn: Callable[..., Page], *args: Any, params: PageParams) -> Page:
+    try:
+        return await db.run(fn, *args, params.limit, params.cursor, params.fields)
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+
+
+def page_response(page: Page, schema: Type[BaseModel], response: Response) -> Any:
+    """Serialize a page, passing the next cursor in the ``X-Next-Cursor`` header.
+
+    Projected pages skip model validation and are encoded straight from the selected columns.
+    """
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if page.items and isinstance(page.items[0], dict):
+        return JSONResponse(jsonable_encoder(page.items), headers=headers)
+    response.headers.update(headers)
+    return [schema.model_validate(item, from_attributes=True) for item in page.items]
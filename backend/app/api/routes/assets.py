@@ -1,31 +1,90 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_current_user, get_db, get_read_db
 from app.models.user import User
-from app.schemas.asset import AssetImportResponse, AssetSummaryResponse
+from app.schemas.asset import (
+    AssetImportJobRead,
+    AssetLatestResponse,
+    AssetRollupCheckResponse,
+    AssetSeriesResponse,
+    AssetSummaryResponse,
+)
+from app.services import asset_analytics as analytics_service
+from app.services import asset_imports as import_service
 from app.services import assets as asset_service
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 
 
-@router.post("/import", response_model=AssetImportResponse, status_code=status.HTTP_202_ACCEPTED)
-def import_assets(
+@router.post("/import", response_model=AssetImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def import_assets(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> AssetImportResponse:
+) -> AssetImportJobRead:
     if file.content_type not in {"text/csv", "application/vnd.ms-excel"}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type")
-    return asset_service.import_asset_csv(session, file)
+    path = await run_in_threadpool(import_service.spool_upload, file.file)
+    job = await db.run(import_service.create_import_job, path, file.filename, current_user.id)
+    import_service.import_worker.submit(job.id)
+    return job
+
+
+@router.get("/import/{job_id}", response_model=AssetImportJobRead)
+async def read_import_job(job_id: int, db: Database = Depends(get_read_db)) -> AssetImportJobRead:
+    try:
+        return await db.run(import_service.get_import_job, job_id)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
 
 
 @router.get("/summary", response_model=AssetSummaryResponse)
-def summarize_assets(
+async def summarize_assets(
     from_month: Optional[str] = None,
     to_month: Optional[str] = None,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_read_db),
 ) -> AssetSummaryResponse:
-    return asset_service.summarize_assets(session, from_month, to_month)
+    return await db.run(asset_service.summarize_assets, from_month, to_month)
+
+
+@router.get("/summary/check", response_model=AssetRollupCheckResponse)
+async def check_asset_summary(
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    db: Database = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> AssetRollupCheckResponse:
+    return await db.run(asset_service.check_monthly_rollup, from_month, to_month)
+
+
+@router.post("/summary/rebuild", response_model=AssetRollupCheckResponse)
+async def rebuild_asset_summary(
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    db: Database = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> AssetRollupCheckResponse:
+    return await db.run(asset_service.rebuild_monthly_rollup, from_month, to_month)
+
+
+@router.get("/series", response_model=AssetSeriesResponse)
+async def asset_series(
+    account: Optional[str] = None,
+    currency: Optional[str] = None,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    window: int = Query(default=3, ge=1, le=60, description="Months in the rolling average"),
+    db: Database = Depends(get_read_db),
+) -> AssetSeriesResponse:
+    return await db.run(analytics_service.monthly_series, account, currency, from_month, to_month, window)
+
+
+@router.get("/latest", response_model=AssetLatestResponse)
+async def latest_asset_balances(
+    currency: Optional[str] = None,
+    db: Database = Depends(get_read_db),
+) -> AssetLatestResponse:
+    return await db.run(analytics_service.latest_balances, currency)
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import Database, get_current_user, get_read_db
+from app.models.user import User
+from app.schemas.audit import AuditLogRead
+from app.services import audit_archive
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+
+@router.get("", response_model=List[AuditLogRead])
+async def list_audit_log(
+    entity: Optional[str] = Query(default=None, description="Table name, e.g. todo"),
+    entity_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = Query(default=None, description="Exclusive; pass the last entry's at for older entries"),
+    before_id: Optional[int] = Query(default=None, description="With until: the last entry's id, to page through equal times"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Database = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> List[AuditLogRead]:
+    return await db.run(audit_archive.query_audit, entity, entity_id, since, until, limit, None, before_id)
@@ -1,11 +1,10 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlmodel import Session
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_db, get_read_db
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.security import PasswordHasherBusy, create_access_token, password_hasher
 from app.schemas.auth import LoginRequest, RegisterRequest, Token
 from app.schemas.user import UserRead
 from app.services import users as user_service
@@ -14,22 +13,32 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, session: Session = Depends(get_session)) -> UserRead:
+async def register(payload: RegisterRequest, db: Database = Depends(get_db)) -> UserRead:
     if not settings.app_auth_enabled:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Registration disabled")
-    user = user_service.create_user(session, payload)
+    try:
+        password_hash = await password_hasher.hash(payload.password)
+    except PasswordHasherBusy as error:
+        raise _busy(error) from error
+    user = await db.run(user_service.create_user, payload, password_hash)
     return UserRead(id=user.id, name=user.name, role=user.role, email=user.email)
 
 
 @router.post("/login", response_model=Token)
-def login(payload: LoginRequest, response: Response, session: Session = Depends(get_session)) -> Token:
+async def login(payload: LoginRequest, response: Response, db: Database = Depends(get_read_db)) -> Token:
     if not settings.app_auth_enabled:
         # Issue public token referencing default household user
         token = create_access_token({"sub": "default@local"}, expires_delta=timedelta(minutes=settings.access_token_expire_minutes))
         set_session_cookie(response, token)
         return Token(access_token=token)
-    user = user_service.authenticate_user(session, payload.email, payload.password)
-    if user is None:
+    user = await db.run(user_service.get_user_by_email, payload.email)
+    try:
+        valid = user is not None and user.password_hash is not None and await password_hasher.verify(
+            payload.password, user.password_hash
+        )
+    except PasswordHasherBusy as error:
+        raise _busy(error) from error
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
     token = create_access_token({"sub": user.email}, expires_delta=timedelta(minutes=settings.access_token_expire_minutes))
     set_session_cookie(response, token)
@@ -37,7 +46,7 @@ def login(payload: LoginRequest, response: Response, session: Session = Depends(
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(response: Response) -> None:
+async def logout(response: Response) -> None:
     response.delete_cookie("homeportal_token")
 
 
@@ -51,3 +60,7 @@ def set_session_cookie(response: Response, token: str) -> None:
         max_age=settings.access_token_expire_minutes * 60,
         path="/",
     )
+
+
+def _busy(error: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(error), headers={"Retry-After": "1"})
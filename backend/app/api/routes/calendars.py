@@ -0,0 +1,44 @@
+import asyncio
+import dataclasses
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.deps import Database, get_current_user, get_db, get_read_db
+from app.models.user import User
+from app.schemas.calendar import CalendarSourceCreate, CalendarSourceRead, CalendarSyncResult
+from app.services import calendar_sync as sync_service
+
+router = APIRouter(prefix="/calendars", tags=["calendars"])
+
+
+@router.get("", response_model=List[CalendarSourceRead])
+async def list_calendars(
+    db: Database = Depends(get_read_db), current_user: User = Depends(get_current_user)
+) -> List[CalendarSourceRead]:
+    sources = await db.run(sync_service.list_calendar_sources)
+    return [CalendarSourceRead.model_validate(source, from_attributes=True) for source in sources]
+
+
+@router.post("", response_model=CalendarSourceRead, status_code=status.HTTP_201_CREATED)
+async def create_calendar(
+    payload: CalendarSourceCreate, db: Database = Depends(get_db), current_user: User = Depends(get_current_user)
+) -> CalendarSourceRead:
+    source = await db.run(sync_service.create_calendar_source, payload)
+    return CalendarSourceRead.model_validate(source, from_attributes=True)
+
+
+@router.delete("/{calendar_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_calendar(
+    calendar_id: int, db: Database = Depends(get_db), current_user: User = Depends(get_current_user)
+) -> None:
+    try:
+        await db.run(sync_service.delete_calendar_source, calendar_id)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+
+
+@router.post("/sync", response_model=List[CalendarSyncResult])
+async def sync_calendars(current_user: User = Depends(get_current_user)) -> List[CalendarSyncResult]:
+    results = await asyncio.to_thread(sync_service.sync_calendars)
+    return [CalendarSyncResult(**dataclasses.asdict(result)) for result in results]
@@ -1,9 +1,9 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_current_user, get_db, get_read_db
+from app.api.pagination import PageParams, fetch_page, page_params, page_response
 from app.models.user import User
 from app.schemas.contact import ContactCreate, ContactRead, ContactUpdate
 from app.services import contacts as contact_service
@@ -12,42 +12,46 @@ router = APIRouter(prefix="/contacts", tags=["contacts"])
 
 
 @router.get("", response_model=List[ContactRead])
-def list_contacts(session: Session = Depends(get_session)) -> List[ContactRead]:
-    records = contact_service.list_contacts(session)
-    return [ContactRead.model_validate(record, from_attributes=True) for record in records]
+async def list_contacts(
+    response: Response,
+    params: PageParams = Depends(page_params(ContactRead)),
+    db: Database = Depends(get_read_db),
+) -> List[ContactRead]:
+    page = await fetch_page(db, contact_service.list_contacts, params=params)
+    return page_response(page, ContactRead, response)
 
 
 @router.post("", response_model=ContactRead, status_code=status.HTTP_201_CREATED)
-def create_contact(
+async def create_contact(
     payload: ContactCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ContactRead:
-    record = contact_service.create_contact(session, payload)
+    record = await db.run(contact_service.create_contact, payload)
     return ContactRead.model_validate(record, from_attributes=True)
 
 
 @router.patch("/{contact_id}", response_model=ContactRead)
-def update_contact(
+async def update_contact(
     contact_id: int,
     payload: ContactUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ContactRead:
     try:
-        record = contact_service.update_contact(session, contact_id, payload)
+        record = await db.run(contact_service.update_contact, contact_id, payload)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
     return ContactRead.model_validate(record, from_attributes=True)
 
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_contact(
+async def delete_contact(
     contact_id: int,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> None:
     try:
-        contact_service.delete_contact(session, contact_id)
+        await db.run(contact_service.delete_contact, contact_id)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
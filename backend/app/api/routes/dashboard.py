@@ -0,0 +1,26 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import Database, get_read_db
+from app.schemas.dashboard import DashboardRead
+from app.services import dashboard as dashboard_service
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardRead)
+async def read_dashboard(
+    day: Optional[date] = Query(default=None, description="Day whose events are listed; defaults to today"),
+    links: int = Query(default=8, ge=1, le=50, description="Most-clicked links"),
+    events: int = Query(default=20, ge=1, le=100, description="Events of the day"),
+    todos: int = Query(default=10, ge=1, le=100, description="Open todos, earliest due first"),
+    months: int = Query(default=3, ge=1, le=24, description="Latest months of asset totals"),
+    db: Database = Depends(get_read_db),
+) -> DashboardRead:
+    key = (day or date.today(), links, events, todos, months)
+    cached = dashboard_service.get_cached_dashboard(key)
+    if cached is not None:
+        return cached
+    return await db.run(dashboard_service.load_dashboard, key)
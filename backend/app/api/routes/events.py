@@ -1,48 +1,153 @@
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_current_user, get_db, get_read_db
+from app.api.pagination import PageParams, fetch_page, page_params, page_response
 from app.models.user import User
-from app.schemas.event import EventCreate, EventRead, EventUpdate
+from app.schemas.event import (
+    AssigneeBusy,
+    BusyInterval,
+    EventCreate,
+    EventOccurrenceUpdate,
+    EventRead,
+    EventUpdate,
+    EventWithConflicts,
+    FreeBusyRead,
+)
+from app.services import event_feed as feed_service
 from app.services import events as event_service
+from app.services import freebusy as freebusy_service
+from app.services.recurrence import InvalidRecurrence
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
 @router.get("", response_model=List[EventRead])
-def list_events(
+async def list_events(
+    response: Response,
     start: Optional[str] = Query(default=None, description="ISO8601 start datetime"),
     end: Optional[str] = Query(default=None, description="ISO8601 end datetime"),
-    session: Session = Depends(get_session),
+    params: PageParams = Depends(page_params(EventRead)),
+    db: Database = Depends(get_read_db),
 ) -> List[EventRead]:
-    records = event_service.list_events(session, start, end)
-    return [EventRead.model_validate(record, from_attributes=True) for record in records]
+    page = await fetch_page(db, event_service.list_events, start, end, params=params)
+    return page_response(page, EventRead, response)
 
 
-@router.post("", response_model=EventRead, status_code=status.HTTP_201_CREATED)
-def create_event(
+@router.get("/feed.ics", response_class=StreamingResponse)
+async def event_feed(request: Request, db: Database = Depends(get_read_db)) -> Response:
+    """Subscribable iCalendar feed of all events; ``If-None-Match`` with the current ETag gets a 304."""
+    etag = await db.run(feed_service.feed_etag)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if feed_service.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return StreamingResponse(_feed_chunks(db), media_type="text/calendar; charset=utf-8", headers=headers)
+
+
+async def _feed_chunks(db: Database) -> AsyncIterator[str]:
+    # One page per round trip: the read session is released between pages while the client drains the stream.
+    stamp = datetime.utcnow()
+    yield feed_service.feed_header()
+    cursor: Optional[str] = None
+    while True:
+        chunk, cursor = await db.run(feed_service.render_page, cursor, stamp)
+        if chunk:
+            yield chunk
+        if cursor is None:
+            break
+    yield feed_service.feed_footer()
+
+
+@router.get("/freebusy", response_model=FreeBusyRead)
+async def free_busy(
+    start: datetime = Query(description="ISO8601 start datetime"),
+    end: datetime = Query(description="ISO8601 end datetime"),
+    assignee_id: Optional[List[int]] = Query(default=None, description="Assignees to include; omit for everyone"),
+    min_minutes: int = Query(default=0, ge=0, description="Only report free gaps at least this long"),
+    db: Database = Depends(get_read_db),
+) -> FreeBusyRead:
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="end must be after start")
+    result = await db.run(freebusy_service.free_busy, start, end, assignee_id, timedelta(minutes=min_minutes))
+    return FreeBusyRead(
+        start=result.start,
+        end=result.end,
+        busy=[BusyInterval(start=busy_start, end=busy_end) for busy_start, busy_end in result.busy],
+        free=[BusyInterval(start=free_start, end=free_end) for free_start, free_end in result.free],
+        assignees=[
+            AssigneeBusy(
+                assignee_id=assignee, busy=[BusyInterval(start=busy_start, end=busy_end) for busy_start, busy_end in busy]
+            )
+            for assignee, busy in result.assignees.items()
+        ],
+    )
+
+
+async def _with_conflicts(db: Database, record: Any, check_conflicts: bool) -> EventWithConflicts:
+    result = EventWithConflicts.model_validate(record, from_attributes=True)
+    if check_conflicts:
+        conflicts = await db.run(freebusy_service.find_conflicts, record)
+        result.conflicts = [EventRead.model_validate(item, from_attributes=True) for item in conflicts]
+    return result
+
+
+@router.post("", response_model=EventWithConflicts, status_code=status.HTTP_201_CREATED)
+async def create_event(
     payload: EventCreate,
-    session: Session = Depends(get_session),
+    check_conflicts: bool = Query(default=False, description="Also return overlapping events of the same assignee"),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> EventRead:
-    record = event_service.create_event(session, payload, creator_fallback=current_user.name if current_user else None)
-    return EventRead.model_validate(record, from_attributes=True)
+) -> EventWithConflicts:
+    try:
+        record = await db.run(
+            event_service.create_event, payload, creator_fallback=current_user.name if current_user else None
+        )
+    except InvalidRecurrence as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)) from error
+    return await _with_conflicts(db, record, check_conflicts)
 
 
-@router.patch("/{event_id}", response_model=EventRead)
-def update_event(event_id: int, payload: EventUpdate, session: Session = Depends(get_session)) -> EventRead:
+@router.patch("/{event_id}", response_model=EventWithConflicts)
+async def update_event(
+    event_id: int,
+    payload: EventUpdate,
+    check_conflicts: bool = Query(default=False, description="Also return overlapping events of the same assignee"),
+    db: Database = Depends(get_db),
+) -> EventWithConflicts:
     try:
-        record = event_service.update_event(session, event_id, payload)
+        record = await db.run(event_service.update_event, event_id, payload)
+    except InvalidRecurrence as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)) from error
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
-    return EventRead.model_validate(record, from_attributes=True)
+    return await _with_conflicts(db, record, check_conflicts)
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event(event_id: int, session: Session = Depends(get_session)) -> None:
+async def delete_event(event_id: int, db: Database = Depends(get_db)) -> None:
+    try:
+        await db.run(event_service.delete_event, event_id)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+
+
+@router.patch("/{event_id}/occurrences/{original_start}", response_model=EventRead)
+async def update_occurrence(
+    event_id: int, original_start: datetime, payload: EventOccurrenceUpdate, db: Database = Depends(get_db)
+) -> EventRead:
+    try:
+        record = await db.run(event_service.update_occurrence, event_id, original_start, payload)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+    return EventRead.model_validate(record, from_attributes=True)
+
+
+@router.delete("/{event_id}/occurrences/{original_start}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_occurrence(event_id: int, original_start: datetime, db: Database = Depends(get_db)) -> None:
     try:
-        event_service.delete_event(session, event_id)
+        await db.run(event_service.cancel_occurrence, event_id, original_start)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
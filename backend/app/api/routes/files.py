@@ -0,0 +1,132 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import Database, get_current_user, get_db, get_read_db
+from app.api.file_response import RangeFileResponse, RangeNotSatisfiable, parse_range
+from app.api.pagination import PageParams, fetch_page, page_params, page_response
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.file import FileRead
+from app.services import event_feed
+from app.services import files as file_service
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+def _path(value: str) -> str:
+    try:
+        return file_service.normalize_path(value)
+    except file_service.InvalidFilePath as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)) from error
+
+
+@router.get("", response_model=List[FileRead])
+async def list_files(
+    response: Response,
+    params: PageParams = Depends(page_params(FileRead)),
+    db: Database = Depends(get_read_db),
+) -> List[FileRead]:
+    page = await fetch_page(db, file_service.list_files, params=params)
+    return page_response(page, FileRead, response)
+
+
+@router.put("/{path:path}", response_model=FileRead)
+async def upload_file(
+    path: str,
+    request: Request,
+    response: Response,
+    tags: Optional[List[str]] = Query(default=None),
+    read_db: Database = Depends(get_read_db),
+    db: Database = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> FileRead:
+    """Store the raw request body at ``path``; the body is streamed to disk and hashed as it arrives."""
+    path = _path(path)
+    declared_length = request.headers.get("content-length")
+    if declared_length and declared_length.isdigit() and int(declared_length) > settings.upload_max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Upload too large")
+    try:
+        # Checked on the read handle so the writer connection is not held while the body streams in.
+        await read_db.run(file_service.ensure_writable, path)
+    except file_service.ProtectedFile as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error)) from error
+
+    writer = await run_in_threadpool(file_service.BlobWriter)
+    try:
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= file_service.WRITE_CHUNK_BYTES:
+                await run_in_threadpool(writer.write, bytes(buffer))
+                buffer.clear()
+        await run_in_threadpool(writer.write, bytes(buffer))
+        checksum, size = await run_in_threadpool(writer.commit)
+    except file_service.UploadTooLarge as error:
+        await run_in_threadpool(writer.discard)
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(error)) from error
+    except BaseException:
+        await run_in_threadpool(writer.discard)
+        raise
+
+    content_type = file_service.guess_content_type(path, request.headers.get("content-type"))
+    try:
+        record, created = await db.run(file_service.store_file, path, checksum, size, content_type, tags)
+    except file_service.ProtectedFile as error:
+        await run_in_threadpool(writer.discard)
+        await db.run(file_service.release_blob, checksum)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error)) from error
+    except BaseException:
+        await run_in_threadpool(writer.discard)
+        raise
+    # The row refers to the blob now, so the upload's pin can go.
+    await run_in_threadpool(writer.unpin)
+    response.status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+    return FileRead.model_validate(record, from_attributes=True)
+
+
+@router.api_route("/{path:path}", methods=["GET", "HEAD"], response_class=RangeFileResponse)
+async def download_file(path: str, request: Request, db: Database = Depends(get_read_db)) -> Response:
+    """The file's content, with ``ETag`` (its SHA-256), ``If-None-Match`` and single-range ``Range`` support."""
+    try:
+        record = await db.run(file_service.get_file, _path(path))
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+    # Served from the immutable blob, so the body always matches the ETag even while the tree copy is edited.
+    location = file_service.blob_path(record.checksum)
+    try:
+        size = (await run_in_threadpool(location.stat)).st_size
+    except FileNotFoundError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File content is missing") from error
+
+    etag = f'"{record.checksum}"'
+    if event_feed.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != etag:
+        # The client's partial copy is of another version: send the whole file.
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}", "ETag": etag},
+        )
+    return RangeFileResponse(location, size, etag, record.content_type, byte_range, head=request.method == "HEAD")
+
+
+@router.delete("/{path:path}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_file(
+    path: str,
+    db: Database = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    try:
+        await db.run(file_service.delete_file, _path(path))
+    except file_service.ProtectedFile as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error)) from error
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
@@ -1,63 +1,83 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_current_user, get_db, get_read_db
+from app.api.pagination import PageParams, fetch_page, page_params, page_response
 from app.models.user import User
 from app.schemas.link import LinkCreate, LinkRead, LinkSearchResponse, LinkUpdate
+from app.schemas.tag import TagFacetResponse
 from app.services import links as link_service
+from app.services.clicks import click_aggregator, click_flusher
+from app.services import tags as tag_service
 
 router = APIRouter(prefix="/links", tags=["links"])
 
 
 @router.get("", response_model=List[LinkRead])
-def list_links(session: Session = Depends(get_session)) -> List[LinkRead]:
-    records = link_service.list_links(session)
-    return [LinkRead.model_validate(link, from_attributes=True) for link in records]
+async def list_links(
+    response: Response,
+    params: PageParams = Depends(page_params(LinkRead)),
+    db: Database = Depends(get_read_db),
+) -> List[LinkRead]:
+    page = await fetch_page(db, link_service.list_links, params=params)
+    return page_response(page, LinkRead, response)
 
 
 @router.post("", response_model=LinkRead, status_code=status.HTTP_201_CREATED)
-def create_link(
+async def create_link(
     payload: LinkCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> LinkRead:
-    record = link_service.create_link(session, payload, owner_id=current_user.id)
+    record = await db.run(link_service.create_link, payload, owner_id=current_user.id)
     return LinkRead.model_validate(record, from_attributes=True)
 
 
 @router.patch("/{link_id}", response_model=LinkRead)
-def update_link(link_id: int, payload: LinkUpdate, session: Session = Depends(get_session)) -> LinkRead:
+async def update_link(link_id: int, payload: LinkUpdate, db: Database = Depends(get_db)) -> LinkRead:
     try:
-        record = link_service.update_link(session, link_id, payload)
+        record = await db.run(link_service.update_link, link_id, payload)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
     return LinkRead.model_validate(record, from_attributes=True)
 
 
 @router.delete("/{link_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_link(link_id: int, session: Session = Depends(get_session)) -> None:
+async def delete_link(link_id: int, db: Database = Depends(get_db)) -> None:
     try:
-        link_service.delete_link(session, link_id)
+        await db.run(link_service.delete_link, link_id)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+    click_aggregator.discard(link_id)
 
 
 @router.get("/search", response_model=LinkSearchResponse)
-def search_links(
-    q: Optional[str] = Query(default=None, description="Partial title or URL"),
+async def search_links(
+    q: Optional[str] = Query(default=None, description="Words matched anywhere in title, URL or tags"),
     tags: Optional[List[str]] = Query(default=None),
-    session: Session = Depends(get_session),
+    tag_mode: Literal["all", "any"] = Query(default="all", description="Require all tags or any of them"),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Database = Depends(get_read_db),
 ) -> LinkSearchResponse:
-    records = link_service.search_links(session, q, tags)
-    return LinkSearchResponse(results=[LinkRead.model_validate(record, from_attributes=True) for record in records])
+    results = await db.run(link_service.search_links, q, tags, limit, tag_mode)
+    return LinkSearchResponse(results=results)
+
+
+@router.get("/tags", response_model=TagFacetResponse)
+async def list_link_tags(db: Database = Depends(get_read_db)) -> TagFacetResponse:
+    return TagFacetResponse(items=await db.run(tag_service.link_tag_facets))
 
 
 @router.post("/{link_id}/click", response_model=LinkRead)
-def register_link_click(link_id: int, session: Session = Depends(get_session)) -> LinkRead:
+async def register_link_click(link_id: int, db: Database = Depends(get_read_db)) -> LinkRead:
     try:
-        record = link_service.register_click(session, link_id)
+        record = await db.run(link_service.get_link, link_id)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
-    return LinkRead.model_validate(record, from_attributes=True)
+    pending = click_aggregator.record(link_id)
+    if click_aggregator.should_flush():
+        click_flusher.wake()
+    return LinkRead.model_validate(record, from_attributes=True).model_copy(
+        update={"click_count": record.click_count + pending.count, "last_accessed_at": pending.last_accessed_at}
+    )
@@ -1,53 +1,63 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_current_user, get_db, get_read_db
+from app.api.pagination import PageParams, fetch_page, page_params, page_response
 from app.models.user import User
 from app.schemas.todo import TodoCreate, TodoRead, TodoUpdate
 from app.services import todos as todo_service
+from app.services.recurrence import InvalidRecurrence
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 
 @router.get("", response_model=List[TodoRead])
-def list_todos(session: Session = Depends(get_session)) -> List[TodoRead]:
-    records = todo_service.list_todos(session)
-    return [TodoRead.model_validate(record, from_attributes=True) for record in records]
+async def list_todos(
+    response: Response,
+    params: PageParams = Depends(page_params(TodoRead)),
+    db: Database = Depends(get_read_db),
+) -> List[TodoRead]:
+    page = await fetch_page(db, todo_service.list_todos, params=params)
+    return page_response(page, TodoRead, response)
 
 
 @router.post("", response_model=TodoRead, status_code=status.HTTP_201_CREATED)
-def create_todo(
+async def create_todo(
     payload: TodoCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> TodoRead:
-    record = todo_service.create_todo(session, payload)
+    try:
+        record = await db.run(todo_service.create_todo, payload)
+    except InvalidRecurrence as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)) from error
     return TodoRead.model_validate(record, from_attributes=True)
 
 
 @router.patch("/{todo_id}", response_model=TodoRead)
-def update_todo(
+async def update_todo(
     todo_id: int,
     payload: TodoUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> TodoRead:
     try:
-        record = todo_service.update_todo(session, todo_id, payload)
+        record = await db.run(todo_service.update_todo, todo_id, payload)
+    except InvalidRecurrence as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)) from error
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
     return TodoRead.model_validate(record, from_attributes=True)
 
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(
+async def delete_todo(
     todo_id: int,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> None:
     try:
-        todo_service.delete_todo(session, todo_id)
+        await db.run(todo_service.delete_todo, todo_id)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, Response
 
-from app.api.deps import get_current_user, get_session
+from app.api.deps import Database, get_current_user, get_read_db
+from app.api.pagination import PageParams, fetch_page, page_params, page_response
 from app.models.user import User
 from app.schemas.user import UserRead
 from app.services import users as user_service
@@ -10,11 +10,15 @@ router = APIRouter(tags=["users"])
 
 
 @router.get("/me", response_model=UserRead)
-def read_me(current_user: User = Depends(get_current_user)) -> UserRead:
+async def read_me(current_user: User = Depends(get_current_user)) -> UserRead:
     return UserRead(id=current_user.id, name=current_user.name, role=current_user.role, email=current_user.email)
 
 
 @router.get("/users", response_model=list[UserRead])
-def list_users(session: Session = Depends(get_session)) -> list[UserRead]:
-    return user_service.list_users(session)
-
+async def list_users(
+    response: Response,
+    params: PageParams = Depends(page_params(UserRead)),
+    db: Database = Depends(get_read_db),
+) -> list[UserRead]:
+    page = await fetch_page(db, user_service.list_users, params=params)
+    return page_response(page, UserRead, response)
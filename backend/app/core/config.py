@@ -14,17 +14,64 @@ class Settings(BaseSettings):
     app_auth_enabled: bool = Field(default=False)
     secret_key: str = Field(default="change-this-secret")
     access_token_expire_minutes: int = Field(default=60 * 24)
+    auth_user_cache_ttl_seconds: int = Field(default=60, ge=0)
+    auth_token_cache_size: int = Field(default=1024, ge=1)
+    password_hash_workers: int = Field(default=2, ge=1)
+    password_hash_queue_limit: int = Field(default=16, ge=0)
+    link_click_flush_interval_seconds: float = Field(default=2.0, gt=0)
+    link_click_flush_threshold: int = Field(default=500, ge=1)
+    event_occurrence_cache_ttl_seconds: int = Field(default=300, ge=0)
+    dashboard_cache_ttl_seconds: int = Field(default=10, ge=0)
 
     database_url: str = Field(default="sqlite:///data/homeportal.db")
     database_echo: bool = Field(default=False)
+    database_pool_size: int = Field(default=5, ge=1)
+    database_max_overflow: int = Field(default=10, ge=0)
+    database_pool_recycle: int = Field(default=1800)
+    database_pool_pre_ping: bool = Field(default=False)
+    # Serve requests from async routes on an aiosqlite AsyncEngine instead of the threadpool.
+    database_async: bool = Field(default=False)
+
+    # SQLite performance profile, applied to every new DBAPI connection.
+    sqlite_journal_mode: Literal["wal", "delete", "truncate", "persist", "memory"] = Field(default="wal")
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0)
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = Field(default="normal")
+    sqlite_cache_size: int = Field(default=-64000)
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
+    sqlite_temp_store: Literal["default", "file", "memory"] = Field(default="memory")
 
     default_admin_email: str | None = Field(default=None)
     default_admin_password: str | None = Field(default=None)
 
     google_calendar_json_base64: str | None = Field(default=None)
     google_calendar_id: str | None = Field(default=None)
+    google_calendar_api_url: str = Field(default="https://www.googleapis.com/calendar/v3")
+    calendar_sync_interval_seconds: float = Field(default=300.0, gt=0)
+    # Calendars fetched in parallel; also bounds the pooled HTTP connections.
+    calendar_sync_concurrency: int = Field(default=4, ge=1)
+    calendar_sync_timeout_seconds: float = Field(default=30.0, gt=0)
+    # Repeating todos whose next due date has passed are created in one batch this often (and at startup).
+    todo_catch_up_interval_seconds: float = Field(default=3600.0, gt=0)
+    # Committed changes wait in a bounded in-memory queue until the audit writer bulk-inserts them.
+    audit_queue_size: int = Field(default=10000, ge=1)
+    audit_flush_interval_seconds: float = Field(default=1.0, gt=0)
+    audit_flush_threshold: int = Field(default=500, ge=1)
+    # How long a committing request waits for room in a full queue before its entry is dropped.
+    audit_enqueue_timeout_seconds: float = Field(default=2.0, ge=0)
+    # Entries older than this move to monthly gzip archives under backup_directory/audit.
+    audit_retention_days: int = Field(default=180, ge=1)
+    audit_retention_interval_seconds: float = Field(default=86400.0, gt=0)
 
     backup_directory: Path = Field(default=Path("/var/backups/app"))
+    # Uploaded CSVs are spooled here until their import job finishes; keep it on a persistent volume.
+    asset_import_directory: Path = Field(default=Path("data/imports"))
+    # Root of the file store: files at their paths, deduplicated blobs under .blobs/.
+    uploads_directory: Path = Field(default=Path("data/uploads"))
+    upload_max_bytes: int = Field(default=4 * 1024 * 1024 * 1024, ge=1)
+    # Files placed in uploads_directory out of band are indexed this often; unchanged files are not re-hashed.
+    file_index_interval_seconds: float = Field(default=900.0, gt=0)
+    # Processes hashing new or changed files during an index run.
+    file_index_workers: int = Field(default=4, ge=1)
 
     @validator("database_url")
     def ensure_sqlite_path(cls, value: str) -> str:
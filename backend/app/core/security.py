@@ -1,13 +1,23 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.schemas.auth import TokenPayload
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified tokens are remembered until their own exp, so a warm token skips the HMAC check.
+_verified_tokens: TTLCache[str, TokenPayload] = TTLCache(ttl_seconds=0, max_entries=settings.auth_token_cache_size)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -17,6 +27,75 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the password hashing pool already has its maximum queue depth."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded process pool so request workers never block on it.
+
+    At most ``workers + queue_limit`` operations may be pending; further calls
+    fail fast with ``PasswordHasherBusy`` instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, queue_limit: int) -> None:
+        self.workers = workers
+        self.max_pending = workers + queue_limit
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads is not safe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _submit(self, fn: Callable[..., T], *args: Any) -> T:
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_queue_limit)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
@@ -24,3 +103,15 @@ def create_access_token(data: Dict[str, Any], expires_delta: timedelta | None =
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
     return encoded_jwt
 
+
+def decode_access_token(token: str) -> TokenPayload:
+    """Verify a JWT and return its payload; raises ``JWTError`` on invalid tokens."""
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        return cached
+    payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    token_data = TokenPayload(**payload)
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        _verified_tokens.set(token, token_data, ttl_seconds=expires_at - time.time())
+    return token_data
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs a blocking callback in a worker thread every ``interval_seconds``.
+
+    ``wake()`` triggers an early run (e.g. when a buffer crosses its size
+    threshold). ``stop()`` waits for a run already in progress (a thread
+    cannot be cancelled mid-callback) and then runs the callback one last time
+    so buffered work is not dropped on a clean shutdown, unless
+    ``run_on_stop`` is False. Runs never overlap.
+    """
+
+    def __init__(
+        self, name: str, interval_seconds: float, callback: Callable[[], Any], run_on_stop: bool = True
+    ) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.callback = callback
+        self.run_on_stop = run_on_stop
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    def wake(self) -> None:
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            assert self._wakeup is not None
+            self._stopping = True
+            self._wakeup.set()
+            # Shielded: if stop() itself is cancelled, the in-flight run still finishes instead of overlapping the next.
+            await asyncio.shield(self._task)
+            self._task = None
+        if self.run_on_stop:
+            await self._run_once()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            await self._run_once()
+
+    async def _run_once(self) -> None:
+        try:
+            await asyncio.to_thread(self.callback)
+        except Exception:
+            logger.exception("Periodic task %s failed", self.name)
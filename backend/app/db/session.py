@@ -1,15 +1,129 @@
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Generator
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.config import settings
+from app.core.config import Settings, settings
 
-connect_args: dict[str, object] = {}
-if settings.database_url.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.database_url, echo=settings.database_echo, connect_args=connect_args)
+def _is_sqlite(database_url: str) -> bool:
+    return database_url.startswith("sqlite")
+
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    return database_url in {"sqlite://", "sqlite:///:memory:"} or "mode=memory" in database_url
+
+
+def _read_only_url(database_url: str) -> str:
+    path = database_url.replace("sqlite:///", "", 1)
+    return f"sqlite:///file:{path}?mode=ro&uri=true"
+
+
+def _async_url(database_url: str) -> str:
+    if database_url.startswith("sqlite:"):
+        return database_url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    return database_url
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, config: Settings, read_only: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(config.sqlite_busy_timeout_ms)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        else:
+            cursor.execute(f"PRAGMA journal_mode = {config.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous = {config.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size = {int(config.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(config.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA temp_store = {config.sqlite_temp_store}")
+    finally:
+        cursor.close()
+
+
+def _engine_args(database_url: str, config: Settings, pool_size: int | None, max_overflow: int | None) -> dict[str, Any]:
+    engine_args: dict[str, Any] = {"echo": config.database_echo}
+    if _is_sqlite(database_url):
+        engine_args["connect_args"] = {"check_same_thread": False}
+    if not _is_sqlite_memory(database_url):
+        engine_args["pool_size"] = config.database_pool_size if pool_size is None else pool_size
+        engine_args["max_overflow"] = config.database_max_overflow if max_overflow is None else max_overflow
+        engine_args["pool_recycle"] = config.database_pool_recycle
+        engine_args["pool_pre_ping"] = config.database_pool_pre_ping
+    return engine_args
+
+
+def _register_sqlite_pragmas(db_engine: Engine, config: Settings, read_only: bool) -> None:
+    @event.listens_for(db_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        apply_sqlite_pragmas(dbapi_connection, config, read_only=read_only)
+
+
+def create_db_engine(
+    database_url: str,
+    config: Settings = settings,
+    *,
+    read_only: bool = False,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> Engine:
+    db_engine = create_engine(database_url, **_engine_args(database_url, config, pool_size, max_overflow))
+    if _is_sqlite(database_url):
+        _register_sqlite_pragmas(db_engine, config, read_only)
+    return db_engine
+
+
+def create_async_db_engine(
+    database_url: str,
+    config: Settings = settings,
+    *,
+    read_only: bool = False,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> AsyncEngine:
+    db_engine = create_async_engine(
+        _async_url(database_url), **_engine_args(database_url, config, pool_size, max_overflow)
+    )
+    if _is_sqlite(database_url):
+        _register_sqlite_pragmas(db_engine.sync_engine, config, read_only)
+    return db_engine
+
+
+def create_engines(database_url: str, config: Settings = settings) -> tuple[Engine, Engine]:
+    """Build the (writer, reader) engine pair for a database URL.
+
+    SQLite file databases get a single-connection writer pool, so writes are
+    serialized in-process instead of fighting over the file lock, and a separate
+    pool of read-only connections for GET endpoints. Other backends share one engine.
+    """
+    if not _is_sqlite(database_url) or _is_sqlite_memory(database_url):
+        shared = create_db_engine(database_url, config)
+        return shared, shared
+    writer = create_db_engine(database_url, config, pool_size=1, max_overflow=0)
+    reader = create_db_engine(_read_only_url(database_url), config, read_only=True)
+    return writer, reader
+
+
+def create_async_engines(database_url: str, config: Settings = settings) -> tuple[AsyncEngine, AsyncEngine]:
+    if not _is_sqlite(database_url) or _is_sqlite_memory(database_url):
+        shared = create_async_db_engine(database_url, config)
+        return shared, shared
+    writer = create_async_db_engine(database_url, config, pool_size=1, max_overflow=0)
+    reader = create_async_db_engine(_read_only_url(database_url), config, read_only=True)
+    return writer, reader
+
+
+engine, read_engine = create_engines(settings.database_url)
+
+# Async engines only exist in async mode so aiosqlite stays optional for sync deployments.
+async_engine: AsyncEngine | None = None
+async_read_engine: AsyncEngine | None = None
+if settings.database_async:
+    async_engine, async_read_engine = create_async_engines(settings.database_url)
 
 
 def init_db() -> None:
@@ -28,3 +142,45 @@ def session_scope() -> Generator[Session, None, None]:
     finally:
         session.close()
 
+
+@contextmanager
+def read_session_scope() -> Generator[Session, None, None]:
+    session = Session(read_engine, autoflush=False)
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncGenerator[AsyncSession, None]:
+    if async_engine is None:
+        raise RuntimeError("Async database mode is disabled")
+    session = AsyncSession(async_engine, expire_on_commit=False)
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+@asynccontextmanager
+async def async_read_session_scope() -> AsyncGenerator[AsyncSession, None]:
+    if async_read_engine is None:
+        raise RuntimeError("Async database mode is disabled")
+    session = AsyncSession(async_read_engine, autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+
+
+async def dispose_async_engines() -> None:
+    for async_db_engine in {async_engine, async_read_engine}:
+        if async_db_engine is not None:
+            await async_db_engine.dispose()
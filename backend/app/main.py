@@ -1,12 +1,22 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import assets, auth, contacts, events, health, links, todos, users
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.routes import assets, audit, auth, calendars, contacts, dashboard, events, files, health, links, todos, users
 from app.core.config import settings
-from app.db.session import init_db, session_scope
-from app.services.users import ensure_default_admin
+from app.core.security import password_hasher
+from app.db.session import dispose_async_engines, init_db, session_scope
+from app.services.asset_imports import import_worker
+from app.services.audit import audit_writer
+from app.services.audit_archive import audit_retention
+from app.services.calendar_sync import calendar_syncer, close_http_client, ensure_google_source
+from app.services.clicks import click_flusher
+from app.services.file_indexer import file_indexer
+from app.services.todo_recurrence import todo_scheduler
+from app.services.users import ensure_default_admin, ensure_default_user
 
 
 @asynccontextmanager
@@ -14,7 +24,30 @@ async def lifespan(app: FastAPI):
     init_db()
     with session_scope() as session:
         ensure_default_admin(session)
+        if not settings.app_auth_enabled:
+            ensure_default_user(session)
+        ensure_google_source(session)
+    click_flusher.start()
+    audit_writer.start()
+    audit_retention.start()
+    import_worker.start()
+    calendar_syncer.start()
+    calendar_syncer.wake()
+    todo_scheduler.start()
+    todo_scheduler.wake()
+    file_indexer.start()
     yield
+    await file_indexer.stop()
+    await audit_retention.stop()
+    await todo_scheduler.stop()
+    await calendar_syncer.stop()
+    await asyncio.to_thread(import_worker.stop)
+    await click_flusher.stop()
+    # Last, so the changes committed by the tasks stopped above are flushed too.
+    await audit_writer.stop()
+    close_http_client()
+    password_hasher.shutdown()
+    await dispose_async_engines()
 
 
 def create_app() -> FastAPI:
@@ -26,6 +59,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     app.include_router(health.router)
@@ -35,7 +69,11 @@ def create_app() -> FastAPI:
     app.include_router(contacts.router)
     app.include_router(assets.router)
     app.include_router(events.router)
+    app.include_router(calendars.router)
     app.include_router(todos.router)
+    app.include_router(dashboard.router)
+    app.include_router(audit.router)
+    app.include_router(files.router)
 
     return app
 
@@ -6,12 +6,17 @@ from sqlmodel import SQLModel
 
 from app.core.config import settings
 from app.db import session  # noqa: F401
+from app.models import asset_import_job  # noqa: F401
+from app.models import asset_monthly_rollup  # noqa: F401
 from app.models import asset_snapshot  # noqa: F401
 from app.models import audit_log  # noqa: F401
+from app.models import calendar_source  # noqa: F401
 from app.models import contact  # noqa: F401
+from app.models import entity_version  # noqa: F401
 from app.models import event  # noqa: F401
 from app.models import file  # noqa: F401
 from app.models import link  # noqa: F401
+from app.models import tag  # noqa: F401
 from app.models import todo  # noqa: F401
 from app.models import user  # noqa: F401
 
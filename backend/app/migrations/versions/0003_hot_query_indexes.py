@@ -0,0 +1,47 @@
+"""add indexes for hot list/search queries and foreign keys"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_event_start_end", "event", ["start", "end"], unique=False)
+    op.create_index("ix_event_end", "event", ["end"], unique=False)
+    op.create_index("ix_event_assignee_id_start", "event", ["assignee_id", "start"], unique=False)
+
+    op.create_index("ix_link_click_count_title", "link", [sa.text("click_count DESC"), "title"], unique=False)
+    op.create_index("ix_link_owner_id", "link", ["owner_id"], unique=False)
+
+    # The composite indexes below cover the single-column ones they replace.
+    op.drop_index(op.f("ix_todo_status"), table_name="todo")
+    op.create_index("ix_todo_status_due_title", "todo", ["status", "due", "title"], unique=False)
+    op.create_index("ix_todo_assignee_id", "todo", ["assignee_id"], unique=False)
+
+    op.drop_index(op.f("ix_contact_category"), table_name="contact")
+    op.create_index("ix_contact_category_name", "contact", ["category", "name"], unique=False)
+
+    op.create_index(op.f("ix_user_name"), "user", ["name"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_user_name"), table_name="user")
+
+    op.drop_index("ix_contact_category_name", table_name="contact")
+    op.create_index(op.f("ix_contact_category"), "contact", ["category"], unique=False)
+
+    op.drop_index("ix_todo_assignee_id", table_name="todo")
+    op.drop_index("ix_todo_status_due_title", table_name="todo")
+    op.create_index(op.f("ix_todo_status"), "todo", ["status"], unique=False)
+
+    op.drop_index("ix_link_owner_id", table_name="link")
+    op.drop_index("ix_link_click_count_title", table_name="link")
+
+    op.drop_index("ix_event_assignee_id_start", table_name="event")
+    op.drop_index("ix_event_end", table_name="event")
+    op.drop_index("ix_event_start_end", table_name="event")
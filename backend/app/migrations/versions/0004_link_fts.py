@@ -0,0 +1,49 @@
+"""add FTS5 search index for links"""
+
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS link_fts USING fts5(
+            title, url, tags, content='link', content_rowid='id', tokenize='trigram'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS link_fts_ai AFTER INSERT ON link BEGIN
+            INSERT INTO link_fts(rowid, title, url, tags) VALUES (new.id, new.title, new.url, new.tags);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS link_fts_ad AFTER DELETE ON link BEGIN
+            INSERT INTO link_fts(link_fts, rowid, title, url, tags) VALUES ('delete', old.id, old.title, old.url, old.tags);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS link_fts_au AFTER UPDATE OF title, url, tags ON link BEGIN
+            INSERT INTO link_fts(link_fts, rowid, title, url, tags) VALUES ('delete', old.id, old.title, old.url, old.tags);
+            INSERT INTO link_fts(rowid, title, url, tags) VALUES (new.id, new.title, new.url, new.tags);
+        END
+        """
+    )
+    op.execute("INSERT INTO link_fts(link_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS link_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS link_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS link_fts_ai")
+    op.execute("DROP TABLE IF EXISTS link_fts")
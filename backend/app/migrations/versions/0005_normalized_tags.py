@@ -0,0 +1,63 @@
+"""add normalized tag tables for links and files"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# A JSON tag value with surrounding whitespace (spaces, tabs, newlines) removed.
+_NAME = "trim(json_each.value, ' ' || char(9) || char(10) || char(13))"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tag",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False, unique=True),
+    )
+    op.create_table(
+        "link_tag",
+        sa.Column("link_id", sa.Integer(), sa.ForeignKey("link.id"), primary_key=True),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tag.id"), primary_key=True),
+    )
+    op.create_index("ix_link_tag_tag_id_link_id", "link_tag", ["tag_id", "link_id"], unique=False)
+    op.create_table(
+        "file_tag",
+        sa.Column("file_id", sa.Integer(), sa.ForeignKey("file.id"), primary_key=True),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tag.id"), primary_key=True),
+    )
+    op.create_index("ix_file_tag_tag_id_file_id", "file_tag", ["tag_id", "file_id"], unique=False)
+
+    # Names are stripped and empty ones dropped, as tags._normalize does for new rows.
+    op.execute(
+        f"""
+        INSERT OR IGNORE INTO tag(name)
+        SELECT DISTINCT {_NAME} FROM link, json_each(link.tags) WHERE {_NAME} != ''
+        UNION
+        SELECT DISTINCT {_NAME} FROM file, json_each(file.tags) WHERE {_NAME} != ''
+        """
+    )
+    op.execute(
+        f"""
+        INSERT OR IGNORE INTO link_tag(link_id, tag_id)
+        SELECT link.id, tag.id FROM link, json_each(link.tags) JOIN tag ON tag.name = {_NAME}
+        """
+    )
+    op.execute(
+        f"""
+        INSERT OR IGNORE INTO file_tag(file_id, tag_id)
+        SELECT file.id, tag.id FROM file, json_each(file.tags) JOIN tag ON tag.name = {_NAME}
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_file_tag_tag_id_file_id", table_name="file_tag")
+    op.drop_table("file_tag")
+    op.drop_index("ix_link_tag_tag_id_link_id", table_name="link_tag")
+    op.drop_table("link_tag")
+    op.drop_table("tag")
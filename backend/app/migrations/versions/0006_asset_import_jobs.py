@@ -0,0 +1,37 @@
+"""add persisted asset import jobs"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "asset_import_job",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("rows_processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("imported", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.JSON(), nullable=False),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("user.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("elapsed_seconds", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_index(op.f("ix_asset_import_job_status"), "asset_import_job", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_asset_import_job_status"), table_name="asset_import_job")
+    op.drop_table("asset_import_job")
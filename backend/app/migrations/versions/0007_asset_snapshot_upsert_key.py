@@ -0,0 +1,41 @@
+"""make asset snapshots unique per (date, account_name, currency)"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the most recently imported row of each duplicated key.
+    op.execute(
+        """
+        DELETE FROM asset_snapshot
+        WHERE id NOT IN (
+            SELECT max(id) FROM asset_snapshot GROUP BY date, account_name, currency
+        )
+        """
+    )
+    op.create_index(
+        "uq_asset_snapshot_date_account_currency",
+        "asset_snapshot",
+        ["date", "account_name", "currency"],
+        unique=True,
+    )
+    # The unique index leads with date and serves the date-range queries.
+    op.drop_index("ix_asset_snapshot_date", table_name="asset_snapshot")
+    for column in ("inserted", "updated", "unchanged"):
+        op.add_column(
+            "asset_import_job", sa.Column(column, sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    for column in ("unchanged", "updated", "inserted"):
+        op.drop_column("asset_import_job", column)
+    op.create_index("ix_asset_snapshot_date", "asset_snapshot", ["date"], unique=False)
+    op.drop_index("uq_asset_snapshot_date_account_currency", table_name="asset_snapshot")
@@ -0,0 +1,32 @@
+"""add the incrementally maintained asset_monthly_rollup table"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "asset_monthly_rollup",
+        sa.Column("month", sa.String(length=7), primary_key=True),
+        sa.Column("currency", sa.String(length=10), primary_key=True),
+        sa.Column("total", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("snapshot_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        INSERT INTO asset_monthly_rollup (month, currency, total, snapshot_count)
+        SELECT strftime('%Y-%m', date), currency, sum(balance), count(*)
+        FROM asset_snapshot
+        GROUP BY strftime('%Y-%m', date), currency
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("asset_monthly_rollup")
@@ -0,0 +1,35 @@
+"""add RRULE recurrence and per-occurrence overrides to events"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite cannot add a foreign key in place, so the table is rebuilt in batch mode.
+    with op.batch_alter_table("event") as batch:
+        batch.add_column(sa.Column("rrule", sa.String(length=500), nullable=True))
+        batch.add_column(sa.Column("exdates", sa.JSON(), nullable=False, server_default="[]"))
+        batch.add_column(sa.Column("recurrence_end", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("recurrence_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("original_start", sa.DateTime(), nullable=True))
+        batch.create_foreign_key("fk_event_recurrence_id_event", "event", ["recurrence_id"], ["id"])
+        batch.create_index("ix_event_recurrence_end", ["recurrence_end"])
+        batch.create_index("ix_event_recurrence_id_original_start", ["recurrence_id", "original_start"], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("event") as batch:
+        batch.drop_index("ix_event_recurrence_id_original_start")
+        batch.drop_index("ix_event_recurrence_end")
+        batch.drop_constraint("fk_event_recurrence_id_event", type_="foreignkey")
+        batch.drop_column("original_start")
+        batch.drop_column("recurrence_id")
+        batch.drop_column("recurrence_end")
+        batch.drop_column("exdates")
+        batch.drop_column("rrule")
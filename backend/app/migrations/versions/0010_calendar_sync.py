@@ -0,0 +1,49 @@
+"""add calendar_source and remote identity columns for calendar sync"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calendar_source",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=6), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("url", sa.String(length=1000), nullable=False),
+        sa.Column("username", sa.String(length=200), nullable=True),
+        sa.Column("password", sa.String(length=500), nullable=True),
+        sa.Column("color", sa.String(length=20), nullable=True),
+        sa.Column("enabled", sa.Boolean(), nullable=False, server_default="1"),
+        sa.Column("sync_token", sa.String(length=1000), nullable=True),
+        sa.Column("ctag", sa.String(length=200), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("last_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("last_fetched", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_changed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_deleted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.String(length=500), nullable=True),
+    )
+    with op.batch_alter_table("event") as batch:
+        batch.add_column(sa.Column("calendar_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("external_id", sa.String(length=1000), nullable=True))
+        batch.add_column(sa.Column("etag", sa.String(length=200), nullable=True))
+        batch.create_foreign_key("fk_event_calendar_id_calendar_source", "calendar_source", ["calendar_id"], ["id"])
+        batch.create_index("uq_event_calendar_id_external_id", ["calendar_id", "external_id"], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("event") as batch:
+        batch.drop_index("uq_event_calendar_id_external_id")
+        batch.drop_constraint("fk_event_calendar_id_calendar_source", type_="foreignkey")
+        batch.drop_column("etag")
+        batch.drop_column("external_id")
+        batch.drop_column("calendar_id")
+    op.drop_table("calendar_source")
@@ -0,0 +1,30 @@
+"""add entity_version change counters and event triggers for the ICS feed ETag"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.entity_version import version_trigger_ddl
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "entity_version",
+        sa.Column("entity", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute("INSERT INTO entity_version(entity, version) VALUES ('event', 1)")
+    # Batch (table-recreating) migrations of event drop these; recreate them afterwards.
+    for statement in version_trigger_ddl("event"):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for suffix in ("d", "u", "i"):
+        op.execute(f"DROP TRIGGER IF EXISTS event_version_a{suffix}")
+    op.drop_table("entity_version")
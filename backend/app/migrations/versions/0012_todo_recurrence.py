@@ -0,0 +1,37 @@
+"""add series tracking columns for repeating todos"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("todo") as batch:
+        batch.add_column(sa.Column("series_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("spawned_next", sa.Boolean(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("next_due", sa.DateTime(), nullable=True))
+        batch.create_foreign_key("fk_todo_series_id_todo", "todo", ["series_id"], ["id"])
+        batch.create_index("uq_todo_series_id_due", ["series_id", "due"], unique=True)
+    op.execute("UPDATE todo SET repeat_rule = NULL WHERE trim(repeat_rule) = ''")
+    op.execute("UPDATE todo SET series_id = id WHERE repeat_rule IS NOT NULL")
+    op.create_index(
+        "ix_todo_repeat_head_next_due",
+        "todo",
+        ["next_due"],
+        sqlite_where=sa.text("repeat_rule IS NOT NULL AND spawned_next = 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_repeat_head_next_due", table_name="todo")
+    with op.batch_alter_table("todo") as batch:
+        batch.drop_index("uq_todo_series_id_due")
+        batch.drop_constraint("fk_todo_series_id_todo", type_="foreignkey")
+        batch.drop_column("next_due")
+        batch.drop_column("spawned_next")
+        batch.drop_column("series_id")
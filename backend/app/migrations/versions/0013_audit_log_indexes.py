@@ -0,0 +1,19 @@
+"""add audit_log indexes for per-row history and retention"""
+
+from alembic import op
+
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_audit_log_entity_entity_id_at", "audit_log", ["entity", "entity_id", "at"], unique=False)
+    op.create_index("ix_audit_log_at", "audit_log", ["at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_log_at", table_name="audit_log")
+    op.drop_index("ix_audit_log_entity_entity_id_at", table_name="audit_log")
@@ -0,0 +1,26 @@
+"""add size, content type and checksum index to file for the content-addressed store"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("file") as batch:
+        batch.add_column(sa.Column("size", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("content_type", sa.String(length=200), nullable=True))
+        batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.current_timestamp()))
+    op.create_index("ix_file_checksum", "file", ["checksum"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_file_checksum", table_name="file")
+    with op.batch_alter_table("file") as batch:
+        batch.drop_column("updated_at")
+        batch.drop_column("content_type")
+        batch.drop_column("size")
@@ -0,0 +1,22 @@
+"""add the stat cache used by the uploads indexer to file"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("file") as batch:
+        batch.add_column(sa.Column("mtime_ns", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("inode", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("file") as batch:
+        batch.drop_column("inode")
+        batch.drop_column("mtime_ns")
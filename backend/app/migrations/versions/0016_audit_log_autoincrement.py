@@ -0,0 +1,19 @@
+"""never reuse audit_log ids, which the archives and (at, id) paging rely on"""
+
+from alembic import op
+
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("audit_log", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+        pass
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("audit_log", recreate="always", table_kwargs={"sqlite_autoincrement": False}):
+        pass
@@ -1,19 +1,33 @@
+from app.models.asset_import_job import AssetImportJob, ImportJobStatus
+from app.models.asset_monthly_rollup import AssetMonthlyRollup
 from app.models.asset_snapshot import AssetSnapshot
 from app.models.audit_log import AuditLog
+from app.models.calendar_source import CalendarKind, CalendarSource
 from app.models.contact import Contact
+from app.models.entity_version import EntityVersion
 from app.models.event import Event
 from app.models.file import File
 from app.models.link import Link
+from app.models.tag import FileTag, LinkTag, Tag
 from app.models.todo import Todo
 from app.models.user import User
 
 __all__ = [
+    "AssetImportJob",
+    "AssetMonthlyRollup",
     "AssetSnapshot",
     "AuditLog",
+    "CalendarKind",
+    "CalendarSource",
     "Contact",
+    "EntityVersion",
     "Event",
     "File",
+    "FileTag",
+    "ImportJobStatus",
     "Link",
+    "LinkTag",
+    "Tag",
     "Todo",
     "User",
 ]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import datetime as dt
+from enum import Enum
+from typing import List, Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+class ImportJobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class AssetImportJob(SQLModel, table=True):
+    __tablename__ = "asset_import_job"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: ImportJobStatus = Field(default=ImportJobStatus.queued, nullable=False, index=True)
+    filename: Optional[str] = Field(default=None, max_length=255)
+    file_path: str = Field(max_length=500, nullable=False)
+    # Data rows consumed so far; a resumed job skips this many rows of the spooled file.
+    rows_processed: int = Field(default=0, nullable=False)
+    imported: int = Field(default=0, nullable=False)
+    inserted: int = Field(default=0, nullable=False)
+    updated: int = Field(default=0, nullable=False)
+    unchanged: int = Field(default=0, nullable=False)
+    failed_count: int = Field(default=0, nullable=False)
+    failed: List[dict] = Field(default_factory=list, sa_column=Column(JSON, nullable=False, default=list))
+    error: Optional[str] = Field(default=None, max_length=500)
+    created_by: Optional[int] = Field(default=None, foreign_key="user.id")
+    created_at: dt.datetime = Field(default_factory=dt.datetime.utcnow, nullable=False)
+    started_at: Optional[dt.datetime] = Field(default=None)
+    updated_at: Optional[dt.datetime] = Field(default=None)
+    finished_at: Optional[dt.datetime] = Field(default=None)
+    # Seconds spent processing across all runs, so resumed jobs report honest throughput.
+    elapsed_seconds: float = Field(default=0.0, nullable=False)
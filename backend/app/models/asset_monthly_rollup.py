@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from sqlmodel import Field, SQLModel
+
+
+class AssetMonthlyRollup(SQLModel, table=True):
+    """Per-month, per-currency balance totals maintained by the asset importer."""
+
+    __tablename__ = "asset_monthly_rollup"
+
+    month: str = Field(primary_key=True, max_length=7)
+    currency: str = Field(primary_key=True, max_length=10)
+    total: float = Field(default=0.0, nullable=False)
+    snapshot_count: int = Field(default=0, nullable=False)
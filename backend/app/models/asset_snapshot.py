@@ -3,14 +3,19 @@ from __future__ import annotations
 import datetime as dt
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class AssetSnapshot(SQLModel, table=True):
     __tablename__ = "asset_snapshot"
+    # One balance per account, currency and day; imports upsert on this key.
+    __table_args__ = (
+        Index("uq_asset_snapshot_date_account_currency", "date", "account_name", "currency", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    date: dt.date = Field(nullable=False, index=True)
+    date: dt.date = Field(nullable=False)
     account_name: str = Field(max_length=200, nullable=False)
     balance: float = Field(nullable=False)
     currency: str = Field(max_length=10, nullable=False)
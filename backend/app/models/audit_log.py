@@ -3,12 +3,20 @@ from __future__ import annotations
 import datetime as dt
 from typing import Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, SQLModel
 
 
 class AuditLog(SQLModel, table=True):
     __tablename__ = "audit_log"
+    __table_args__ = (
+        # History of one row, newest first.
+        Index("ix_audit_log_entity_entity_id_at", "entity", "entity_id", "at"),
+        # Retention reads the oldest entries first.
+        Index("ix_audit_log_at", "at"),
+        # Ids of archived entries must never be handed out again: readers dedupe and page on (at, id).
+        {"sqlite_autoincrement": True},
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import datetime as dt
+from enum import Enum
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class CalendarKind(str, Enum):
+    google = "google"
+    caldav = "caldav"
+
+
+class CalendarSource(SQLModel, table=True):
+    """A remote calendar pulled into ``event`` by the sync engine, with its sync state."""
+
+    __tablename__ = "calendar_source"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: CalendarKind = Field(nullable=False)
+    name: str = Field(max_length=200, nullable=False)
+    # CalDAV collection URL, or the Google calendar id.
+    url: str = Field(max_length=1000, nullable=False)
+    username: Optional[str] = Field(default=None, max_length=200)
+    password: Optional[str] = Field(default=None, max_length=500)
+    color: Optional[str] = Field(default=None, max_length=20)
+    enabled: bool = Field(default=True, nullable=False)
+    # Google nextSyncToken / WebDAV sync-token and CalendarServer ctag from the last successful run.
+    sync_token: Optional[str] = Field(default=None, max_length=1000)
+    ctag: Optional[str] = Field(default=None, max_length=200)
+    last_synced_at: Optional[dt.datetime] = Field(default=None)
+    last_duration_seconds: Optional[float] = Field(default=None)
+    last_fetched: int = Field(default=0, nullable=False)
+    last_changed: int = Field(default=0, nullable=False)
+    last_skipped: int = Field(default=0, nullable=False)
+    last_deleted: int = Field(default=0, nullable=False)
+    last_error: Optional[str] = Field(default=None, max_length=500)
@@ -3,15 +3,17 @@ from __future__ import annotations
 import datetime as dt
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Contact(SQLModel, table=True):
     __tablename__ = "contact"
+    __table_args__ = (Index("ix_contact_category_name", "category", "name"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=200, index=True, nullable=False)
-    category: str = Field(max_length=100, index=True, nullable=False)
+    category: str = Field(max_length=100, nullable=False)
     phone: Optional[str] = Field(default=None, max_length=30)
     hours: Optional[str] = Field(default=None, max_length=200)
     url: Optional[str] = Field(default=None, max_length=500)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlmodel import Field, SQLModel
+
+
+class EntityVersion(SQLModel, table=True):
+    """Change counter per table, bumped by triggers on every inserted, updated or deleted row."""
+
+    __tablename__ = "entity_version"
+
+    entity: str = Field(primary_key=True, max_length=50)
+    version: int = Field(default=0, nullable=False)
+
+
+def version_trigger_ddl(table: str) -> List[str]:
+    """Triggers that bump ``entity_version`` for ``table`` on any row change.
+
+    SQLite only checks the trigger body when it runs, so these can be created
+    before ``entity_version`` exists.
+    """
+    bump = (
+        f"INSERT INTO entity_version(entity, version) VALUES ('{table}', 1) "
+        "ON CONFLICT(entity) DO UPDATE SET version = version + 1;"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_a{suffix} AFTER {operation} ON {table} BEGIN {bump} END"
+        for suffix, operation in (("i", "INSERT"), ("u", "UPDATE"), ("d", "DELETE"))
+    ]
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import datetime as dt
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import Column, Text
+from sqlalchemy import DDL, JSON, Column, Index, Text, event
 from sqlmodel import Field, SQLModel
 
+from app.models.entity_version import version_trigger_ddl
+
 
 class EventSource(str, Enum):
     local = "local"
@@ -16,6 +18,14 @@ class EventSource(str, Enum):
 
 class Event(SQLModel, table=True):
     __tablename__ = "event"
+    __table_args__ = (
+        Index("ix_event_start_end", "start", "end"),
+        Index("ix_event_end", "end"),
+        Index("ix_event_assignee_id_start", "assignee_id", "start"),
+        Index("ix_event_recurrence_end", "recurrence_end"),
+        Index("ix_event_recurrence_id_original_start", "recurrence_id", "original_start", unique=True),
+        Index("uq_event_calendar_id_external_id", "calendar_id", "external_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=200, nullable=False)
@@ -27,3 +37,21 @@ class Event(SQLModel, table=True):
     notes: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
     created_by: Optional[str] = Field(default=None, max_length=100)
     assignee_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    # RFC 5545 RRULE body (e.g. "FREQ=WEEKLY;BYDAY=MO"); start/end describe the first occurrence.
+    rrule: Optional[str] = Field(default=None, max_length=500)
+    # ISO-8601 original starts of cancelled occurrences of a recurring event.
+    exdates: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False, default=list))
+    # End of the last occurrence (datetime.max when unbounded); NULL for single events.
+    recurrence_end: Optional[dt.datetime] = Field(default=None)
+    # Set on rows that override one occurrence of a recurring event.
+    recurrence_id: Optional[int] = Field(default=None, foreign_key="event.id")
+    original_start: Optional[dt.datetime] = Field(default=None)
+    # Remote identity of synced events: the Google event id or CalDAV href (plus "#RECURRENCE-ID" for overrides).
+    calendar_id: Optional[int] = Field(default=None, foreign_key="calendar_source.id")
+    external_id: Optional[str] = Field(default=None, max_length=1000)
+    etag: Optional[str] = Field(default=None, max_length=200)
+
+
+# The feed ETag (/events/feed.ics) is the event table's change version.
+for _statement in version_trigger_ddl("event"):
+    event.listen(Event.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
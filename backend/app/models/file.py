@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import datetime as dt
 from typing import List, Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, SQLModel
 
 
 class File(SQLModel, table=True):
     __tablename__ = "file"
+    __table_args__ = (Index("ix_file_checksum", "checksum"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
+    # Relative to UPLOADS_DIRECTORY, "/"-separated.
     path: str = Field(max_length=500, nullable=False, unique=True)
     tags: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False, default=list))
     protected: bool = Field(default=False, nullable=False)
+    # SHA-256 of the content, hex; also the name of its blob in the content-addressed store.
     checksum: str = Field(max_length=128, nullable=False)
+    size: int = Field(default=0, nullable=False)
+    content_type: Optional[str] = Field(default=None, max_length=200)
+    updated_at: dt.datetime = Field(default_factory=dt.datetime.utcnow, nullable=False)
+    # Stat of the content when it was last hashed; the indexer skips the file while these still match.
+    mtime_ns: Optional[int] = Field(default=None)
+    inode: Optional[int] = Field(default=None)
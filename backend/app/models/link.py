@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime as dt
 from typing import List, Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import DDL, JSON, Column, Index, event
 from sqlmodel import Field, SQLModel
 
 from app.models.common import OwnedModel
@@ -18,3 +18,37 @@ class Link(OwnedModel, table=True):
     tags: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False, default=list))
     click_count: int = Field(default=0, nullable=False)
     last_accessed_at: Optional[dt.datetime] = Field(default=None, nullable=True)
+
+
+Index("ix_link_click_count_title", Link.__table__.c.click_count.desc(), Link.__table__.c.title)
+Index("ix_link_owner_id", Link.__table__.c.owner_id)
+
+# External-content FTS5 index over title/url/tags. The trigram tokenizer gives
+# case-insensitive substring (and therefore prefix) matches that also work for
+# Japanese titles, which unicode61 cannot segment.
+LINK_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS link_fts USING fts5(
+        title, url, tags, content='link', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS link_fts_ai AFTER INSERT ON link BEGIN
+        INSERT INTO link_fts(rowid, title, url, tags) VALUES (new.id, new.title, new.url, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS link_fts_ad AFTER DELETE ON link BEGIN
+        INSERT INTO link_fts(link_fts, rowid, title, url, tags) VALUES ('delete', old.id, old.title, old.url, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS link_fts_au AFTER UPDATE OF title, url, tags ON link BEGIN
+        INSERT INTO link_fts(link_fts, rowid, title, url, tags) VALUES ('delete', old.id, old.title, old.url, old.tags);
+        INSERT INTO link_fts(rowid, title, url, tags) VALUES (new.id, new.title, new.url, new.tags);
+    END
+    """,
+]
+
+for _statement in LINK_FTS_DDL:
+    event.listen(Link.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class Tag(SQLModel, table=True):
+    __tablename__ = "tag"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(max_length=100, nullable=False, unique=True)
+
+
+class LinkTag(SQLModel, table=True):
+    __tablename__ = "link_tag"
+    __table_args__ = (Index("ix_link_tag_tag_id_link_id", "tag_id", "link_id"),)
+
+    link_id: int = Field(foreign_key="link.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
+
+
+class FileTag(SQLModel, table=True):
+    __tablename__ = "file_tag"
+    __table_args__ = (Index("ix_file_tag_tag_id_file_id", "tag_id", "file_id"),)
+
+    file_id: int = Field(foreign_key="file.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
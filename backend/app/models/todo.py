@@ -4,6 +4,7 @@ import datetime as dt
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
@@ -14,12 +15,29 @@ class TodoStatus(str, Enum):
 
 class Todo(SQLModel, table=True):
     __tablename__ = "todo"
+    __table_args__ = (
+        Index("ix_todo_status_due_title", "status", "due", "title"),
+        Index("ix_todo_assignee_id", "assignee_id"),
+        Index("uq_todo_series_id_due", "series_id", "due", unique=True),
+        # Only the latest instance of each repeating series, which is all the catch-up pass reads.
+        Index(
+            "ix_todo_repeat_head_next_due",
+            "next_due",
+            sqlite_where=text("repeat_rule IS NOT NULL AND spawned_next = 0"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=200, nullable=False)
-    status: TodoStatus = Field(default=TodoStatus.open, index=True)
+    status: TodoStatus = Field(default=TodoStatus.open)
     due: Optional[dt.datetime] = Field(default=None)
     assignee_id: Optional[int] = Field(default=None, foreign_key="user.id")
     repeat_rule: Optional[str] = Field(default=None, max_length=100)
     list_id: Optional[str] = Field(default=None, max_length=50)
     completed_at: Optional[dt.datetime] = Field(default=None)
+    # Id of the first todo of a repeating series, shared by every instance spawned from it.
+    series_id: Optional[int] = Field(default=None, foreign_key="todo.id")
+    # True once the next instance of the series has been created from this one.
+    spawned_next: bool = Field(default=False, nullable=False)
+    # When the successor of a series head comes due (datetime.max if never); NULL until first computed.
+    next_due: Optional[dt.datetime] = Field(default=None)
@@ -17,7 +17,7 @@ class User(SQLModel, table=True):
     __tablename__ = "user"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(max_length=100, nullable=False)
+    name: str = Field(max_length=100, nullable=False, index=True)
     role: UserRole = Field(default=UserRole.user)
     email: Optional[str] = Field(default=None, unique=True, index=True, max_length=255)
     password_hash: Optional[str] = Field(
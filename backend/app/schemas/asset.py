@@ -1,5 +1,5 @@
-from datetime import date
-from typing import Dict, List
+from datetime import date, datetime
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -11,9 +11,32 @@ class AssetImportRowError(BaseModel):
 
 class AssetImportResponse(BaseModel):
     imported: int = Field(default=0)
+    inserted: int = Field(default=0)
+    updated: int = Field(default=0)
+    unchanged: int = Field(default=0)
+    failed_count: int = Field(default=0)
+    # Only the first rows that failed are listed; failed_count has the total.
     failed: List[AssetImportRowError] = Field(default_factory=list)
 
 
+class AssetImportJobRead(BaseModel):
+    id: int
+    status: Literal["queued", "running", "succeeded", "failed"]
+    filename: Optional[str] = None
+    rows_processed: int = 0
+    imported: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed_count: int = 0
+    failed: List[AssetImportRowError] = Field(default_factory=list)
+    error: Optional[str] = None
+    rows_per_second: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class AssetSnapshotRead(BaseModel):
     id: int
     date: date
@@ -30,3 +53,48 @@ class AssetSummaryItem(BaseModel):
 class AssetSummaryResponse(BaseModel):
     items: List[AssetSummaryItem]
 
+
+class AssetSeriesPoint(BaseModel):
+    month: str
+    balance: float
+    delta: Optional[float] = None
+    rolling_average: float
+
+
+class AssetSeries(BaseModel):
+    account_name: str
+    currency: str
+    points: List[AssetSeriesPoint]
+
+
+class AssetSeriesResponse(BaseModel):
+    window: int = 3
+    series: List[AssetSeries]
+
+
+class AssetLatestItem(BaseModel):
+    account_name: str
+    currency: str
+    date: date
+    balance: float
+
+
+class AssetLatestResponse(BaseModel):
+    items: List[AssetLatestItem]
+    totals: Dict[str, float]
+
+
+class AssetRollupMismatch(BaseModel):
+    month: str
+    currency: str
+    rollup_total: Optional[float] = None
+    actual_total: Optional[float] = None
+    rollup_count: int = 0
+    actual_count: int = 0
+
+
+class AssetRollupCheckResponse(BaseModel):
+    consistent: bool
+    months_checked: int
+    mismatches: List[AssetRollupMismatch] = Field(default_factory=list)
+
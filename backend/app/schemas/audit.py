@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class AuditLogRead(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    action: Literal["create", "update", "delete", "import", "rebuild"]
+    entity: str
+    entity_id: str
+    diff_json: Dict[str, Any]
+    at: datetime
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CalendarSourceCreate(BaseModel):
+    kind: Literal["google", "caldav"] = "caldav"
+    name: str = Field(min_length=1, max_length=200)
+    url: str = Field(min_length=1, max_length=1000, description="CalDAV collection URL or Google calendar id")
+    username: Optional[str] = Field(default=None, max_length=200)
+    password: Optional[str] = Field(default=None, max_length=500)
+    color: Optional[str] = Field(default=None, max_length=20)
+    enabled: bool = True
+
+
+class CalendarSourceRead(BaseModel):
+    id: int
+    kind: Literal["google", "caldav"]
+    name: str
+    url: str
+    username: Optional[str] = None
+    color: Optional[str] = None
+    enabled: bool
+    last_synced_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_fetched: int
+    last_changed: int
+    last_skipped: int
+    last_deleted: int
+    last_error: Optional[str] = None
+
+
+class CalendarSyncResult(BaseModel):
+    calendar_id: int
+    name: str
+    fetched: int
+    changed: int
+    skipped: int
+    deleted: int
+    duration_seconds: float
+    error: Optional[str] = None
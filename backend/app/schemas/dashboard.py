@@ -0,0 +1,18 @@
+from datetime import date, datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.asset import AssetSummaryItem
+from app.schemas.event import EventRead
+from app.schemas.link import LinkRead
+from app.schemas.todo import TodoRead
+
+
+class DashboardRead(BaseModel):
+    day: date
+    generated_at: datetime
+    links: List[LinkRead]
+    events: List[EventRead]
+    todos: List[TodoRead]
+    assets: List[AssetSummaryItem]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -14,6 +14,8 @@ class EventBase(BaseModel):
     notes: Optional[str] = None
     created_by: Optional[str] = Field(default=None, max_length=100)
     assignee_id: Optional[int] = None
+    rrule: Optional[str] = Field(default=None, max_length=500, description="RFC 5545 RRULE, e.g. FREQ=WEEKLY;BYDAY=MO")
+    exdates: List[datetime] = Field(default_factory=list)
 
 
 class EventCreate(EventBase):
@@ -30,7 +32,48 @@ class EventUpdate(BaseModel):
     notes: Optional[str] = None
     created_by: Optional[str] = Field(default=None, max_length=100)
     assignee_id: Optional[int] = None
+    rrule: Optional[str] = Field(default=None, max_length=500)
+    exdates: Optional[List[datetime]] = None
+
+
+class EventOccurrenceUpdate(BaseModel):
+    title: Optional[str] = Field(default=None, max_length=200)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    all_day: Optional[bool] = None
+    color: Optional[str] = Field(default=None, max_length=20)
+    notes: Optional[str] = None
+    assignee_id: Optional[int] = None
 
 
 class EventRead(EventBase):
     id: int
+    # Set on an override row: the id of the recurring event it replaces an occurrence of.
+    recurrence_id: Optional[int] = None
+    # Set on every occurrence of a recurring event (expanded or overridden).
+    original_start: Optional[datetime] = None
+    # Set on events pulled from an external calendar (see /calendars).
+    calendar_id: Optional[int] = None
+
+
+class EventWithConflicts(EventRead):
+    # Filled only when the request asks for ``check_conflicts``.
+    conflicts: Optional[List[EventRead]] = None
+
+
+class BusyInterval(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class AssigneeBusy(BaseModel):
+    assignee_id: int
+    busy: List[BusyInterval]
+
+
+class FreeBusyRead(BaseModel):
+    start: datetime
+    end: datetime
+    busy: List[BusyInterval]
+    free: List[BusyInterval]
+    assignees: List[AssigneeBusy]
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class FileRead(BaseModel):
+    id: int
+    path: str
+    size: int
+    checksum: str
+    content_type: Optional[str] = None
+    tags: List[str] = []
+    protected: bool = False
+    updated_at: datetime
@@ -26,6 +26,11 @@ class LinkUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 
+class LinkSearchHit(LinkRead):
+    snippet: Optional[str] = None
+    score: Optional[float] = None
+
+
 class LinkSearchResponse(BaseModel):
-    results: List[LinkRead]
+    results: List[LinkSearchHit]
 
@@ -0,0 +1,12 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+
+class TagFacetResponse(BaseModel):
+    items: List[TagCount]
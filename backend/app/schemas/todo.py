@@ -20,6 +20,8 @@ class TodoCreate(TodoBase):
 class TodoRead(TodoBase):
     id: int
     completed_at: Optional[datetime] = None
+    # Shared by every instance of a repeating todo.
+    series_id: Optional[int] = None
 
 
 class TodoUpdate(BaseModel):
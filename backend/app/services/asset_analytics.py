@@ -0,0 +1,164 @@
+"""Vectorized asset analytics over the raw snapshot history.
+
+Snapshot columns are loaded once into NumPy arrays, sorted by
+(account_name, currency, date), and every series is derived with array
+operations over group boundaries instead of per-row Python loops.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import String, type_coerce
+from sqlmodel import Session, select
+
+from app.models.asset_snapshot import AssetSnapshot
+from app.schemas.asset import (
+    AssetLatestItem,
+    AssetLatestResponse,
+    AssetSeries,
+    AssetSeriesPoint,
+    AssetSeriesResponse,
+)
+from app.services.assets import month_end, month_start
+
+
+@dataclass
+class SnapshotArrays:
+    accounts: np.ndarray  # account names, one per group
+    currencies: np.ndarray  # currency codes, one per group
+    group: np.ndarray  # int group index per row
+    dates: np.ndarray  # datetime64[D] per row
+    balances: np.ndarray  # float64 per row
+
+    def __len__(self) -> int:
+        return len(self.balances)
+
+
+def load_snapshot_arrays(
+    session: Session,
+    account: Optional[str] = None,
+    currency: Optional[str] = None,
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+) -> SnapshotArrays:
+    # Dates are read as ISO text and parsed by NumPy in one call instead of per row.
+    statement = select(
+        AssetSnapshot.account_name,
+        AssetSnapshot.currency,
+        type_coerce(AssetSnapshot.date, String),
+        AssetSnapshot.balance,
+    )
+    if account:
+        statement = statement.where(AssetSnapshot.account_name == account)
+    if currency:
+        statement = statement.where(AssetSnapshot.currency == currency)
+    if month_from:
+        statement = statement.where(AssetSnapshot.date >= month_start(month_from))
+    if month_to:
+        statement = statement.where(AssetSnapshot.date < month_end(month_to))
+    statement = statement.order_by(AssetSnapshot.account_name, AssetSnapshot.currency, AssetSnapshot.date)
+    rows = session.execute(statement).all()
+    if not rows:
+        empty = np.array([], dtype=object)
+        return SnapshotArrays(empty, empty, np.array([], dtype=np.int64), np.array([], "datetime64[D]"), np.array([]))
+
+    account_names, currency_codes, dates, balances = zip(*rows)
+    account_column = np.array(account_names, dtype=object)
+    currency_column = np.array(currency_codes, dtype=object)
+    # Rows arrive sorted by (account, currency), so a new group starts wherever either changes.
+    starts = np.r_[True, (account_column[1:] != account_column[:-1]) | (currency_column[1:] != currency_column[:-1])]
+    return SnapshotArrays(
+        accounts=account_column[starts],
+        currencies=currency_column[starts],
+        group=np.cumsum(starts) - 1,
+        dates=np.array(dates, dtype="datetime64[D]"),
+        balances=np.array(balances, dtype=np.float64),
+    )
+
+
+def _last_per_key(*keys: np.ndarray) -> np.ndarray:
+    """Mask of the last row in each run of equal keys (rows must be sorted by the keys)."""
+    changes = np.zeros(len(keys[0]) - 1, dtype=bool)
+    for key in keys:
+        changes |= key[1:] != key[:-1]
+    return np.r_[changes, True]
+
+
+def _rolling_mean(values: np.ndarray, group: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over up to ``window`` values that never crosses a group boundary."""
+    positions = np.arange(len(values))
+    group_start = np.maximum.accumulate(np.where(np.r_[True, group[1:] != group[:-1]], positions, 0))
+    window_start = np.maximum(group_start, positions - window + 1)
+    sums = np.r_[0.0, np.cumsum(values)]
+    return (sums[positions + 1] - sums[window_start]) / (positions - window_start + 1)
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def monthly_series(
+    session: Session,
+    account: Optional[str] = None,
+    currency: Optional[str] = None,
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+    window: int = 3,
+) -> AssetSeriesResponse:
+    """Month-end balance per account with month-over-month deltas and a rolling average."""
+    arrays = load_snapshot_arrays(session, account, currency, month_from, month_to)
+    if not len(arrays):
+        return AssetSeriesResponse(window=window, series=[])
+
+    months = arrays.dates.astype("datetime64[M]")
+    closing = _last_per_key(arrays.group, months)
+    group, months, balances = arrays.group[closing], months[closing], arrays.balances[closing]
+
+    first_in_group = np.r_[True, group[1:] != group[:-1]]
+    deltas = np.r_[np.nan, np.diff(balances)]
+    deltas[first_in_group] = np.nan
+    averages = _rolling_mean(balances, group, window)
+
+    labels = np.datetime_as_string(months, unit="M")
+    boundaries = np.flatnonzero(first_in_group).tolist() + [len(group)]
+    series = []
+    for index, (start, stop) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        points = [
+            AssetSeriesPoint(
+                month=str(labels[position]),
+                balance=float(balances[position]),
+                delta=_optional(deltas[position]),
+                rolling_average=float(averages[position]),
+            )
+            for position in range(start, stop)
+        ]
+        series.append(
+            AssetSeries(
+                account_name=str(arrays.accounts[index]),
+                currency=str(arrays.currencies[index]),
+                points=points,
+            )
+        )
+    return AssetSeriesResponse(window=window, series=series)
+
+
+def latest_balances(session: Session, currency: Optional[str] = None) -> AssetLatestResponse:
+    """Most recent balance of every account, with per-currency totals."""
+    arrays = load_snapshot_arrays(session, currency=currency)
+    if not len(arrays):
+        return AssetLatestResponse(items=[], totals={})
+
+    last = _last_per_key(arrays.group)
+    balances = arrays.balances[last]
+    dates = np.datetime_as_string(arrays.dates[last], unit="D")
+    codes, inverse = np.unique(arrays.currencies.astype(str), return_inverse=True)
+    totals = np.bincount(inverse, weights=balances, minlength=len(codes))
+
+    items: List[AssetLatestItem] = [
+        AssetLatestItem(
+            account_name=str(account_name), currency=str(code), date=str(day), balance=float(balance)
+        )
+        for account_name, code, day, balance in zip(arrays.accounts, arrays.currencies, dates, balances)
+    ]
+    return AssetLatestResponse(items=items, totals={str(code): float(total) for code, total in zip(codes, totals)})
@@ -0,0 +1,196 @@
+import datetime as dt
+import logging
+import queue
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, List, Optional
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db.session import session_scope
+from app.models.asset_import_job import AssetImportJob, ImportJobStatus
+from app.schemas.asset import AssetImportJobRead, AssetImportResponse, AssetImportRowError
+from app.services import assets as asset_service
+
+logger = logging.getLogger(__name__)
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+FINISHED_STATUSES = {ImportJobStatus.succeeded, ImportJobStatus.failed}
+
+
+def spool_upload(stream: BinaryIO, directory: Optional[Path] = None) -> Path:
+    """Copy an upload to the import directory in fixed-size chunks and return its path."""
+    directory = directory or settings.asset_import_directory
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{uuid.uuid4().hex}.csv"
+    with path.open("wb") as target:
+        shutil.copyfileobj(stream, target, SPOOL_CHUNK_BYTES)
+    return path
+
+
+def _job_read(job: AssetImportJob) -> AssetImportJobRead:
+    rows_per_second = job.rows_processed / job.elapsed_seconds if job.elapsed_seconds else None
+    return AssetImportJobRead(
+        id=job.id,
+        status=job.status,
+        filename=job.filename,
+        rows_processed=job.rows_processed,
+        imported=job.imported,
+        inserted=job.inserted,
+        updated=job.updated,
+        unchanged=job.unchanged,
+        failed_count=job.failed_count,
+        failed=job.failed,
+        error=job.error,
+        rows_per_second=rows_per_second,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def create_import_job(
+    session: Session, file_path: Path, filename: Optional[str], created_by: Optional[int]
+) -> AssetImportJobRead:
+    job = AssetImportJob(file_path=str(file_path), filename=filename, created_by=created_by)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return _job_read(job)
+
+
+def get_import_job(session: Session, job_id: int) -> AssetImportJobRead:
+    job = session.get(AssetImportJob, job_id)
+    if job is None:
+        raise ValueError("Import job not found")
+    return _job_read(job)
+
+
+def list_resumable_job_ids(session: Session) -> List[int]:
+    statement = (
+        select(AssetImportJob.id)
+        .where(AssetImportJob.status.in_([ImportJobStatus.queued, ImportJobStatus.running]))
+        .order_by(AssetImportJob.id.asc())
+    )
+    return list(session.exec(statement).all())
+
+
+def _finish(session: Session, job: AssetImportJob, status: ImportJobStatus, error: Optional[str] = None) -> None:
+    job.status = status
+    job.error = error[:500] if error else None
+    job.finished_at = job.updated_at = dt.datetime.utcnow()
+    session.add(job)
+    session.commit()
+    Path(job.file_path).unlink(missing_ok=True)
+
+
+def run_import_job(
+    session: Session, job_id: int, should_stop: Callable[[], bool] = lambda: False
+) -> Optional[AssetImportJob]:
+    """Import a spooled CSV, committing each chunk together with the job's progress.
+
+    Because rows and ``rows_processed`` land in the same transaction, a job that
+    was interrupted resumes from the first uncommitted chunk. ``should_stop`` is
+    checked between chunks and leaves the job ``running`` for the next start.
+    """
+    job = session.get(AssetImportJob, job_id)
+    if job is None or job.status in FINISHED_STATUSES:
+        return job
+    job.status = ImportJobStatus.running
+    job.started_at = job.started_at or dt.datetime.utcnow()
+    session.add(job)
+    session.commit()
+
+    progress = AssetImportResponse(
+        imported=job.imported,
+        inserted=job.inserted,
+        updated=job.updated,
+        unchanged=job.unchanged,
+        failed_count=job.failed_count,
+        failed=[AssetImportRowError(**error) for error in job.failed],
+    )
+    try:
+        with open(job.file_path, "rb") as stream:
+            mark = time.perf_counter()
+            for chunk in asset_service.iter_import_chunks(stream, skip_rows=job.rows_processed):
+                asset_service.import_chunk(session, chunk, progress)
+                now = time.perf_counter()
+                job.rows_processed += len(chunk)
+                job.imported = progress.imported
+                job.inserted = progress.inserted
+                job.updated = progress.updated
+                job.unchanged = progress.unchanged
+                job.failed_count = progress.failed_count
+                job.failed = [error.model_dump() for error in progress.failed]
+                job.elapsed_seconds += now - mark
+                job.updated_at = dt.datetime.utcnow()
+                session.add(job)
+                session.commit()
+                mark = now
+                if should_stop():
+                    return job
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Asset import job %s failed", job_id)
+        session.rollback()
+        _finish(session, job, ImportJobStatus.failed, str(exc))
+        return job
+    _finish(session, job, ImportJobStatus.succeeded)
+    return job
+
+
+class ImportWorker:
+    """Runs asset import jobs one at a time on a background thread.
+
+    Jobs left ``queued`` or ``running`` by a previous process are picked up again on ``start``.
+    """
+
+    def __init__(self, session_factory: Callable[[], ContextManager[Session]] = session_scope) -> None:
+        self.session_factory = session_factory
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._queue = queue.Queue()
+        with self.session_factory() as session:
+            for job_id in list_resumable_job_ids(session):
+                self._queue.put(job_id)
+        self._thread = threading.Thread(target=self._run, name="asset-import-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, job_id: int) -> None:
+        self._queue.put(job_id)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after the current chunk; unfinished jobs resume on the next start."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            try:
+                with self.session_factory() as session:
+                    run_import_job(session, job_id, self._stop.is_set)
+            except Exception:  # noqa: BLE001
+                logger.exception("Asset import job %s could not be run", job_id)
+
+
+import_worker = ImportWorker()
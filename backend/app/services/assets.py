@@ -1,44 +1,175 @@
 import csv
+import math
 from collections import defaultdict
 from datetime import date
-from io import StringIO, TextIOWrapper
-from typing import Dict, Iterable, List, Optional, TextIO
+from io import TextIOWrapper
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from fastapi import UploadFile
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.sqlite import insert
 from sqlmodel import Session, select
 
+from app.models.asset_monthly_rollup import AssetMonthlyRollup
 from app.models.asset_snapshot import AssetSnapshot
 from app.schemas.asset import (
     AssetImportResponse,
     AssetImportRowError,
+    AssetRollupCheckResponse,
+    AssetRollupMismatch,
     AssetSnapshotRead,
     AssetSummaryItem,
     AssetSummaryResponse,
 )
+from app.services import audit
 
 
-def _open_csv(upload: UploadFile) -> Iterable[Dict[str, str]]:
-    content = upload.file.read().decode("utf-8")
-    upload.file.seek(0)
-    reader = csv.DictReader(StringIO(content))
-    return list(reader)
+# Rows are validated and inserted in chunks so memory stays flat however long the export is.
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
 
 
-def import_asset_csv(session: Session, upload: UploadFile) -> AssetImportResponse:
-    response = AssetImportResponse()
-    rows = _open_csv(upload)
-    for index, row in enumerate(rows, start=2):
+def _iter_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Decode ``stream`` incrementally and yield ``(line_number, row)`` pairs."""
+    text = TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        # Leave the underlying upload open for its owner.
+        text.detach()
+
+
+def _parse_row(row: Dict[str, str]) -> Dict[str, object]:
+    return {
+        "date": date.fromisoformat(row["date"]),
+        "account_name": row["account_name"],
+        "balance": float(row["balance"]),
+        "currency": row["currency"],
+    }
+
+
+def _chunks(rows: Iterable[Tuple[int, Dict[str, str]]], size: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+_SnapshotKey = Tuple[date, str, str]
+
+
+def _upsert_statement():
+    table = AssetSnapshot.__table__
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.date, table.c.account_name, table.c.currency],
+        set_={"balance": statement.excluded.balance},
+    )
+
+
+def _existing_balances(session: Session, keys: List[_SnapshotKey]) -> Dict[_SnapshotKey, float]:
+    # Probe the unique index on its leading date column; other accounts on the same days are filtered here.
+    table = AssetSnapshot.__table__
+    statement = select(table.c.date, table.c.account_name, table.c.currency, table.c.balance).where(
+        table.c.date.in_({day for day, _, _ in keys})
+    )
+    wanted = set(keys)
+    rows = session.execute(statement).all()
+    return {
+        (day, account, currency): balance
+        for day, account, currency, balance in rows
+        if (day, account, currency) in wanted
+    }
+
+
+def _apply_rollup_deltas(
+    session: Session, changed: List[Dict[str, object]], existing: Dict[_SnapshotKey, float]
+) -> None:
+    """Fold written snapshots into asset_monthly_rollup in the same transaction."""
+    deltas: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0.0, 0])
+    for values in changed:
+        key = (values["date"], values["account_name"], values["currency"])
+        delta = deltas[(values["date"].strftime("%Y-%m"), values["currency"])]
+        if key in existing:
+            delta[0] += values["balance"] - existing[key]
+        else:
+            delta[0] += values["balance"]
+            delta[1] += 1
+    table = AssetMonthlyRollup.__table__
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.month, table.c.currency],
+        set_={
+            "total": table.c.total + statement.excluded.total,
+            "snapshot_count": table.c.snapshot_count + statement.excluded.snapshot_count,
+        },
+    )
+    session.execute(
+        statement,
+        [
+            {"month": month, "currency": currency, "total": total, "snapshot_count": count}
+            for (month, currency), (total, count) in sorted(deltas.items())
+        ],
+    )
+
+
+def import_chunk(session: Session, chunk: List[Tuple[int, Dict[str, str]]], response: AssetImportResponse) -> None:
+    """Validate one chunk of CSV rows and upsert the valid ones without committing.
+
+    Rows are keyed on (date, account_name, currency). The chunk's stored balances
+    are read in one indexed query first, so rows that would not change anything
+    are counted as unchanged without being written, and re-importing an export
+    is close to a read-only pass.
+    """
+    latest: Dict[_SnapshotKey, Dict[str, object]] = {}
+    superseded = 0
+    for line_number, row in chunk:
         try:
-            snapshot = AssetSnapshot(
-                date=date.fromisoformat(row["date"]),
-                account_name=row["account_name"],
-                balance=float(row["balance"]),
-                currency=row["currency"],
-            )
-            session.add(snapshot)
-            response.imported += 1
+            values = _parse_row(row)
         except Exception as exc:  # noqa: BLE001
-            response.failed.append(AssetImportRowError(line_number=index, error=str(exc)))
+            response.failed_count += 1
+            if len(response.failed) < MAX_REPORTED_ERRORS:
+                response.failed.append(AssetImportRowError(line_number=line_number, error=str(exc)))
+            continue
+        key = (values["date"], values["account_name"], values["currency"])
+        if key in latest:
+            # A later row for the same key in this chunk wins.
+            superseded += 1
+        latest[key] = values
+    if not latest:
+        return
+
+    existing = _existing_balances(session, list(latest))
+    changed = [
+        values for key, values in latest.items() if key not in existing or existing[key] != values["balance"]
+    ]
+    inserted = sum(1 for key in latest if key not in existing)
+    response.imported += len(latest) + superseded
+    response.inserted += inserted
+    response.updated += len(changed) - inserted
+    response.unchanged += len(latest) - len(changed) + superseded
+    if changed:
+        session.execute(_upsert_statement(), changed)
+        _apply_rollup_deltas(session, changed, existing)
+        dates = [values["date"] for values in changed]
+        audit.stage(
+            session,
+            "import",
+            "asset_snapshot",
+            f"{chunk[0][0]}-{chunk[-1][0]}",
+            {"inserted": inserted, "updated": len(changed) - inserted, "dates": [min(dates).isoformat(), max(dates).isoformat()]},
+        )
+
+
+def iter_import_chunks(stream: BinaryIO, skip_rows: int = 0) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    return _chunks(islice(_iter_csv_rows(stream), skip_rows, None), IMPORT_CHUNK_SIZE)
+
+
+def import_asset_csv(session: Session, stream: BinaryIO) -> AssetImportResponse:
+    response = AssetImportResponse()
+    for chunk in iter_import_chunks(stream):
+        import_chunk(session, chunk, response)
     session.commit()
     return response
 
@@ -58,26 +189,109 @@ def list_snapshots(session: Session) -> List[AssetSnapshotRead]:
     ]
 
 
-def summarize_assets(session: Session, month_from: Optional[str], month_to: Optional[str]) -> AssetSummaryResponse:
-    statement = select(AssetSnapshot)
+def _month_key(value: str) -> str:
+    year, month = map(int, value.split("-"))
+    return f"{year:04d}-{month:02d}"
+
+
+def month_start(value: str) -> date:
+    year, month = map(int, value.split("-"))
+    return date(year, month, 1)
+
+
+def month_end(value: str) -> date:
+    year, month = map(int, value.split("-"))
+    return date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
+def aggregate_monthly_totals(
+    session: Session, month_from: Optional[str], month_to: Optional[str]
+) -> Dict[Tuple[str, str], Tuple[float, int]]:
+    """Sum the raw snapshots per (month, currency) with a single GROUP BY."""
+    month = func.strftime("%Y-%m", AssetSnapshot.date)
+    statement = select(month, AssetSnapshot.currency, func.sum(AssetSnapshot.balance), func.count())
     if month_from:
-        year, month = map(int, month_from.split("-"))
-        statement = statement.where(AssetSnapshot.date >= date(year, month, 1))
+        statement = statement.where(AssetSnapshot.date >= month_start(month_from))
     if month_to:
-        year, month = map(int, month_to.split("-"))
-        if month == 12:
-            statement = statement.where(AssetSnapshot.date < date(year + 1, 1, 1))
-        else:
-            statement = statement.where(AssetSnapshot.date < date(year, month + 1, 1))
-    statement = statement.order_by(AssetSnapshot.date.asc())
+        statement = statement.where(AssetSnapshot.date < month_end(month_to))
+    statement = statement.group_by(month, AssetSnapshot.currency)
+    return {
+        (month_key, currency): (total, count)
+        for month_key, currency, total, count in session.exec(statement).all()
+    }
+
+
+def _rollup_rows(session: Session, month_from: Optional[str], month_to: Optional[str]) -> List[AssetMonthlyRollup]:
+    statement = select(AssetMonthlyRollup)
+    if month_from:
+        statement = statement.where(AssetMonthlyRollup.month >= _month_key(month_from))
+    if month_to:
+        statement = statement.where(AssetMonthlyRollup.month <= _month_key(month_to))
+    statement = statement.order_by(AssetMonthlyRollup.month.asc(), AssetMonthlyRollup.currency.asc())
+    return list(session.exec(statement).all())
+
+
+def summarize_assets(session: Session, month_from: Optional[str], month_to: Optional[str]) -> AssetSummaryResponse:
+    bucket: Dict[str, Dict[str, float]] = defaultdict(dict)
+    for row in _rollup_rows(session, month_from, month_to):
+        if row.snapshot_count:
+            bucket[row.month][row.currency] = row.total
+    return AssetSummaryResponse(
+        items=[AssetSummaryItem(month=month, totals=totals) for month, totals in bucket.items()]
+    )
+
+
+def check_monthly_rollup(
+    session: Session, month_from: Optional[str] = None, month_to: Optional[str] = None
+) -> AssetRollupCheckResponse:
+    """Compare asset_monthly_rollup with a fresh GROUP BY over the raw snapshots."""
+    actual = aggregate_monthly_totals(session, month_from, month_to)
+    stored = {(row.month, row.currency): (row.total, row.snapshot_count) for row in _rollup_rows(session, month_from, month_to)}
+    mismatches = []
+    for key in sorted(actual.keys() | stored.keys()):
+        actual_total, actual_count = actual.get(key, (None, 0))
+        rollup_total, rollup_count = stored.get(key, (None, 0))
+        if rollup_count == 0 and actual_count == 0:
+            continue
+        same_total = (
+            actual_total is not None
+            and rollup_total is not None
+            and math.isclose(actual_total, rollup_total, rel_tol=1e-9, abs_tol=1e-6)
+        )
+        if actual_count != rollup_count or not same_total:
+            mismatches.append(
+                AssetRollupMismatch(
+                    month=key[0],
+                    currency=key[1],
+                    rollup_total=rollup_total,
+                    actual_total=actual_total,
+                    rollup_count=rollup_count,
+                    actual_count=actual_count,
+                )
+            )
+    return AssetRollupCheckResponse(
+        consistent=not mismatches,
+        months_checked=len({month for month, _ in actual.keys() | stored.keys()}),
+        mismatches=mismatches,
+    )
 
-    bucket: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
-    for snapshot in session.exec(statement).all():
-        month_key = snapshot.date.strftime("%Y-%m")
-        bucket[month_key][snapshot.currency] += snapshot.balance
 
-    items = [
-        AssetSummaryItem(month=month, totals=dict(currency_totals))
-        for month, currency_totals in sorted(bucket.items(), key=lambda item: item[0])
+def rebuild_monthly_rollup(
+    session: Session, month_from: Optional[str] = None, month_to: Optional[str] = None
+) -> AssetRollupCheckResponse:
+    """Recompute the rollup rows in the range from the raw snapshots."""
+    statement = delete(AssetMonthlyRollup)
+    if month_from:
+        statement = statement.where(AssetMonthlyRollup.month >= _month_key(month_from))
+    if month_to:
+        statement = statement.where(AssetMonthlyRollup.month <= _month_key(month_to))
+    session.execute(statement)
+    rows = [
+        {"month": month, "currency": currency, "total": total, "snapshot_count": count}
+        for (month, currency), (total, count) in aggregate_monthly_totals(session, month_from, month_to).items()
     ]
-    return AssetSummaryResponse(items=items)
+    if rows:
+        session.execute(insert(AssetMonthlyRollup.__table__), rows)
+    audit.stage(session, "rebuild", "asset_monthly_rollup", f"{month_from or ''}..{month_to or ''}", {"rows": len(rows)})
+    session.commit()
+    return check_monthly_rollup(session, month_from, month_to)
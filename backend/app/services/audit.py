@@ -0,0 +1,270 @@
+"""Audit trail: compact diffs of every committed mutation, written to ``audit_log`` in batches.
+
+Changes to audited models are collected from each session flush, merged per
+row, and handed to ``audit_queue`` only when the transaction commits (a
+rollback discards them). ``audit_writer`` drains the queue in a worker thread
+and bulk-inserts the entries, so a request never waits on the audit insert.
+The queue is bounded: when the writer falls behind, producers block for up to
+``AUDIT_ENQUEUE_TIMEOUT_SECONDS`` and the entry is dropped (and logged) only
+after that; on the event loop's thread (async mode) the queue is flushed
+synchronously instead of waiting. Entries are queued once the committed
+transaction has returned its connection to the pool, so a blocked producer
+never holds the writer connection the audit writer needs to drain the queue. A
+crash loses at most the entries queued since the last flush.
+
+Diffs are stored as ``{"field": value}`` of the non-null fields for ``create``
+and ``delete``, and ``{"field": [old, new]}`` of the changed fields for ``update``.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import queue
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import session_scope
+from app.models.audit_log import AuditLog
+from app.models.contact import Contact
+from app.models.event import Event
+from app.models.link import Link
+from app.models.todo import Todo
+
+logger = logging.getLogger(__name__)
+
+AUDITED_MODELS = (Link, Contact, Event, Todo)
+BATCH_SIZE = 500
+
+# Id of the user making the current request; set by the auth dependency.
+audit_actor: ContextVar[Optional[int]] = ContextVar("audit_actor", default=None)
+
+_PENDING_KEY = "audit_pending"
+# Entries of a committed transaction, queued when it releases its connection.
+_COMMITTED_KEY = "audit_committed"
+
+AuditEntry = Dict[str, Any]
+
+# Called with the entity names of each committed transaction's audited changes (e.g. to drop caches).
+_commit_hooks: List[Callable[[Set[str]], None]] = []
+
+
+class AuditQueue:
+    """Bounded FIFO of audit entries between committing sessions and the writer."""
+
+    def __init__(self, max_entries: int, flush_threshold: int, enqueue_timeout: float) -> None:
+        self.flush_threshold = flush_threshold
+        self.enqueue_timeout = enqueue_timeout
+        self.dropped = 0
+        self._queue: "queue.Queue[AuditEntry]" = queue.Queue(maxsize=max_entries)
+        # A batch whose insert failed; written before anything newer on the next flush.
+        self._retry: List[AuditEntry] = []
+        self._flush_lock = threading.Lock()
+
+    def put(self, entries: List[AuditEntry], on_full: Any = None, drain: Any = None) -> None:
+        """Queue ``entries``; a full queue is waited on, or drained here on the event loop's thread.
+
+        Off the loop, ``on_full`` wakes the writer and the producer blocks for up
+        to ``enqueue_timeout``. Async sessions commit on the loop's thread, where
+        blocking would also keep the writer from being woken, so ``drain`` flushes
+        the queue synchronously instead. Entries are dropped only if that fails.
+        """
+        try:
+            asyncio.get_running_loop()
+            on_loop = True
+        except RuntimeError:
+            on_loop = False
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+                continue
+            except queue.Full:
+                pass
+            try:
+                if on_loop and drain is not None:
+                    try:
+                        drain()
+                    except Exception:
+                        logger.exception("Audit flush on a full queue failed")
+                    self._queue.put_nowait(entry)
+                else:
+                    if on_full is not None:
+                        on_full()
+                    self._queue.put(entry, timeout=self.enqueue_timeout)
+            except queue.Full:
+                self.dropped += 1
+                logger.error(
+                    "Audit queue full, dropped %s %s %s", entry["action"], entry["entity"], entry["entity_id"]
+                )
+
+    def should_flush(self) -> bool:
+        return self._queue.qsize() >= self.flush_threshold
+
+    def _take(self, limit: int) -> List[AuditEntry]:
+        batch: List[AuditEntry] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self, session: Session) -> int:
+        """Insert every queued entry through ``session`` in batches and return how many were written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch, self._retry = self._retry or self._take(BATCH_SIZE), []
+                if not batch:
+                    return written
+                try:
+                    session.execute(insert(AuditLog.__table__), batch)
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    self._retry = batch
+                    raise
+                written += len(batch)
+
+    def __len__(self) -> int:
+        return self._queue.qsize() + len(self._retry)
+
+
+def _jsonable(value: Any) -> Any:
+    return to_jsonable_python(value, fallback=str)
+
+
+def _snapshot(target: Any) -> Dict[str, Any]:
+    # Only loaded attributes: reading an expired one of a deleted row would hit the database.
+    state = inspect(target)
+    return {
+        attr.key: _jsonable(state.dict[attr.key])
+        for attr in state.mapper.column_attrs
+        if state.dict.get(attr.key) is not None
+    }
+
+
+def _changes(target: Any) -> Dict[str, List[Any]]:
+    state = inspect(target)
+    changes: Dict[str, List[Any]] = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            changes[attr.key] = [_jsonable(old), _jsonable(new)]
+    return changes
+
+
+def _merge(previous: AuditEntry, action: str, diff: Dict[str, Any]) -> Optional[AuditEntry]:
+    """Fold a later change of the same row within one transaction into its earlier entry."""
+    if previous["action"] == "create" and action == "delete":
+        return None
+    if previous["action"] == "create" and action == "update":
+        values = {**previous["diff_json"], **{key: new for key, (_, new) in diff.items()}}
+        return {**previous, "diff_json": {key: value for key, value in values.items() if value is not None}}
+    if previous["action"] == "update" and action == "update":
+        merged = dict(previous["diff_json"])
+        for key, (old, new) in diff.items():
+            merged[key] = [merged[key][0] if key in merged else old, new]
+        return {**previous, "diff_json": {key: pair for key, pair in merged.items() if pair[0] != pair[1]}}
+    return {**previous, "action": action, "diff_json": diff}
+
+
+def stage(session: Session, action: str, entity: str, entity_id: Any, diff: Dict[str, Any]) -> None:
+    """Record a change made through ``session``; it is queued when the session commits."""
+    pending: Dict[Tuple[str, str], AuditEntry] = session.info.setdefault(_PENDING_KEY, {})
+    key = (entity, str(entity_id))
+    previous = pending.get(key)
+    if previous is None:
+        pending[key] = {
+            "user_id": audit_actor.get(),
+            "action": action,
+            "entity": entity,
+            "entity_id": str(entity_id),
+            "diff_json": diff,
+            "at": dt.datetime.utcnow(),
+        }
+        return
+    merged = _merge(previous, action, diff)
+    if merged is None:
+        del pending[key]
+    else:
+        pending[key] = merged
+
+
+def row_diff(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """The ``create``/``delete`` diff of a row read by a Core statement, e.g. a DELETE ... RETURNING."""
+    return {key: _jsonable(value) for key, value in values.items() if value is not None}
+
+
+def on_commit(hook: Callable[[Set[str]], None]) -> Callable[[Set[str]], None]:
+    """Register ``hook`` to run after every commit that changed audited entities."""
+    _commit_hooks.append(hook)
+    return hook
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    for target in session.new:
+        if isinstance(target, AUDITED_MODELS):
+            stage(session, "create", target.__tablename__, target.id, _snapshot(target))
+    for target in session.dirty:
+        if isinstance(target, AUDITED_MODELS) and session.is_modified(target, include_collections=False):
+            changes = _changes(target)
+            if changes:
+                stage(session, "update", target.__tablename__, target.id, changes)
+    for target in session.deleted:
+        if isinstance(target, AUDITED_MODELS):
+            stage(session, "delete", target.__tablename__, target.id, _snapshot(target))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    entities = {entry["entity"] for entry in pending.values()}
+    for hook in _commit_hooks:
+        hook(entities)
+    # after_commit runs before the connection is released; queueing here could block while holding it.
+    session.info.setdefault(_COMMITTED_KEY, []).extend(pending.values())
+
+
+@event.listens_for(OrmSession, "after_transaction_end")
+def _queue_committed(session: Session, transaction: Any) -> None:
+    if transaction.parent is not None:
+        return
+    entries = session.info.pop(_COMMITTED_KEY, None)
+    if not entries:
+        return
+    audit_queue.put(entries, on_full=audit_writer.wake, drain=flush_audit)
+    if audit_queue.should_flush():
+        audit_writer.wake()
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def flush_audit() -> int:
+    with session_scope() as session:
+        return audit_queue.flush(session)
+
+
+audit_queue = AuditQueue(
+    max_entries=settings.audit_queue_size,
+    flush_threshold=settings.audit_flush_threshold,
+    enqueue_timeout=settings.audit_enqueue_timeout_seconds,
+)
+audit_writer = PeriodicTask("audit-writer", settings.audit_flush_interval_seconds, flush_audit)
@@ -0,0 +1,179 @@
+"""Audit log retention: monthly gzip JSON Lines archives and lookups that span them.
+
+Entries older than ``AUDIT_RETENTION_DAYS`` are moved, oldest first, in
+chunks: each chunk is appended to ``audit-YYYY-MM.jsonl.gz`` (one file per
+month of ``at``) and fsynced, then deleted from ``audit_log`` in its own
+transaction. Archives are append-only; every run adds a gzip member, which
+``gzip`` reads back as one stream. A crash between the append and the delete
+archives that chunk twice, so readers skip ids they have already returned.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import delete, tuple_
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import session_scope
+from app.models.audit_log import AuditLog
+from app.schemas.audit import AuditLogRead
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_CHUNK_SIZE = 5000
+ARCHIVE_PREFIX = "audit-"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+_COLUMNS = (
+    AuditLog.id,
+    AuditLog.user_id,
+    AuditLog.action,
+    AuditLog.entity,
+    AuditLog.entity_id,
+    AuditLog.diff_json,
+    AuditLog.at,
+)
+
+
+def archive_directory() -> Path:
+    return settings.backup_directory / "audit"
+
+
+def _archive_path(directory: Path, month: str) -> Path:
+    return directory / f"{ARCHIVE_PREFIX}{month}{ARCHIVE_SUFFIX}"
+
+
+def _append(path: Path, records: List[Dict[str, Any]]) -> None:
+    payload = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+    with path.open("ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as archive:
+            archive.write(payload.encode("utf-8"))
+        raw.flush()
+        # The rows are deleted right after this, so the archive must be on disk first.
+        os.fsync(raw.fileno())
+
+
+def archive_audit_log(
+    session: Session, cutoff: datetime, directory: Optional[Path] = None, chunk_size: int = ARCHIVE_CHUNK_SIZE
+) -> int:
+    """Move every entry older than ``cutoff`` into the monthly archives; returns how many moved."""
+    directory = directory or archive_directory()
+    moved = 0
+    while True:
+        statement = select(*_COLUMNS).where(AuditLog.at < cutoff).order_by(AuditLog.at, AuditLog.id).limit(chunk_size)
+        rows = session.execute(statement).all()
+        if not rows:
+            return moved
+        months: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            record = dict(row._mapping)
+            record["at"] = row.at.isoformat()
+            months[row.at.strftime("%Y-%m")].append(record)
+        directory.mkdir(parents=True, exist_ok=True)
+        for month, records in months.items():
+            _append(_archive_path(directory, month), records)
+        session.execute(delete(AuditLog).where(AuditLog.id.in_([row.id for row in rows])))
+        session.commit()
+        moved += len(rows)
+
+
+def _archived_months(directory: Path, since: Optional[datetime], until: Optional[datetime]) -> List[Path]:
+    """Archive files that can hold entries in [since, until], newest month first."""
+    if not directory.is_dir():
+        return []
+    paths = []
+    for path in directory.glob(f"{ARCHIVE_PREFIX}*{ARCHIVE_SUFFIX}"):
+        month = path.name[len(ARCHIVE_PREFIX) : -len(ARCHIVE_SUFFIX)]
+        if since is not None and month < since.strftime("%Y-%m"):
+            continue
+        if until is not None and month > until.strftime("%Y-%m"):
+            continue
+        paths.append(path)
+    return sorted(paths, reverse=True)
+
+
+def _read_archive(path: Path) -> Iterator[AuditLogRead]:
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            yield AuditLogRead.model_validate_json(line)
+
+
+def query_audit(
+    session: Session,
+    entity: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    directory: Optional[Path] = None,
+    before_id: Optional[int] = None,
+) -> List[AuditLogRead]:
+    """Entries matching the filters, newest first, from the table and then from the archives.
+
+    The archives only hold entries older than anything left in the table, so
+    they are read only when the table cannot fill ``limit``, newest month first.
+    ``until`` is exclusive. To page further back, pass the last entry's ``at``
+    and ``id`` as ``until`` and ``before_id``. Entries at that same time with a
+    smaller id are then included, so ties on ``at`` are not skipped.
+    """
+    statement = select(*_COLUMNS)
+    if entity is not None:
+        statement = statement.where(AuditLog.entity == entity)
+    if entity_id is not None:
+        statement = statement.where(AuditLog.entity_id == entity_id)
+    if since is not None:
+        statement = statement.where(AuditLog.at >= since)
+    if until is not None and before_id is not None:
+        statement = statement.where(tuple_(AuditLog.at, AuditLog.id) < (until, before_id))
+    elif until is not None:
+        statement = statement.where(AuditLog.at < until)
+    statement = statement.order_by(AuditLog.at.desc(), AuditLog.id.desc()).limit(limit)
+    entries = [AuditLogRead.model_validate(row, from_attributes=True) for row in session.execute(statement).all()]
+    if len(entries) >= limit:
+        return entries
+
+    seen = {entry.id for entry in entries}
+    for path in _archived_months(directory or archive_directory(), since, until):
+        matches = [
+            record
+            for record in _read_archive(path)
+            if record.id not in seen
+            and (entity is None or record.entity == entity)
+            and (entity_id is None or record.entity_id == entity_id)
+            and (since is None or record.at >= since)
+            and (
+                until is None
+                or record.at < until
+                or (record.at == until and before_id is not None and record.id < before_id)
+            )
+        ]
+        for record in sorted(matches, key=lambda record: (record.at, record.id), reverse=True):
+            if record.id in seen:
+                continue
+            seen.add(record.id)
+            entries.append(record)
+            if len(entries) >= limit:
+                return entries
+    return entries
+
+
+def run_retention() -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.audit_retention_days)
+    with session_scope() as session:
+        moved = archive_audit_log(session, cutoff)
+    if moved:
+        logger.info("Archived %d audit log entries older than %s", moved, cutoff.date())
+    return moved
+
+
+audit_retention = PeriodicTask(
+    "audit-retention", settings.audit_retention_interval_seconds, run_retention, run_on_stop=False
+)
@@ -0,0 +1,348 @@
+"""Incremental pull of remote calendars (Google Calendar, CalDAV) into ``event``."""
+
+import datetime as dt
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import session_scope
+from app.models.calendar_source import CalendarKind, CalendarSource
+from app.models.event import Event, EventSource
+from app.schemas.calendar import CalendarSourceCreate
+from app.services import caldav, google_calendar, recurrence
+from app.services.calendar_types import RemoteChanges, RemoteEvent, SyncResult
+
+logger = logging.getLogger(__name__)
+
+SYNC_BATCH_SIZE = 500
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def http_client() -> httpx.Client:
+    """The shared HTTP client; its keep-alive pool is reused across calendars and runs."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            concurrency = settings.calendar_sync_concurrency
+            _client = httpx.Client(
+                timeout=settings.calendar_sync_timeout_seconds,
+                limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency),
+                follow_redirects=True,
+            )
+        return _client
+
+
+def close_http_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _batches(items: Sequence[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _resource(external_id: str) -> str:
+    return external_id.partition("#")[0]
+
+
+def _event_values(source: CalendarSource, remote: RemoteEvent, recurrence_id: Optional[int] = None) -> Dict[str, Any]:
+    rrule = None
+    if remote.rrule and remote.master_external_id is None:
+        try:
+            rrule = recurrence.normalize_rrule(remote.rrule, remote.start)
+        except recurrence.InvalidRecurrence:
+            logger.warning("Calendar %s: unsupported RRULE %r on %s", source.id, remote.rrule, remote.external_id)
+    return {
+        "calendar_id": source.id,
+        "external_id": remote.external_id,
+        "etag": remote.etag,
+        "title": remote.title,
+        "start": remote.start,
+        "end": remote.end,
+        "all_day": remote.all_day,
+        "notes": remote.notes,
+        "source": EventSource(source.kind.value),
+        "color": source.color,
+        "rrule": rrule,
+        "exdates": sorted({value.isoformat() for value in remote.exdates or []}),
+        "recurrence_end": recurrence.recurrence_end(rrule, remote.start, remote.end) if rrule else None,
+        "recurrence_id": recurrence_id,
+        "original_start": remote.original_start,
+    }
+
+
+def _upsert_events(session: Session, rows: List[Dict[str, Any]], keep_exdates: bool = False) -> None:
+    """Insert or update rows keyed on (calendar_id, external_id), one executemany per batch."""
+    table = Event.__table__
+    for batch in _batches(rows, SYNC_BATCH_SIZE):
+        statement = insert(table)
+        skipped_columns = {"calendar_id", "external_id", *(["exdates"] if keep_exdates else [])}
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.calendar_id, table.c.external_id],
+            set_={name: statement.excluded[name] for name in batch[0] if name not in skipped_columns},
+        )
+        session.execute(statement, batch)
+
+
+def _delete_events(session: Session, event_ids: Iterable[int]) -> int:
+    deleted = 0
+    for batch in _batches(list(event_ids), SYNC_BATCH_SIZE):
+        deleted += session.execute(delete(Event).where(Event.recurrence_id.in_(batch))).rowcount
+        deleted += session.execute(delete(Event).where(Event.id.in_(batch))).rowcount
+    return deleted
+
+
+def _apply_cancellations(session: Session, master_ids: Dict[str, int], cancelled: List[Tuple[str, dt.datetime]]) -> Tuple[int, int]:
+    by_master: Dict[int, set] = defaultdict(set)
+    for master_external_id, original_start in cancelled:
+        if master_external_id in master_ids:
+            by_master[master_ids[master_external_id]].add(original_start)
+    changed = deleted = 0
+    for master_id, starts in by_master.items():
+        deleted += session.execute(
+            delete(Event).where(Event.recurrence_id == master_id, Event.original_start.in_(starts))
+        ).rowcount
+        master = session.get(Event, master_id, populate_existing=True)
+        exdates = sorted({*master.exdates, *(value.isoformat() for value in starts)})
+        if exdates != master.exdates:
+            master.exdates = exdates
+            session.add(master)
+            changed += 1
+    return changed, deleted
+
+
+def apply_remote_changes(session: Session, source: CalendarSource, changes: RemoteChanges) -> SyncResult:
+    """Write one fetch's changes together with the new sync token in a single transaction.
+
+    Events whose stored ETag matches are skipped without a write; a crash before
+    the commit leaves the previous token in place, so the next run refetches the
+    same changes and the upserts converge.
+    """
+    result = SyncResult(calendar_id=source.id, name=source.name, fetched=changes.fetched, skipped=changes.skipped)
+    rows = session.execute(
+        select(Event.id, Event.external_id, Event.etag).where(Event.calendar_id == source.id)
+    ).all()
+    existing = {external_id: (event_id, etag) for event_id, external_id, etag in rows}
+
+    incoming = {event.external_id for event in changes.events}
+    deleted_resources = set(changes.deleted)
+    stale_ids = [
+        event_id
+        for external_id, (event_id, _) in existing.items()
+        if (resource := _resource(external_id)) in deleted_resources
+        or (changes.keep_only is not None and resource not in changes.keep_only)
+        or (resource in changes.replaced and external_id not in incoming)
+    ]
+    result.deleted = _delete_events(session, stale_ids)
+
+    fresh = [
+        event
+        for event in changes.events
+        if event.etag is None or event.external_id not in existing or existing[event.external_id][1] != event.etag
+    ]
+    result.skipped += len(changes.events) - len(fresh)
+    masters = [event for event in fresh if event.master_external_id is None]
+    _upsert_events(session, [_event_values(source, event) for event in masters if event.exdates is not None])
+    _upsert_events(
+        session, [_event_values(source, event) for event in masters if event.exdates is None], keep_exdates=True
+    )
+    result.changed = len(masters)
+
+    overrides = [event for event in fresh if event.master_external_id is not None]
+    wanted = {event.master_external_id for event in overrides} | {master for master, _ in changes.cancelled}
+    master_ids: Dict[str, int] = {}
+    for batch in _batches(sorted(wanted), SYNC_BATCH_SIZE):
+        statement = select(Event.external_id, Event.id).where(
+            Event.calendar_id == source.id, Event.external_id.in_(batch)
+        )
+        master_ids.update(session.execute(statement).all())
+    override_rows = [
+        _event_values(source, event, master_ids[event.master_external_id])
+        for event in overrides
+        if event.master_external_id in master_ids
+    ]
+    _upsert_events(session, override_rows)
+    result.changed += len(override_rows)
+
+    cancelled_changed, cancelled_deleted = _apply_cancellations(session, master_ids, changes.cancelled)
+    result.changed += cancelled_changed
+    result.deleted += cancelled_deleted
+
+    stored = session.get(CalendarSource, source.id)
+    stored.sync_token = changes.sync_token
+    stored.ctag = changes.ctag
+    _record_run(stored, result)
+    session.add(stored)
+    session.commit()
+    return result
+
+
+def _record_run(source: CalendarSource, result: SyncResult) -> None:
+    source.last_synced_at = dt.datetime.utcnow()
+    source.last_fetched = result.fetched
+    source.last_changed = result.changed
+    source.last_skipped = result.skipped
+    source.last_deleted = result.deleted
+    source.last_error = result.error[:500] if result.error else None
+
+
+def _known_etags(session: Session, source_id: int) -> Dict[str, str]:
+    statement = select(Event.external_id, Event.etag).where(
+        Event.calendar_id == source_id, Event.original_start.is_(None)
+    )
+    return {external_id: etag for external_id, etag in session.execute(statement).all() if etag is not None}
+
+
+def _fetch(client: httpx.Client, source: CalendarSource, known_etags: Dict[str, str]) -> RemoteChanges:
+    if source.kind == CalendarKind.google:
+        return google_calendar.fetch_changes(client, source)
+    return caldav.fetch_changes(client, source, known_etags)
+
+
+def _timed_fetch(
+    client: httpx.Client, source: CalendarSource, known_etags: Dict[str, str]
+) -> Tuple[Optional[RemoteChanges], Optional[Exception], float]:
+    started = time.perf_counter()
+    try:
+        changes = _fetch(client, source, known_etags)
+    except Exception as error:  # noqa: BLE001
+        logger.exception("Calendar %s (%s) could not be fetched", source.id, source.name)
+        return None, error, time.perf_counter() - started
+    return changes, None, time.perf_counter() - started
+
+
+def _finish_run(
+    session_factory: Callable[[], ContextManager[Session]],
+    source: CalendarSource,
+    changes: Optional[RemoteChanges],
+    error: Optional[Exception],
+    elapsed: float,
+) -> SyncResult:
+    started = time.perf_counter()
+    with session_factory() as session:
+        result = None
+        if changes is not None:
+            try:
+                result = apply_remote_changes(session, source, changes)
+            except Exception as apply_error:  # noqa: BLE001
+                logger.exception("Calendar %s (%s) changes could not be applied", source.id, source.name)
+                session.rollback()
+                error = apply_error
+        if result is None:
+            result = SyncResult(calendar_id=source.id, name=source.name, error=str(error) or type(error).__name__)
+        result.duration_seconds = elapsed + time.perf_counter() - started
+        stored = session.get(CalendarSource, source.id)
+        if stored is not None:
+            if result.error:
+                stored.last_error = result.error[:500]
+            stored.last_duration_seconds = result.duration_seconds
+            session.add(stored)
+            session.commit()
+    return result
+
+
+def sync_calendars(
+    source_ids: Optional[Sequence[int]] = None,
+    session_factory: Callable[[], ContextManager[Session]] = session_scope,
+    client: Optional[httpx.Client] = None,
+) -> List[SyncResult]:
+    """Fetch every enabled calendar concurrently and apply each one's changes as it arrives.
+
+    Network round trips overlap across calendars on the pooled client; writes are
+    applied one calendar at a time on this thread, so SQLite sees a single writer.
+    """
+    with session_factory() as session:
+        statement = select(CalendarSource).where(CalendarSource.enabled == True)  # noqa: E712
+        if source_ids is not None:
+            statement = statement.where(CalendarSource.id.in_(source_ids))
+        targets = []
+        for source in session.exec(statement).all():
+            known = _known_etags(session, source.id) if source.kind == CalendarKind.caldav else {}
+            targets.append((source, known))
+        session.expunge_all()
+    if not targets:
+        return []
+
+    client = client or http_client()
+    results: List[SyncResult] = []
+    workers = min(len(targets), settings.calendar_sync_concurrency)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-sync") as pool:
+        futures = {pool.submit(_timed_fetch, client, source, known): source for source, known in targets}
+        for future in as_completed(futures):
+            source = futures[future]
+            result = _finish_run(session_factory, source, *future.result())
+            logger.info(
+                "Calendar %s (%s) synced: fetched=%d changed=%d skipped=%d deleted=%d in %.2fs%s",
+                source.id,
+                source.name,
+                result.fetched,
+                result.changed,
+                result.skipped,
+                result.deleted,
+                result.duration_seconds,
+                f" error={result.error}" if result.error else "",
+            )
+            results.append(result)
+    return sorted(results, key=lambda result: result.calendar_id)
+
+
+def list_calendar_sources(session: Session) -> List[CalendarSource]:
+    return list(session.exec(select(CalendarSource).order_by(CalendarSource.id.asc())).all())
+
+
+def create_calendar_source(session: Session, payload: CalendarSourceCreate) -> CalendarSource:
+    source = CalendarSource(**payload.model_dump())
+    session.add(source)
+    session.commit()
+    session.refresh(source)
+    return source
+
+
+def delete_calendar_source(session: Session, source_id: int) -> None:
+    """Remove a calendar and every event synced from it."""
+    source = session.get(CalendarSource, source_id)
+    if source is None:
+        raise ValueError("Calendar not found")
+    event_ids = session.exec(select(Event.id).where(Event.calendar_id == source_id)).all()
+    _delete_events(session, event_ids)
+    session.delete(source)
+    session.commit()
+
+
+def ensure_google_source(session: Session) -> Optional[CalendarSource]:
+    """Register the calendar configured by GOOGLE_CALENDAR_ID, once."""
+    if not (settings.google_calendar_json_base64 and settings.google_calendar_id):
+        return None
+    statement = select(CalendarSource).where(
+        CalendarSource.kind == CalendarKind.google, CalendarSource.url == settings.google_calendar_id
+    )
+    source = session.exec(statement).first()
+    if source is None:
+        source = CalendarSource(kind=CalendarKind.google, name="Google Calendar", url=settings.google_calendar_id)
+        session.add(source)
+        session.commit()
+        session.refresh(source)
+    return source
+
+
+calendar_syncer = PeriodicTask(
+    "calendar-sync", settings.calendar_sync_interval_seconds, sync_calendars, run_on_stop=False
+)
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+
+class CalendarSyncError(Exception):
+    pass
+
+
+@dataclass
+class RemoteEvent:
+    """One event as read from a remote calendar, before it is mapped onto an ``Event`` row."""
+
+    external_id: str
+    etag: Optional[str]
+    title: str
+    start: datetime
+    end: datetime
+    all_day: bool = False
+    notes: Optional[str] = None
+    rrule: Optional[str] = None
+    # None keeps the stored exdates (Google reports cancelled instances as separate items).
+    exdates: Optional[List[datetime]] = None
+    master_external_id: Optional[str] = None
+    original_start: Optional[datetime] = None
+
+
+@dataclass
+class RemoteChanges:
+    """Everything one incremental fetch learned about a remote calendar.
+
+    Rows are grouped by *resource*: the part of ``external_id`` before ``#``
+    (the Google event id or CalDAV href).
+    """
+
+    events: List[RemoteEvent] = field(default_factory=list)
+    # (master external id, original start) of occurrences cancelled remotely.
+    cancelled: List[Tuple[str, datetime]] = field(default_factory=list)
+    # Resources removed remotely.
+    deleted: List[str] = field(default_factory=list)
+    # Resources whose complete current contents are in ``events``; their other rows are stale.
+    replaced: Set[str] = field(default_factory=set)
+    # Set when the fetch listed the whole calendar: resources outside it are stale.
+    keep_only: Optional[Set[str]] = None
+    fetched: int = 0
+    skipped: int = 0
+    sync_token: Optional[str] = None
+    ctag: Optional[str] = None
+
+
+@dataclass
+class SyncResult:
+    calendar_id: int
+    name: str
+    fetched: int = 0
+    changed: int = 0
+    skipped: int = 0
+    deleted: int = 0
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
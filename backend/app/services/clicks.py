@@ -0,0 +1,92 @@
+import datetime as dt
+import threading
+from dataclasses import dataclass
+from typing import Dict
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import session_scope
+from app.services import links as link_service
+
+
+@dataclass
+class PendingClicks:
+    count: int
+    last_accessed_at: dt.datetime
+
+
+class ClickAggregator:
+    """Buffers link clicks in memory and writes them back in one batched UPDATE.
+
+    Clicks are acknowledged without touching the writer connection. A crash loses
+    at most the clicks buffered since the last flush.
+    """
+
+    def __init__(self, flush_threshold: int) -> None:
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[int, PendingClicks] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def record(self, link_id: int, at: dt.datetime | None = None) -> PendingClicks:
+        at = at or dt.datetime.utcnow()
+        with self._lock:
+            pending = self._pending.get(link_id)
+            if pending is None:
+                pending = self._pending[link_id] = PendingClicks(count=0, last_accessed_at=at)
+            pending.count += 1
+            pending.last_accessed_at = max(pending.last_accessed_at, at)
+            self._total += 1
+            return PendingClicks(count=pending.count, last_accessed_at=pending.last_accessed_at)
+
+    def pending(self, link_id: int) -> PendingClicks | None:
+        with self._lock:
+            pending = self._pending.get(link_id)
+            return None if pending is None else PendingClicks(pending.count, pending.last_accessed_at)
+
+    def should_flush(self) -> bool:
+        with self._lock:
+            return self._total >= self.flush_threshold
+
+    def discard(self, link_id: int) -> None:
+        with self._lock:
+            pending = self._pending.pop(link_id, None)
+            if pending is not None:
+                self._total -= pending.count
+
+    def flush(self, session: Session) -> int:
+        """Write buffered deltas through ``session`` and return the number of clicks flushed."""
+        with self._lock:
+            batch, self._pending, self._total = self._pending, {}, 0
+        if not batch:
+            return 0
+        try:
+            link_service.apply_click_deltas(
+                session, {link_id: (pending.count, pending.last_accessed_at) for link_id, pending in batch.items()}
+            )
+        except Exception:
+            self._restore(batch)
+            raise
+        return sum(pending.count for pending in batch.values())
+
+    def _restore(self, batch: Dict[int, PendingClicks]) -> None:
+        with self._lock:
+            for link_id, pending in batch.items():
+                current = self._pending.get(link_id)
+                if current is None:
+                    self._pending[link_id] = pending
+                else:
+                    current.count += pending.count
+                    current.last_accessed_at = max(current.last_accessed_at, pending.last_accessed_at)
+                self._total += pending.count
+
+
+def flush_clicks() -> int:
+    with session_scope() as session:
+        return click_aggregator.flush(session)
+
+
+click_aggregator = ClickAggregator(flush_threshold=settings.link_click_flush_threshold)
+click_flusher = PeriodicTask("link-click-flush", settings.link_click_flush_interval_seconds, flush_clicks)
@@ -1,14 +1,21 @@
-from typing import List
+from typing import Optional, Sequence
 
 from sqlmodel import Session, select
 
 from app.models.contact import Contact
 from app.schemas.contact import ContactCreate, ContactUpdate
+from app.services.pagination import Page, SortKey, paginate
 
+CONTACT_ORDER = (SortKey(Contact.category), SortKey(Contact.name), SortKey(Contact.id))
 
-def list_contacts(session: Session) -> List[Contact]:
-    statement = select(Contact).order_by(Contact.category.asc(), Contact.name.asc())
-    return list(session.exec(statement).all())
+
+def list_contacts(
+    session: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Page:
+    return paginate(session, select(Contact), CONTACT_ORDER, limit, cursor, fields)
 
 
 def create_contact(session: Session, payload: ContactCreate) -> Contact:
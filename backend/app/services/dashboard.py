@@ -0,0 +1,125 @@
+"""Home dashboard: the top of every section the portal home page shows, in one read.
+
+All sections are read through one session inside a single read transaction, so
+they come from the same snapshot and cost one round trip to the threadpool.
+They are read one after another: SQLite serializes the statements of one
+connection, and sections spread over pooled connections would each see a
+different snapshot. Each section is a bounded, indexed query. Results are
+cached for ``DASHBOARD_CACHE_TTL_SECONDS`` per (day, limits), so repeated page
+loads within that window do not touch the database at all. Any commit that
+changes a link, event, todo or asset totals (as seen by the audit hooks) drops
+the cache; writes that bypass the ORM without an audit entry (click counts,
+recurring todo catch-up) show up once the TTL expires. A load that started
+before an invalidation does not cache what it read.
+"""
+
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Set, Tuple
+
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.asset_monthly_rollup import AssetMonthlyRollup
+from app.models.link import Link
+from app.models.todo import Todo, TodoStatus
+from app.schemas.dashboard import DashboardRead
+from app.schemas.event import EventRead
+from app.schemas.link import LinkRead
+from app.schemas.todo import TodoRead
+from app.services import assets as asset_service
+from app.services import audit
+from app.services import events as event_service
+from app.services import freebusy
+from app.services.pagination import paginate
+from app.services.todos import TODO_ORDER
+
+# (day, links, events, todos, months)
+DashboardKey = Tuple[date, int, int, int, int]
+# Audit entity names whose changes show up on the dashboard.
+DASHBOARD_ENTITIES = {"link", "event", "todo", "asset_snapshot", "asset_monthly_rollup"}
+
+_dashboard_cache: TTLCache[DashboardKey, DashboardRead] = TTLCache(
+    ttl_seconds=settings.dashboard_cache_ttl_seconds, max_entries=64
+)
+# Bumped on every invalidation; a load only caches its result if none happened since it began.
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def get_cached_dashboard(key: DashboardKey) -> Optional[DashboardRead]:
+    return _dashboard_cache.get(key)
+
+
+def invalidate_dashboard() -> None:
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        _dashboard_cache.clear()
+
+
+def _cache_dashboard(key: DashboardKey, generation: int, dashboard: DashboardRead) -> None:
+    with _generation_lock:
+        if generation == _generation:
+            _dashboard_cache.set(key, dashboard)
+
+
+@audit.on_commit
+def _invalidate_on_change(entities: Set[str]) -> None:
+    if entities & DASHBOARD_ENTITIES:
+        invalidate_dashboard()
+
+
+def _begin_snapshot(session: Session) -> None:
+    # pysqlite only opens a transaction before writes, so every SELECT would otherwise
+    # see its own snapshot. A deferred BEGIN pins one snapshot at the first read.
+    connection = session.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    if not getattr(connection.connection.dbapi_connection, "in_transaction", True):
+        connection.exec_driver_sql("BEGIN")
+
+
+def _recent_months(session: Session, months: int) -> Optional[str]:
+    """The oldest of the ``months`` latest months with any snapshot, or None without data."""
+    statement = (
+        select(AssetMonthlyRollup.month)
+        .where(AssetMonthlyRollup.snapshot_count > 0)
+        .distinct()
+        .order_by(AssetMonthlyRollup.month.desc())
+        .limit(months)
+    )
+    recent = session.exec(statement).all()
+    return recent[-1] if recent else None
+
+
+def load_dashboard(session: Session, key: DashboardKey) -> DashboardRead:
+    """Read every dashboard section for ``key`` and cache the result."""
+    day, link_limit, event_limit, todo_limit, months = key
+    generation = _generation
+    _begin_snapshot(session)
+
+    links = session.exec(select(Link).order_by(Link.click_count.desc(), Link.title.asc()).limit(link_limit)).all()
+    start = datetime.combine(day, time.min)
+    end = start + timedelta(days=1) - timedelta(microseconds=1)
+    # The window is inclusive, so yesterday's all-day events (ending at midnight) are dropped here.
+    events = [
+        item
+        for item in event_service.list_events(session, start.isoformat(), end.isoformat()).items
+        if freebusy.event_interval(item)[1] > start
+    ][:event_limit]
+    todos = paginate(session, select(Todo).where(Todo.status == TodoStatus.open), TODO_ORDER, todo_limit).items
+    oldest_month = _recent_months(session, months)
+    assets = asset_service.summarize_assets(session, oldest_month, None).items if oldest_month else []
+
+    dashboard = DashboardRead(
+        day=day,
+        generated_at=datetime.utcnow(),
+        links=[LinkRead.model_validate(link, from_attributes=True) for link in links],
+        events=[EventRead.model_validate(item, from_attributes=True) for item in events],
+        todos=[TodoRead.model_validate(todo, from_attributes=True) for todo in todos],
+        assets=assets,
+    )
+    _cache_dashboard(key, generation, dashboard)
+    return dashboard
@@ -0,0 +1,9 @@
+from sqlmodel import Session
+
+from app.models.entity_version import EntityVersion
+
+
+def current_version(session: Session, entity: str) -> int:
+    """The change counter of ``entity`` (a table name); 0 before its first write."""
+    record = session.get(EntityVersion, entity)
+    return record.version if record is not None else 0
@@ -0,0 +1,81 @@
+"""iCalendar (RFC 5545) export of the event table for calendar subscriptions.
+
+Recurring events are exported once with their RRULE/EXDATE and overridden
+occurrences as RECURRENCE-ID components, so subscribers expand them
+themselves. Times are written as floating local time, as they are stored.
+"""
+
+import datetime as dt
+from typing import Any, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.services import entity_versions, events, ical
+
+FEED_PAGE_SIZE = 500
+PRODID = "-//HomePortal//Events//JA"
+UID_DOMAIN = "homeportal"
+
+
+def feed_etag(session: Session) -> str:
+    # Weak: the bytes differ between renders (DTSTAMP) while the events they describe do not.
+    return f'W/"event-{entity_versions.current_version(session, "event")}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def feed_header() -> str:
+    return "".join(
+        [
+            ical.content_line("BEGIN", "VCALENDAR"),
+            ical.content_line("VERSION", "2.0"),
+            ical.content_line("PRODID", PRODID),
+            ical.content_line("CALSCALE", "GREGORIAN"),
+            ical.content_line("X-WR-CALNAME", ical.escape_text(settings.app_name)),
+        ]
+    )
+
+
+def feed_footer() -> str:
+    return ical.content_line("END", "VCALENDAR")
+
+
+def render_page(session: Session, cursor: Optional[str], stamp: dt.datetime) -> Tuple[str, Optional[str]]:
+    """Render one keyset page of stored events, returning the VEVENT text and the next cursor."""
+    page = events.list_events(session, None, None, FEED_PAGE_SIZE, cursor)
+    return "".join(render_event(item, stamp) for item in page.items), page.next_cursor
+
+
+def render_event(event: Any, stamp: dt.datetime) -> str:
+    date_params = {"VALUE": "DATE"} if event.all_day else None
+    end = events.all_day_end(event.start, event.end) if event.all_day else event.end
+    lines: List[str] = [
+        ical.content_line("BEGIN", "VEVENT"),
+        ical.content_line("UID", f"event-{event.recurrence_id or event.id}@{UID_DOMAIN}"),
+        ical.content_line("DTSTAMP", stamp.strftime("%Y%m%dT%H%M%SZ")),
+        ical.content_line("DTSTART", ical.format_datetime(event.start, event.all_day), date_params),
+        ical.content_line("DTEND", ical.format_datetime(end, event.all_day), date_params),
+        ical.content_line("SUMMARY", ical.escape_text(event.title)),
+    ]
+    if event.notes:
+        lines.append(ical.content_line("DESCRIPTION", ical.escape_text(event.notes)))
+    if event.rrule:
+        lines.append(ical.content_line("RRULE", event.rrule))
+        if event.exdates:
+            values = ",".join(ical.format_datetime(dt.datetime.fromisoformat(value), event.all_day) for value in event.exdates)
+            lines.append(ical.content_line("EXDATE", values, date_params))
+    if event.recurrence_id is not None and event.original_start is not None:
+        lines.append(
+            ical.content_line("RECURRENCE-ID", ical.format_datetime(event.original_start, event.all_day), date_params)
+        )
+    lines.append(ical.content_line("END", "VEVENT"))
+    return "".join(lines)
@@ -1,10 +1,15 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, time, timedelta
+from typing import Any, List, Optional, Sequence, Union
 
+from sqlalchemy import delete, or_
 from sqlmodel import Session, select
 
 from app.models.event import Event
-from app.schemas.event import EventCreate, EventUpdate
+from app.schemas.event import EventCreate, EventOccurrenceUpdate, EventRead, EventUpdate
+from app.services import audit, recurrence
+from app.services.pagination import InvalidCursor, Page, SortKey, decode_cursor, encode_cursor, paginate
+
+EVENT_ORDER = (SortKey(Event.start), SortKey(Event.id))
 
 
 def _parse_datetime(value: str) -> datetime:
@@ -13,16 +18,145 @@ def _parse_datetime(value: str) -> datetime:
     return datetime.fromisoformat(value)
 
 
-def list_events(session: Session, start: Optional[str], end: Optional[str]) -> List[Event]:
+def _naive(value: datetime) -> datetime:
+    # Stored datetimes are naive; drop an explicit offset the same way the SQLite bind does.
+    return value.replace(tzinfo=None)
+
+
+def _exdate(value: Union[datetime, str]) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return _naive(value).isoformat()
+
+
+def all_day_end(start: datetime, end: datetime) -> datetime:
+    """Exclusive end of an all-day event: an end already at midnight after the start is kept, otherwise rounded up."""
+    if end.time() == time.min and end.date() > start.date():
+        return end
+    return datetime.combine(max(end.date(), start.date()) + timedelta(days=1), time.min)
+
+
+def _assignee_filter(assignee_ids: Sequence[int], include_unassigned: bool) -> Any:
+    condition = Event.assignee_id.in_(list(assignee_ids))
+    return or_(condition, Event.assignee_id.is_(None)) if include_unassigned else condition
+
+
+def list_events(
+    session: Session,
+    start: Optional[str],
+    end: Optional[str],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    *,
+    assignee_ids: Optional[Sequence[int]] = None,
+    include_unassigned: bool = False,
+) -> Page:
+    """List events, expanding recurring events into occurrences when both bounds are given.
+
+    Without a closed window the stored rows are returned as-is, with recurring
+    events represented once by their first occurrence and ``rrule``.
+    ``assignee_ids`` restricts the result to those assignees, plus events with
+    no assignee when ``include_unassigned`` is set.
+    """
+    start_dt = _naive(_parse_datetime(start)) if start else None
+    end_dt = _naive(_parse_datetime(end)) if end else None
+    assignees = _assignee_filter(assignee_ids, include_unassigned) if assignee_ids is not None else None
+    if start_dt is not None and end_dt is not None:
+        return _list_window(session, start_dt, end_dt, limit, cursor, fields, assignees)
+
     statement = select(Event)
-    if start:
-        start_dt = _parse_datetime(start)
-        statement = statement.where(Event.end >= start_dt)
-    if end:
-        end_dt = _parse_datetime(end)
+    if assignees is not None:
+        statement = statement.where(assignees)
+    if start_dt is not None:
+        statement = statement.where(or_(Event.end >= start_dt, Event.recurrence_end >= start_dt))
+    if end_dt is not None:
         statement = statement.where(Event.start <= end_dt)
-    statement = statement.order_by(Event.start.asc())
-    return list(session.exec(statement).all())
+    return paginate(session, statement, EVENT_ORDER, limit, cursor, fields)
+
+
+def _list_window(
+    session: Session,
+    start: datetime,
+    end: datetime,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]],
+    assignees: Any = None,
+) -> Page:
+    """Stored single events plus the expanded occurrences overlapping [start, end]."""
+    singles = select(Event).where(Event.rrule.is_(None), Event.end >= start, Event.start <= end)
+    if assignees is not None:
+        singles = singles.where(assignees)
+    page = paginate(session, singles, EVENT_ORDER, limit, cursor)
+
+    occurrences = _occurrences(session, start, end, assignees)
+    if cursor:
+        after_start, after_id = decode_cursor(cursor, len(EVENT_ORDER))
+        if not isinstance(after_start, datetime) or not isinstance(after_id, int):
+            raise InvalidCursor("Invalid cursor")
+        occurrences = [item for item in occurrences if (item.start, item.id) > (after_start, after_id)]
+
+    items: List[Any] = sorted([*page.items, *occurrences], key=lambda item: (item.start, item.id))
+    next_cursor = None
+    if limit is not None and (len(items) > limit or page.next_cursor):
+        items = items[:limit]
+        next_cursor = encode_cursor([items[-1].start, items[-1].id])
+    if fields is not None:
+        items = [{name: getattr(item, name) for name in fields} for item in items]
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def _occurrences(session: Session, start: datetime, end: datetime, assignees: Any = None) -> List[EventRead]:
+    # Only recurring rows carry recurrence_end, so this reads the series still running at ``start``
+    # through ix_event_recurrence_end, however many occurrences they have. Filtering on start in
+    # Python keeps SQLite from preferring ix_event_start_end, which would walk every past event.
+    statement = select(Event).where(Event.recurrence_end >= start)
+    if assignees is not None:
+        statement = statement.where(assignees)
+    masters = [master for master in session.exec(statement).all() if master.start <= end]
+    if not masters:
+        return []
+    overridden = set(
+        session.execute(
+            select(Event.recurrence_id, Event.original_start).where(
+                Event.recurrence_id.in_([master.id for master in masters])
+            )
+        ).all()
+    )
+
+    items = []
+    for master in masters:
+        duration = master.end - master.start
+        cancelled = {datetime.fromisoformat(value) for value in master.exdates}
+        data = master.model_dump()
+        for occurrence_start in recurrence.occurrence_starts(
+            master.id, master.rrule, master.start, start - duration, end
+        ):
+            if occurrence_start in cancelled or (master.id, occurrence_start) in overridden:
+                continue
+            data.update(start=occurrence_start, end=occurrence_start + duration, original_start=occurrence_start)
+            items.append(EventRead.model_validate(data))
+    return items
+
+
+def _apply_recurrence(event: Event) -> None:
+    event.rrule = recurrence.normalize_rrule(event.rrule, event.start)
+    if event.rrule is None:
+        event.exdates = []
+        event.recurrence_end = None
+        return
+    if event.recurrence_id is not None:
+        raise recurrence.InvalidRecurrence("An occurrence override cannot recur")
+    event.exdates = sorted({_exdate(value) for value in event.exdates})
+    event.recurrence_end = recurrence.recurrence_end(event.rrule, event.start, event.end)
+
+
+def _delete_overrides(session: Session, event_id: int) -> None:
+    # One Core DELETE for every override of the series; RETURNING gives the audit log what the ORM would.
+    statement = delete(Event).where(Event.recurrence_id == event_id).returning(*Event.__table__.columns)
+    for row in session.execute(statement).mappings().all():
+        audit.stage(session, "delete", Event.__tablename__, row["id"], audit.row_diff(row))
 
 
 def create_event(session: Session, payload: EventCreate, creator_fallback: Optional[str]) -> Event:
@@ -30,6 +164,7 @@ def create_event(session: Session, payload: EventCreate, creator_fallback: Optio
     if not data.get("created_by") and creator_fallback:
         data["created_by"] = creator_fallback
     event = Event(**data)
+    _apply_recurrence(event)
     session.add(event)
     session.commit()
     session.refresh(event)
@@ -40,18 +175,90 @@ def update_event(session: Session, event_id: int, payload: EventUpdate) -> Event
     event = session.get(Event, event_id)
     if event is None:
         raise ValueError("Event not found")
+    was_recurring = event.rrule is not None
     update_data = payload.model_dump(exclude_unset=True)
+    # Validate before touching the row so a rejected rule leaves the session clean.
+    if "rrule" in update_data:
+        update_data["rrule"] = recurrence.normalize_rrule(update_data["rrule"])
+        if update_data["rrule"] and event.recurrence_id is not None:
+            raise recurrence.InvalidRecurrence("An occurrence override cannot recur")
     for field, value in update_data.items():
-        setattr(event, field, value)
+        setattr(event, field, value if field != "exdates" else value or [])
+    _apply_recurrence(event)
+    if was_recurring and event.rrule is None:
+        _delete_overrides(session, event_id)
     session.add(event)
     session.commit()
     session.refresh(event)
+    recurrence.invalidate_occurrences(event_id)
     return event
 
 
 def delete_event(session: Session, event_id: int) -> None:
+    """Delete an event; deleting an occurrence override cancels that occurrence."""
     event = session.get(Event, event_id)
     if event is None:
         raise ValueError("Event not found")
+    if event.rrule is not None:
+        _delete_overrides(session, event_id)
+    elif event.recurrence_id is not None:
+        master = session.get(Event, event.recurrence_id)
+        if master is not None:
+            master.exdates = sorted({*master.exdates, _exdate(event.original_start)})
+            session.add(master)
     session.delete(event)
     session.commit()
+    recurrence.invalidate_occurrences(event_id)
+
+
+def _get_occurrence_master(session: Session, event_id: int, original_start: datetime) -> Event:
+    master = session.get(Event, event_id)
+    if master is None or master.rrule is None:
+        raise ValueError("Recurring event not found")
+    if not recurrence.is_occurrence(master.rrule, master.start, original_start):
+        raise ValueError("Occurrence not found")
+    return master
+
+
+def _get_override(session: Session, event_id: int, original_start: datetime) -> Optional[Event]:
+    statement = select(Event).where(Event.recurrence_id == event_id, Event.original_start == original_start)
+    return session.exec(statement).first()
+
+
+def update_occurrence(
+    session: Session, event_id: int, original_start: datetime, payload: EventOccurrenceUpdate
+) -> Event:
+    """Change a single occurrence by creating (or editing) its override row."""
+    original_start = _naive(original_start)
+    master = _get_occurrence_master(session, event_id, original_start)
+    override = _get_override(session, event_id, original_start)
+    if override is None:
+        data = master.model_dump(exclude={"id", "rrule", "exdates", "recurrence_end"})
+        duration: timedelta = master.end - master.start
+        data.update(
+            start=original_start,
+            end=original_start + duration,
+            recurrence_id=master.id,
+            original_start=original_start,
+        )
+        override = Event(**data)
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(override, field, value)
+    # Editing a previously cancelled occurrence brings it back.
+    master.exdates = [value for value in master.exdates if value != _exdate(original_start)]
+    session.add(master)
+    session.add(override)
+    session.commit()
+    session.refresh(override)
+    return override
+
+
+def cancel_occurrence(session: Session, event_id: int, original_start: datetime) -> None:
+    original_start = _naive(original_start)
+    master = _get_occurrence_master(session, event_id, original_start)
+    override = _get_override(session, event_id, original_start)
+    if override is not None:
+        session.delete(override)
+    master.exdates = sorted({*master.exdates, _exdate(original_start)})
+    session.add(master)
+    session.commit()
@@ -0,0 +1,276 @@
+"""Incremental indexer for files placed in ``UPLOADS_DIRECTORY`` out of band.
+
+Each run walks the tree (skipping ``.blobs``, ``.tmp`` and every other
+dot-name), compares each file's ``(size, mtime_ns, inode)`` with the stat
+stored on its ``file`` row and, on a process pool, hashes only the files that
+differ. Content that is not in the blob store yet is copied there (downloads
+are served from it). Rows are then reconciled in batches: new and changed
+files are upserted, rows whose file is gone are deleted. An unchanged tree
+costs one directory walk and one read of the ``file`` table. The ``file``
+table is read on a read-only connection and nothing is held while hashing; the
+writer is taken only to apply the batches.
+
+Usage: python -m app.services.file_indexer [--root DIR] [--workers N] [--collect-blobs]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import read_session_scope, session_scope
+from app.models.file import File
+from app.models.tag import FileTag
+from app.services import files as file_service
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Files to hash per worker process; fewer are hashed in this process.
+PARALLEL_THRESHOLD = 256
+
+
+class FileStat(NamedTuple):
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+@dataclass
+class IndexReport:
+    scanned: int = 0
+    hashed: int = 0
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    blobs_removed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.scanned / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def scan_tree(root: Path) -> Dict[str, FileStat]:
+    """Stat of every regular file under ``root`` by its store path."""
+    found: Dict[str, FileStat] = {}
+    pending: List[Tuple[str, str]] = [(str(root), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or "\\" in name:
+                    continue
+                path = prefix + name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, path + "/"))
+                elif entry.is_file(follow_symlinks=False) and len(path) <= file_service.MAX_PATH_LENGTH:
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    found[path] = FileStat(stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    return found
+
+
+def ingest_file(location: str, root: str) -> Optional[Tuple[str, str]]:
+    """Make sure the file's content is stored; returns its SHA-256 and pin, or None if it disappeared.
+
+    Runs in the worker processes. The file is hashed first and copied into the
+    store only when no blob has that content yet. The copy is hashed again as
+    it is written, so its blob matches its checksum even if the file changed
+    after the first read. The pin keeps the blob until the file's row is committed.
+    """
+    try:
+        checksum = file_service.file_checksum(Path(location))
+    except FileNotFoundError:
+        return None
+    pin = file_service.pin_blob(checksum, Path(root))
+    if pin is not None:
+        return checksum, str(pin)
+    try:
+        source = open(location, "rb")
+    except FileNotFoundError:
+        return None
+    writer = file_service.BlobWriter(Path(root), sys.maxsize)
+    try:
+        with source:
+            while chunk := source.read(file_service.WRITE_CHUNK_BYTES):
+                writer.write(chunk)
+        checksum, _ = writer.commit()
+    except BaseException:
+        writer.discard()
+        raise
+    return checksum, str(writer.pin)
+
+
+def _ingest_all(root: Path, paths: Sequence[str], workers: int) -> List[Optional[Tuple[str, str]]]:
+    locations = [str(root / path) for path in paths]
+    roots = [str(root)] * len(locations)
+    # A spawned worker costs about as much as hashing a few hundred small files; more workers than CPUs buy nothing.
+    workers = min(workers, os.cpu_count() or 1, len(locations) // PARALLEL_THRESHOLD)
+    if workers <= 1:
+        return [ingest_file(location, str(root)) for location in locations]
+    # spawn: the server process runs threads, which makes fork unsafe (see PasswordHasher).
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        chunksize = max(1, min(256, len(locations) // (workers * 4)))
+        return list(executor.map(ingest_file, locations, roots, chunksize=chunksize))
+
+
+def _upsert(session: Session, rows: List[dict]) -> None:
+    table = File.__table__
+    for offset in range(0, len(rows), BATCH_SIZE):
+        statement = sqlite_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["path"],
+            set_={name: statement.excluded[name] for name in ("checksum", "size", "mtime_ns", "inode", "content_type", "updated_at")},
+        )
+        session.execute(statement, rows[offset : offset + BATCH_SIZE])
+
+
+def _delete(session: Session, ids: List[int]) -> None:
+    for offset in range(0, len(ids), BATCH_SIZE):
+        batch = ids[offset : offset + BATCH_SIZE]
+        session.execute(delete(FileTag).where(FileTag.file_id.in_(batch)))
+        session.execute(delete(File).where(File.id.in_(batch)))
+
+
+def index_files(
+    root: Optional[Path] = None,
+    workers: Optional[int] = None,
+    collect_blobs: bool = False,
+    session_factory: Callable[[], ContextManager[Session]] = session_scope,
+    read_session_factory: Callable[[], ContextManager[Session]] = read_session_scope,
+) -> IndexReport:
+    """Bring the ``file`` table in line with the tree under ``root``."""
+    root = root or file_service.uploads_root()
+    workers = workers or settings.file_index_workers
+    started = time.perf_counter()
+    report = IndexReport()
+
+    on_disk = scan_tree(root)
+    report.scanned = len(on_disk)
+    columns = (File.id, File.path, File.checksum, File.size, File.mtime_ns, File.inode, File.protected)
+    # Core rows: ORM result processing is a large share of an unchanged rescan at 100k files.
+    with read_session_factory() as session:
+        known = {row.path: row for row in session.connection().execute(select(*columns))}
+
+    changed = [
+        path
+        for path, stat in on_disk.items()
+        if (row := known.get(path)) is None or (row.size, row.mtime_ns, row.inode) != stat
+    ]
+    ingested = _ingest_all(root, changed, workers)
+    report.hashed = len(changed)
+
+    now = datetime.utcnow()
+    rows: List[dict] = []
+    released: List[str] = []
+    pins: List[Tuple[str, str]] = []
+    for path, result in zip(changed, ingested):
+        if result is None:
+            on_disk.pop(path)
+            continue
+        checksum, pin = result
+        pins.append((pin, checksum))
+        stat, row = on_disk[path], known.get(path)
+        if row is None:
+            report.created += 1
+        else:
+            report.updated += 1
+            if row.checksum != checksum:
+                released.append(row.checksum)
+        rows.append(
+            {
+                "path": path,
+                "checksum": checksum,
+                "size": stat.size,
+                "mtime_ns": stat.mtime_ns,
+                "inode": stat.inode,
+                "content_type": file_service.guess_content_type(path),
+                "tags": [],
+                "protected": False,
+                "updated_at": now,
+            }
+        )
+
+    # Protected rows are kept even when their file is gone, like the API refuses to delete them.
+    # Uploaded files have no stat: they never were in the tree.
+    gone = [
+        row
+        for path, row in known.items()
+        if path not in on_disk and not row.protected and row.inode is not None
+    ]
+    report.deleted = len(gone)
+    if rows or gone:
+        with session_factory() as session:
+            _upsert(session, rows)
+            _delete(session, [row.id for row in gone])
+            session.commit()
+
+    for pin, checksum in pins:
+        file_service.unpin_blob(Path(pin), checksum, root)
+    released_checksums = {*released, *(row.checksum for row in gone)}
+    if released_checksums or collect_blobs:
+        with read_session_factory() as session:
+            for checksum in released_checksums:
+                file_service.release_blob(session, checksum, root)
+            if collect_blobs:
+                report.blobs_removed = file_service.collect_orphan_blobs(session, root)
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def run_index(collect_blobs: bool = False) -> IndexReport:
+    report = index_files(collect_blobs=collect_blobs)
+    if report.hashed or report.deleted:
+        logger.info(
+            "Indexed %d files in %.2fs (%.0f files/s): %d hashed, %d new, %d changed, %d removed",
+            report.scanned,
+            report.elapsed_seconds,
+            report.files_per_second,
+            report.hashed,
+            report.created,
+            report.updated,
+            report.deleted,
+        )
+    return report
+
+
+file_indexer = PeriodicTask("file-indexer", settings.file_index_interval_seconds, run_index, run_on_stop=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index files placed in UPLOADS_DIRECTORY out of band.")
+    parser.add_argument("--root", type=Path, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--collect-blobs", action="store_true", help="also remove blobs no file links to")
+    args = parser.parse_args()
+    report = index_files(args.root, args.workers, args.collect_blobs)
+    print(
+        f"{report.scanned} files in {report.elapsed_seconds:.2f}s ({report.files_per_second:.0f} files/s): "
+        f"{report.hashed} hashed, {report.created} new, {report.updated} changed, {report.deleted} removed, "
+        f"{report.blobs_removed} orphan blobs removed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Content-addressed file store under ``UPLOADS_DIRECTORY``.
+
+Uploads are streamed into ``.tmp/`` while being hashed, then moved to
+``.blobs/<aa>/<sha256>``; content that is already stored is discarded, so each
+distinct content is kept once on any filesystem. An uploaded file's path exists
+only as its ``file`` row; nothing is written into the tree. Blobs are
+read-only and downloads are served from them, so the bytes sent always match
+the checksum. Files placed in the tree out of band are picked up by the
+indexer, which adds a blob only for content not stored yet. Until its row is
+committed, an upload keeps a link to its blob in ``.tmp/`` (its pin); a blob
+is removed once no ``file`` row refers to it and no upload pins it. Names
+starting with "." are reserved for the store and rejected as paths.
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, Optional, Sequence, Tuple
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.file import File
+from app.services import tags as tag_service
+from app.services.pagination import Page, SortKey, paginate
+
+BLOB_DIRECTORY = ".blobs"
+TEMP_DIRECTORY = ".tmp"
+# Uploads are hashed and written in blocks of this size; memory use does not depend on the file size.
+WRITE_CHUNK_BYTES = 1024 * 1024
+MAX_PATH_LENGTH = 500
+BLOB_GRACE_SECONDS = 3600
+BLOB_MODE = 0o444
+
+FILE_ORDER = (SortKey(File.path), SortKey(File.id))
+
+# Serializes blob creation and removal within the process.
+_blob_lock = threading.Lock()
+
+
+class InvalidFilePath(ValueError):
+    pass
+
+
+class ProtectedFile(ValueError):
+    pass
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def uploads_root() -> Path:
+    return settings.uploads_directory
+
+
+def normalize_path(value: str) -> str:
+    """A safe relative "/"-separated path; raises ``InvalidFilePath`` for anything that could escape the tree."""
+    parts = PurePosixPath(value.replace("\\", "/")).parts
+    if not parts or value.startswith("/") or any(part in ("", ".", "..") or part.startswith(".") for part in parts):
+        raise InvalidFilePath(f"Invalid file path: {value!r}")
+    path = "/".join(parts)
+    if len(path) > MAX_PATH_LENGTH:
+        raise InvalidFilePath("File path is too long")
+    return path
+
+
+def blob_path(checksum: str, root: Optional[Path] = None) -> Path:
+    return (root or uploads_root()) / BLOB_DIRECTORY / checksum[:2] / checksum
+
+
+def guess_content_type(path: str, declared: Optional[str] = None) -> Optional[str]:
+    """The declared type, unless it is missing or generic and the file name says more."""
+    if declared and declared.split(";")[0].strip() != "application/octet-stream":
+        return declared
+    return mimetypes.guess_type(path)[0] or declared
+
+
+class BlobWriter:
+    """Writes one upload to a temporary file in the store while hashing it."""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+        self.root = root or uploads_root()
+        self.max_bytes = max_bytes or settings.upload_max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        temp_directory = self.root / TEMP_DIRECTORY
+        temp_directory.mkdir(parents=True, exist_ok=True)
+        self._temp_path = temp_directory / uuid.uuid4().hex
+        self._file: BinaryIO = self._temp_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> Tuple[str, int]:
+        """Publish the upload as its blob, keeping ``pin`` linked to it until ``unpin`` or ``discard``."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.chmod(self._temp_path, BLOB_MODE)
+        self.checksum = self._hash.hexdigest()
+        blob = blob_path(self.checksum, self.root)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        with _blob_lock:
+            while True:
+                try:
+                    os.link(self._temp_path, blob)
+                    break
+                except FileExistsError:
+                    pass
+                # That content is already stored: pin the existing blob instead.
+                pin = self._temp_path.with_name(self._temp_path.name + ".pin")
+                try:
+                    os.link(blob, pin)
+                except FileNotFoundError:
+                    continue  # removed by another process in between
+                self._temp_path.unlink()
+                self._temp_path = pin
+                break
+        return self.checksum, self.size
+
+    @property
+    def pin(self) -> Path:
+        """The upload's own link to its content, which keeps ``release_blob`` from removing it."""
+        return self._temp_path
+
+    def unpin(self) -> None:
+        """Drop the pin; call once the upload's row is committed."""
+        unpin_blob(self._temp_path, self.checksum, self.root)
+
+    def discard(self) -> None:
+        self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 of a file, read in ``WRITE_CHUNK_BYTES`` blocks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(WRITE_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pin_blob(checksum: str, root: Optional[Path] = None) -> Optional[Path]:
+    """Pin blob ``checksum`` like an upload would, or return None when that content is not stored."""
+    root = root or uploads_root()
+    pin = root / TEMP_DIRECTORY / f"{uuid.uuid4().hex}.pin"
+    pin.parent.mkdir(parents=True, exist_ok=True)
+    with _blob_lock:
+        try:
+            os.link(blob_path(checksum, root), pin)
+        except FileNotFoundError:
+            return None
+    return pin
+
+
+def unpin_blob(pin: Path, checksum: str, root: Optional[Path] = None) -> None:
+    """Drop an upload's pin, restoring the blob first if another process removed it meanwhile."""
+    with _blob_lock:
+        try:
+            os.link(pin, blob_path(checksum, root))
+        except FileExistsError:
+            pass
+        pin.unlink()
+
+
+def release_blob(session: Session, checksum: str, root: Optional[Path] = None) -> None:
+    """Remove the blob once no row refers to its content; call after the change is committed.
+
+    A blob an upload still pins (see ``BlobWriter.pin``) is kept: its row is not committed yet.
+    """
+    if session.exec(select(File.id).where(File.checksum == checksum).limit(1)).first() is not None:
+        return
+    blob = blob_path(checksum, root)
+    with _blob_lock:
+        try:
+            if blob.stat().st_nlink == 1:
+                blob.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def collect_orphan_blobs(
+    session: Session, root: Optional[Path] = None, grace_seconds: float = BLOB_GRACE_SECONDS
+) -> int:
+    """Remove blobs no row refers to and no upload pins; returns how many were removed.
+
+    Entries in ``.tmp`` older than ``grace_seconds`` are left over from
+    interrupted uploads and are removed first, releasing their pins.
+    """
+    root = root or uploads_root()
+    cutoff = time.time() - grace_seconds
+    temp_directory = root / TEMP_DIRECTORY
+    if temp_directory.is_dir():
+        for entry in temp_directory.iterdir():
+            try:
+                if entry.stat().st_ctime < cutoff:
+                    entry.unlink()
+            except FileNotFoundError:
+                pass
+    directory = root / BLOB_DIRECTORY
+    if not directory.is_dir():
+        return 0
+    referenced = set(session.exec(select(File.checksum).distinct()).all())
+    removed = 0
+    for blob in directory.glob("*/*"):
+        if blob.name in referenced:
+            continue
+        with _blob_lock:
+            try:
+                if blob.stat().st_nlink == 1:
+                    blob.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def list_files(
+    session: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Page:
+    return paginate(session, select(File), FILE_ORDER, limit, cursor, fields)
+
+
+def get_file(session: Session, path: str) -> File:
+    record = session.exec(select(File).where(File.path == path)).first()
+    if record is None:
+        raise ValueError("File not found")
+    return record
+
+
+def ensure_writable(session: Session, path: str) -> None:
+    record = session.exec(select(File.protected).where(File.path == path)).first()
+    if record:
+        raise ProtectedFile("File is protected")
+
+
+def store_file(
+    session: Session,
+    path: str,
+    checksum: str,
+    size: int,
+    content_type: Optional[str],
+    tags: Optional[Iterable[str]] = None,
+    root: Optional[Path] = None,
+) -> Tuple[File, bool]:
+    """Point ``path`` at blob ``checksum``; returns (file, created).
+
+    A file placed at ``path`` out of band is superseded and removed, so the
+    indexer does not take it for newer content.
+    """
+    root = root or uploads_root()
+    record = session.exec(select(File).where(File.path == path)).first()
+    if record is not None and record.protected:
+        raise ProtectedFile("File is protected")
+
+    created = record is None
+    previous = None if created else record.checksum
+    if created:
+        record = File(path=path, checksum=checksum)
+    record.checksum, record.size, record.updated_at = checksum, size, datetime.utcnow()
+    record.content_type = content_type
+    # No tree file to compare against: the blob is the only copy.
+    record.mtime_ns = record.inode = None
+    if tags is not None:
+        record.tags = sorted({tag.strip() for tag in tags if tag and tag.strip()})
+    session.add(record)
+    session.flush()
+    tag_service.sync_file_tags(session, record.id, record.tags)
+    session.commit()
+    session.refresh(record)
+    (root / path).unlink(missing_ok=True)
+    if previous is not None and previous != checksum:
+        release_blob(session, previous, root)
+    return record, created
+
+
+def delete_file(session: Session, path: str, root: Optional[Path] = None) -> None:
+    root = root or uploads_root()
+    record = get_file(session, path)
+    if record.protected:
+        raise ProtectedFile("File is protected")
+    checksum = record.checksum
+    tag_service.delete_file_tags(session, record.id)
+    session.delete(record)
+    session.commit()
+    (root / path).unlink(missing_ok=True)
+    release_blob(session, checksum, root)
@@ -0,0 +1,163 @@
+"""Free/busy windows and conflict detection over the event calendar.
+
+Events in the window are read once through ``list_events`` (sorted by start,
+recurring events expanded) and combined with sweep-line passes, so the cost
+is O(n log n) in the number of events instead of comparing every pair.
+Events without an assignee are household-wide and count as busy for everyone.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlmodel import Session
+
+from app.models.event import Event
+from app.services import events
+
+Interval = Tuple[datetime, datetime]
+
+# How far ahead the occurrences of a new recurring event are checked for conflicts.
+CONFLICT_HORIZON = timedelta(days=365)
+
+
+@dataclass
+class FreeBusy:
+    start: datetime
+    end: datetime
+    busy: List[Interval] = field(default_factory=list)
+    free: List[Interval] = field(default_factory=list)
+    assignees: Dict[int, List[Interval]] = field(default_factory=dict)
+
+
+def event_interval(item: Any) -> Interval:
+    if item.all_day:
+        return item.start, events.all_day_end(item.start, item.end)
+    return item.start, item.end
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Union of intervals given in start order; overlapping and touching intervals are joined."""
+    merged: List[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_intervals(busy: Sequence[Interval], start: datetime, end: datetime, min_duration: timedelta) -> List[Interval]:
+    """Gaps of at least ``min_duration`` between merged ``busy`` intervals within [start, end]."""
+    free: List[Interval] = []
+    cursor = start
+    for busy_start, busy_end in [*busy, (end, end)]:
+        if busy_start > cursor and busy_start - cursor >= min_duration:
+            free.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    return free
+
+
+def _clipped(items: Iterable[Any], start: datetime, end: datetime) -> List[Tuple[Interval, Optional[int]]]:
+    clipped = []
+    for item in items:
+        item_start, item_end = event_interval(item)
+        item_start, item_end = max(item_start, start), min(item_end, end)
+        # Zero-length events (reminders) never block time.
+        if item_start < item_end:
+            clipped.append(((item_start, item_end), item.assignee_id))
+    clipped.sort(key=lambda entry: entry[0])
+    return clipped
+
+
+def free_busy(
+    session: Session,
+    start: datetime,
+    end: datetime,
+    assignee_ids: Optional[Sequence[int]] = None,
+    min_duration: timedelta = timedelta(0),
+) -> FreeBusy:
+    """Merged busy time per assignee and overall, and the free gaps left for all of them."""
+    start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    items = events.list_events(
+        session, start.isoformat(), end.isoformat(), assignee_ids=assignee_ids, include_unassigned=True
+    ).items
+    clipped = _clipped(items, start, end)
+
+    shared = [interval for interval, assignee_id in clipped if assignee_id is None]
+    own: Dict[int, List[Interval]] = {assignee_id: [] for assignee_id in assignee_ids or []}
+    for interval, assignee_id in clipped:
+        if assignee_id is not None:
+            own.setdefault(assignee_id, []).append(interval)
+
+    busy = merge_intervals(interval for interval, _ in clipped)
+    return FreeBusy(
+        start=start,
+        end=end,
+        busy=busy,
+        free=free_intervals(busy, start, end, min_duration),
+        assignees={
+            assignee_id: merge_intervals(heapq.merge(intervals, shared))
+            for assignee_id, intervals in sorted(own.items())
+        },
+    )
+
+
+def find_conflicts(session: Session, event: Event, horizon: timedelta = CONFLICT_HORIZON) -> List[Any]:
+    """Events overlapping ``event``, or any of its occurrences within ``horizon`` when it recurs.
+
+    Only events of the same assignee and household-wide events are considered;
+    an event without an assignee is checked against everything. Other
+    occurrences of the same series never count as conflicts.
+    """
+    window_end = event_interval(event)[1]
+    if event.rrule is not None and event.recurrence_end is not None:
+        window_end = min(event.recurrence_end, event.start + horizon)
+    assignee_ids = [event.assignee_id] if event.assignee_id is not None else None
+    items = events.list_events(
+        session, event.start.isoformat(), window_end.isoformat(), assignee_ids=assignee_ids, include_unassigned=True
+    ).items
+
+    series_id = event.recurrence_id or event.id
+    mine: List[Interval] = []
+    others: List[Tuple[Interval, Any]] = []
+    for item in items:
+        if item.id == event.id or (event.rrule is not None and item.recurrence_id == event.id):
+            mine.append(event_interval(item))
+        elif item.id != series_id and item.recurrence_id != series_id:
+            others.append((event_interval(item), item))
+    return overlapping(mine, others)
+
+
+def overlapping(mine: Sequence[Interval], others: Sequence[Tuple[Interval, Any]]) -> List[Any]:
+    """The payloads of ``others`` whose interval overlaps any interval in ``mine``.
+
+    One sweep over both lists in start order keeps a min-heap (by end) of the
+    intervals still open on each side; an arriving interval conflicts with
+    whatever is open on the other side. Touching intervals do not overlap.
+    Each interval is pushed and popped at most once, so this is O(n log n).
+    """
+    timeline = sorted(
+        [(interval, 0, index) for index, interval in enumerate(mine) if interval[0] < interval[1]]
+        + [(interval, 1, index) for index, (interval, _) in enumerate(others) if interval[0] < interval[1]]
+    )
+    open_mine: List[datetime] = []
+    open_others: List[Tuple[datetime, int]] = []
+    hits = set()
+    for (start, end), side, index in timeline:
+        while open_mine and open_mine[0] <= start:
+            heapq.heappop(open_mine)
+        while open_others and open_others[0][0] <= start:
+            heapq.heappop(open_others)
+        if side == 0:
+            # Everything open is now a hit and needs no further checks.
+            hits.update(other for _, other in open_others)
+            open_others.clear()
+            heapq.heappush(open_mine, end)
+        elif open_mine:
+            hits.add(index)
+        else:
+            heapq.heappush(open_others, (end, index))
+    return [others[index][1] for index in sorted(hits)]
@@ -0,0 +1,161 @@
+"""Incremental Google Calendar fetching with a service account and events.list sync tokens."""
+
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+from jose import jwt
+
+from app.core.config import settings
+from app.models.calendar_source import CalendarSource
+from app.services import ical
+from app.services.calendar_types import CalendarSyncError, RemoteChanges, RemoteEvent
+
+SCOPE = "https://www.googleapis.com/auth/calendar.readonly"
+DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
+PAGE_SIZE = 2500
+
+
+class ServiceAccountAuth:
+    """OAuth2 access tokens for a service account, cached until shortly before they expire."""
+
+    def __init__(self, credentials: Dict[str, Any]) -> None:
+        self.credentials = credentials
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_base64(cls, encoded: str) -> "ServiceAccountAuth":
+        return cls(json.loads(base64.b64decode(encoded)))
+
+    def headers(self, client: httpx.Client) -> Dict[str, str]:
+        with self._lock:
+            if self._token is None or time.time() >= self._expires_at:
+                self._token, lifetime = self._request_token(client)
+                self._expires_at = time.time() + lifetime - 60
+            return {"Authorization": f"Bearer {self._token}"}
+
+    def _request_token(self, client: httpx.Client) -> Tuple[str, float]:
+        token_uri = self.credentials.get("token_uri", DEFAULT_TOKEN_URI)
+        issued_at = int(time.time())
+        assertion = jwt.encode(
+            {
+                "iss": self.credentials["client_email"],
+                "scope": SCOPE,
+                "aud": token_uri,
+                "iat": issued_at,
+                "exp": issued_at + 3600,
+            },
+            self.credentials["private_key"],
+            algorithm="RS256",
+        )
+        response = client.post(
+            token_uri, data={"grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer", "assertion": assertion}
+        )
+        if response.status_code != 200:
+            raise CalendarSyncError(f"Google token request failed with {response.status_code}")
+        payload = response.json()
+        return payload["access_token"], float(payload.get("expires_in", 3600))
+
+
+_auth: Optional[ServiceAccountAuth] = None
+_auth_lock = threading.Lock()
+
+
+def default_auth() -> ServiceAccountAuth:
+    global _auth
+    with _auth_lock:
+        if _auth is None:
+            if not settings.google_calendar_json_base64:
+                raise CalendarSyncError("GOOGLE_CALENDAR_JSON_BASE64 is not configured")
+            _auth = ServiceAccountAuth.from_base64(settings.google_calendar_json_base64)
+        return _auth
+
+
+def _parse_time(value: Dict[str, str]) -> Tuple[datetime, bool]:
+    if "date" in value:
+        return datetime.fromisoformat(value["date"]), True
+    return ical.to_local_naive(datetime.fromisoformat(value["dateTime"])), False
+
+
+def _remote_event(item: Dict[str, Any]) -> Tuple[RemoteEvent, List[datetime]]:
+    """Map one events.list item to an event and any EXDATEs listed in its recurrence."""
+    start, all_day = _parse_time(item["start"])
+    end = _parse_time(item["end"])[0] if "end" in item else start
+    rrule = None
+    exdates: List[datetime] = []
+    for line in item.get("recurrence", []):
+        name, params, value = ical.parse_line(line)
+        if name == "RRULE":
+            rrule = ical.localize_rrule(value)
+        elif name == "EXDATE":
+            exdates.extend(ical.parse_datetime_list([(value, params)]))
+    original = item.get("originalStartTime")
+    event = RemoteEvent(
+        external_id=item["id"],
+        etag=item.get("etag"),
+        title=(item.get("summary") or "(no title)")[:200],
+        start=start,
+        end=end,
+        all_day=all_day,
+        notes=item.get("description"),
+        rrule=rrule,
+        master_external_id=item.get("recurringEventId"),
+        original_start=_parse_time(original)[0] if original else None,
+    )
+    return event, exdates
+
+
+def fetch_changes(
+    client: httpx.Client, source: CalendarSource, auth: Optional[ServiceAccountAuth] = None
+) -> RemoteChanges:
+    """Page through events.list from the stored sync token, or list everything when there is none.
+
+    An expired token (410 Gone) falls back to a full listing, after which events
+    that were not listed are treated as deleted.
+    """
+    auth = auth or default_auth()
+    url = f"{settings.google_calendar_api_url.rstrip('/')}/calendars/{quote(source.url, safe='')}/events"
+    sync_token = source.sync_token
+    changes = RemoteChanges()
+    page_token: Optional[str] = None
+    while True:
+        params = {"maxResults": str(PAGE_SIZE), "showDeleted": "true"}
+        if sync_token:
+            params["syncToken"] = sync_token
+        if page_token:
+            params["pageToken"] = page_token
+        response = client.get(url, params=params, headers=auth.headers(client))
+        if response.status_code == 410 and sync_token:
+            sync_token, page_token, changes = None, None, RemoteChanges()
+            continue
+        if response.status_code != 200:
+            raise CalendarSyncError(f"Google events.list returned {response.status_code}")
+        payload = response.json()
+        if sync_token is None and changes.keep_only is None:
+            changes.keep_only = set()
+
+        for item in payload.get("items", []):
+            changes.fetched += 1
+            if item.get("status") == "cancelled":
+                changes.deleted.append(item["id"])
+                if item.get("recurringEventId") and item.get("originalStartTime"):
+                    original_start = _parse_time(item["originalStartTime"])[0]
+                    changes.cancelled.append((item["recurringEventId"], original_start))
+                continue
+            event, exdates = _remote_event(item)
+            changes.events.append(event)
+            changes.cancelled.extend((event.external_id, value) for value in exdates)
+            if changes.keep_only is not None:
+                changes.keep_only.add(event.external_id)
+
+        page_token = payload.get("nextPageToken")
+        if not page_token:
+            changes.sync_token = payload.get("nextSyncToken")
+            return changes
@@ -0,0 +1,157 @@
+"""Minimal RFC 5545 (iCalendar) helpers for reading and writing VEVENT components."""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+Params = Dict[str, str]
+Property = Tuple[str, Params]
+Component = Dict[str, List[Property]]
+
+_TEXT_ESCAPES = {"n": "\n", "N": "\n", "\\": "\\", ",": ",", ";": ";"}
+MAX_LINE_OCTETS = 75
+
+
+def unfold(text: str) -> List[str]:
+    """Split iCalendar text into logical lines, joining folded continuation lines."""
+    lines: List[str] = []
+    for raw in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+    return lines
+
+
+def parse_line(line: str) -> Tuple[str, Params, str]:
+    """Split ``NAME;PARAM=x:value`` into its name, parameters and raw value."""
+    in_quotes = False
+    for position, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:position], line[position + 1 :]
+            break
+    else:
+        head, value = line, ""
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, param_value = raw.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def components(text: str, kind: str = "VEVENT") -> List[Component]:
+    """Every ``kind`` component in ``text``; nested components (e.g. VALARM) are skipped."""
+    found: List[Component] = []
+    current: Optional[Component] = None
+    depth = 0
+    for line in unfold(text):
+        name, params, value = parse_line(line)
+        if name == "BEGIN":
+            if current is not None:
+                depth += 1
+            elif value.upper() == kind:
+                current, depth = {}, 0
+        elif name == "END":
+            if current is not None and depth:
+                depth -= 1
+            elif current is not None and value.upper() == kind:
+                found.append(current)
+                current = None
+        elif current is not None and not depth:
+            current.setdefault(name, []).append((value, params))
+    return found
+
+
+def first(component: Component, name: str) -> Optional[Property]:
+    values = component.get(name)
+    return values[0] if values else None
+
+
+def unescape_text(value: str) -> str:
+    chars: List[str] = []
+    iterator = iter(value)
+    for char in iterator:
+        if char == "\\":
+            following = next(iterator, "")
+            chars.append(_TEXT_ESCAPES.get(following, following))
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def to_local_naive(value: datetime) -> datetime:
+    """Convert an aware datetime to the server's local wall-clock time, as events are stored naive."""
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def parse_datetime(value: str, params: Params) -> Tuple[datetime, bool]:
+    """Parse a DATE or DATE-TIME value, returning ``(local naive datetime, is_date)``."""
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        day = datetime.strptime(value[:8], "%Y%m%d").date()
+        return datetime.combine(day, datetime.min.time()), True
+    parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return to_local_naive(parsed.replace(tzinfo=ZoneInfo("UTC"))), False
+    if "TZID" in params:
+        try:
+            return to_local_naive(parsed.replace(tzinfo=ZoneInfo(params["TZID"]))), False
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return parsed, False
+
+
+def parse_datetime_list(properties: Iterable[Property]) -> List[datetime]:
+    """Flatten (possibly comma-separated) EXDATE/RDATE properties."""
+    values = []
+    for value, params in properties:
+        for item in value.split(","):
+            if item.strip():
+                values.append(parse_datetime(item, params)[0])
+    return values
+
+
+def localize_rrule(text: str) -> str:
+    """Rewrite a UTC ``UNTIL`` to local naive time so the rule fits a naive DTSTART."""
+    parts = []
+    for part in text.split(";"):
+        key, _, value = part.partition("=")
+        if key.upper() == "UNTIL" and value.endswith("Z"):
+            part = f"{key}={parse_datetime(value, {})[0].strftime('%Y%m%dT%H%M%S')}"
+        parts.append(part)
+    return ";".join(parts)
+
+
+def escape_text(value: str) -> str:
+    value = value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    return value.replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def format_datetime(value: datetime, is_date: bool = False) -> str:
+    """Format a naive (floating, server-local) datetime, or its date for all-day values."""
+    return value.strftime("%Y%m%d") if is_date else value.strftime("%Y%m%dT%H%M%S")
+
+
+def content_line(name: str, value: str, params: Optional[Params] = None) -> str:
+    """One CRLF-terminated content line, folded at 75 octets without splitting UTF-8 sequences."""
+    head = name + "".join(f";{key}={param}" for key, param in (params or {}).items())
+    line = f"{head}:{value}"
+    if len(line.encode()) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    chunks: List[str] = []
+    chunk = ""
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        width = len(char.encode())
+        if size + width > limit:
+            chunks.append(chunk)
+            # Continuation lines start with a space, which counts towards their 75 octets.
+            chunk, size, limit = "", 0, MAX_LINE_OCTETS - 1
+        chunk += char
+        size += width
+    chunks.append(chunk)
+    return "\r\n ".join(chunks) + "\r\n"
@@ -1,27 +1,73 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import bindparam, column, func, literal_column, null, table
 from sqlmodel import Session, select
 
 from app.models.link import Link
-from app.schemas.link import LinkCreate, LinkUpdate
+from app.schemas.link import LinkCreate, LinkSearchHit, LinkUpdate
+from app.services import tags as tag_service
+from app.services.pagination import Page, SortKey, paginate
+from app.services.tags import TagMode
 
+# The trigram tokenizer cannot match terms shorter than three characters;
+# those fall back to a LIKE filter on the (already narrowed) result set.
+FTS_MIN_TERM_LENGTH = 3
 
-def list_links(session: Session) -> List[Link]:
-    statement = select(Link).order_by(Link.title.asc())
-    return list(session.exec(statement).all())
+LINK_ORDER = (SortKey(Link.title), SortKey(Link.id))
 
+_link_fts = table("link_fts", column("rowid"))
+_link_fts_match = literal_column("link_fts")
 
-def search_links(session: Session, query: Optional[str], tags: Optional[List[str]]) -> List[Link]:
-    statement = select(Link)
-    if query:
-        like_query = f"%{query.lower()}%"
+
+def list_links(
+    session: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Page:
+    return paginate(session, select(Link), LINK_ORDER, limit, cursor, fields)
+
+
+def _fts_expression(terms: List[str]) -> str:
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search_links(
+    session: Session,
+    query: Optional[str],
+    tags: Optional[List[str]],
+    limit: int = 50,
+    tag_mode: TagMode = "all",
+) -> List[LinkSearchHit]:
+    terms = query.split() if query else []
+    use_fts = session.get_bind().dialect.name == "sqlite"
+    fts_terms = [term for term in terms if use_fts and len(term) >= FTS_MIN_TERM_LENGTH]
+    like_terms = [term for term in terms if term not in fts_terms]
+
+    if fts_terms:
+        rank = func.bm25(_link_fts_match, 10.0, 2.0, 1.0)
+        snippet = func.snippet(_link_fts_match, -1, "<mark>", "</mark>", "…", 16)
+        statement = (
+            select(Link, snippet, rank)
+            .join(_link_fts, _link_fts.c.rowid == Link.id)
+            .where(_link_fts_match.op("MATCH")(_fts_expression(fts_terms)))
+            .order_by(rank, Link.click_count.desc(), Link.title.asc())
+        )
+    else:
+        statement = select(Link, null(), null()).order_by(Link.click_count.desc(), Link.title.asc())
+    for term in like_terms:
+        like_query = f"%{term.lower()}%"
         statement = statement.where(Link.title.ilike(like_query) | Link.url.ilike(like_query))
     if tags:
-        for tag in tags:
-            statement = statement.where(Link.tags.contains([tag]))
-    statement = statement.order_by(Link.click_count.desc(), Link.title.asc())
-    return list(session.exec(statement).all())
+        statement = statement.where(Link.id.in_(tag_service.link_ids_with_tags(tags, tag_mode)))
+
+    return [
+        LinkSearchHit.model_validate(link, from_attributes=True).model_copy(
+            update={"snippet": snippet_text, "score": -score if score is not None else None}
+        )
+        for link, snippet_text, score in session.exec(statement.limit(limit)).all()
+    ]
 
 
 def create_link(session: Session, payload: LinkCreate, owner_id: Optional[int]) -> Link:
@@ -29,6 +75,8 @@ def create_link(session: Session, payload: LinkCreate, owner_id: Optional[int])
     data["url"] = str(payload.url)
     link = Link(**data, owner_id=owner_id)
     session.add(link)
+    session.flush()
+    tag_service.sync_link_tags(session, link.id, link.tags)
     session.commit()
     session.refresh(link)
     return link
@@ -44,6 +92,8 @@ def update_link(session: Session, link_id: int, payload: LinkUpdate) -> Link:
     for field, value in update_data.items():
         setattr(link, field, value)
     session.add(link)
+    if "tags" in update_data:
+        tag_service.sync_link_tags(session, link.id, link.tags or [])
     session.commit()
     session.refresh(link)
     return link
@@ -53,17 +103,34 @@ def delete_link(session: Session, link_id: int) -> None:
     link = session.get(Link, link_id)
     if link is None:
         raise ValueError("Link not found")
+    tag_service.delete_link_tags(session, link_id)
     session.delete(link)
     session.commit()
 
 
-def register_click(session: Session, link_id: int) -> Link:
+def get_link(session: Session, link_id: int) -> Link:
     link = session.get(Link, link_id)
     if link is None:
         raise ValueError("Link not found")
-    link.click_count += 1
-    link.last_accessed_at = datetime.utcnow()
-    session.add(link)
-    session.commit()
-    session.refresh(link)
     return link
+
+
+def apply_click_deltas(session: Session, deltas: Dict[int, Tuple[int, datetime]]) -> None:
+    """Add buffered click counts in a single executemany UPDATE."""
+    link_table = Link.__table__
+    statement = (
+        link_table.update()
+        .where(link_table.c.id == bindparam("link_id"))
+        .values(
+            click_count=link_table.c.click_count + bindparam("delta"),
+            last_accessed_at=bindparam("accessed_at"),
+        )
+    )
+    session.execute(
+        statement,
+        [
+            {"link_id": link_id, "delta": delta, "accessed_at": accessed_at}
+            for link_id, (delta, accessed_at) in sorted(deltas.items())
+        ],
+    )
+    session.commit()
@@ -0,0 +1,140 @@
+import base64
+import binascii
+import datetime as dt
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import Select
+from sqlmodel import Session
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SortKey:
+    column: Any
+    nulls_last: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.column.key
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated listing.
+
+    ``items`` are model instances, or plain dicts when a field projection was requested.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dt.datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"dt"}:
+        return dt.datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise InvalidCursor("Invalid cursor") from error
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    try:
+        return [_decode_value(value) for value in values]
+    except ValueError as error:
+        raise InvalidCursor("Invalid cursor") from error
+
+
+def _equals(key: SortKey, value: Any):
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def _after(key: SortKey, value: Any):
+    if value is None:
+        # NULLs sort last: nothing comes after them but ties on later keys.
+        return None if key.nulls_last else key.column.is_not(None)
+    if key.nulls_last:
+        return or_(key.column > value, key.column.is_(None))
+    return key.column > value
+
+
+def _keyset_predicate(keys: Sequence[SortKey], values: Sequence[Any]):
+    if not any(key.nulls_last for key in keys):
+        # Row-value comparison lets SQLite seek straight into the matching index.
+        return tuple_(*[key.column for key in keys]) > tuple_(*values)
+    clauses = []
+    for position, key in enumerate(keys):
+        after = _after(key, values[position])
+        if after is not None:
+            ties = [_equals(prefix, value) for prefix, value in zip(keys[:position], values[:position])]
+            clauses.append(and_(*ties, after))
+    return or_(*clauses)
+
+
+def paginate(
+    session: Session,
+    statement: Select,
+    keys: Sequence[SortKey],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Page:
+    """Order ``statement`` by ``keys`` and return the page after ``cursor``.
+
+    The last key must be unique (normally the primary key) so the ordering is total.
+    ``fields`` narrows the selected columns to the named attributes.
+    """
+    if cursor:
+        statement = statement.where(_keyset_predicate(keys, decode_cursor(cursor, len(keys))))
+    order_by = [key.column.asc().nulls_last() if key.nulls_last else key.column.asc() for key in keys]
+    statement = statement.order_by(*order_by)
+
+    if fields is not None:
+        entity = statement.column_descriptions[0]["entity"]
+        names = list(dict.fromkeys([*fields, *(key.name for key in keys)]))
+        statement = statement.with_only_columns(*[getattr(entity, name) for name in names])
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+
+    if fields is None:
+        rows: List[Any] = list(session.exec(statement).all())
+    else:
+        rows = [dict(row._mapping) for row in session.execute(statement).all()]
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [last[key.name] if isinstance(last, dict) else getattr(last, key.name) for key in keys]
+        )
+    if fields is not None:
+        rows = [{name: row[name] for name in fields} for row in rows]
+    return Page(items=rows, next_cursor=next_cursor)
+
@@ -0,0 +1,169 @@
+"""RRULE parsing and cached occurrence expansion for recurring events."""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import islice, takewhile
+from datetime import MAXYEAR, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from dateutil.rrule import rrule, rrulestr
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services import ical
+
+MAX_COUNT = 10000
+# Sub-daily rules can produce hundreds of thousands of occurrences a year; the finest supported is DAILY.
+UNSUPPORTED_FREQUENCIES = {"SECONDLY", "MINUTELY", "HOURLY"}
+# Occurrences expanded for one window; BYHOUR/BYMINUTE on a daily rule can still be dense.
+MAX_WINDOW_OCCURRENCES = 2000
+# recurrence_end of a series without COUNT or UNTIL.
+UNBOUNDED = datetime.max
+# A rule must occur within this many years of its start (see _first_occurrence).
+OCCURRENCE_HORIZON_YEARS = 30
+# The Gregorian calendar repeats its weekdays and leap years every 400 years.
+GREGORIAN_CYCLE_YEARS = 400
+
+
+class InvalidRecurrence(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class _Expansion:
+    rrule: str
+    dtstart: datetime
+    window_start: datetime
+    window_end: datetime
+    starts: Tuple[datetime, ...]
+
+
+# Keyed by event id; entries also carry the rule and dtstart they were expanded from,
+# so an edit made by another process can never be served from a stale entry.
+_occurrence_cache: TTLCache[int, _Expansion] = TTLCache(ttl_seconds=settings.event_occurrence_cache_ttl_seconds)
+
+
+def _parts(text: str) -> Dict[str, str]:
+    return dict(part.split("=", 1) for part in text.split(";") if "=" in part)
+
+
+def build_rule(text: str, dtstart: datetime) -> rrule:
+    return rrulestr(text, dtstart=dtstart)
+
+
+def _first_occurrence(rule: rrule, dtstart: datetime) -> Optional[datetime]:
+    """The rule's first occurrence when there is one within ``OCCURRENCE_HORIZON_YEARS``.
+
+    dateutil looks for a match up to year 9999, which takes seconds for a rule
+    that never occurs (``BYMONTH=2;BYMONTHDAY=30``). Moving DTSTART forward by
+    whole Gregorian cycles keeps the same occurrence pattern while leaving only
+    between ``OCCURRENCE_HORIZON_YEARS`` and one cycle more before that limit.
+    """
+    cycles = max(0, (MAXYEAR - OCCURRENCE_HORIZON_YEARS - dtstart.year) // GREGORIAN_CYCLE_YEARS)
+    shifted = dtstart.replace(year=dtstart.year + cycles * GREGORIAN_CYCLE_YEARS)
+    return next(iter(rule.replace(dtstart=shifted, until=None, count=None)), None)
+
+
+def normalize_rrule(value: Optional[str], dtstart: Optional[datetime] = None) -> Optional[str]:
+    """Validate an RRULE body and return it upper-cased without the ``RRULE:`` prefix.
+
+    A UTC ``UNTIL`` is rewritten to local time to fit the naive DTSTART. Rules
+    that never occur from ``dtstart`` (default 2000-01-01) are rejected.
+    """
+    if value is None or not value.strip():
+        return None
+    text = value.strip().upper()
+    if text.startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    if ":" in text or "\n" in text:
+        raise InvalidRecurrence("Only a single RRULE body is supported (no DTSTART, EXDATE or RDATE lines)")
+    parts = _parts(text)
+    if parts.get("FREQ") in UNSUPPORTED_FREQUENCIES:
+        raise InvalidRecurrence(f"FREQ={parts['FREQ']} is not supported; use DAILY or coarser")
+    count = parts.get("COUNT")
+    if count is not None and count.isdigit() and int(count) > MAX_COUNT:
+        raise InvalidRecurrence(f"COUNT must not exceed {MAX_COUNT}")
+    interval = parts.get("INTERVAL")
+    if interval is not None and not (interval.isdigit() and int(interval) >= 1):
+        raise InvalidRecurrence("INTERVAL must be a positive integer")
+    try:
+        text = ical.localize_rrule(text)
+        dtstart = dtstart or datetime(2000, 1, 1)
+        rule = build_rule(text, dtstart)
+    except (ValueError, TypeError) as error:
+        raise InvalidRecurrence(f"Invalid RRULE: {error}") from error
+    if _first_occurrence(rule, dtstart) is None:
+        raise InvalidRecurrence(f"RRULE has no occurrence within {OCCURRENCE_HORIZON_YEARS} years")
+    return text
+
+
+def _until(value: str) -> datetime:
+    value = value.rstrip("Z")
+    return datetime.strptime(value, "%Y%m%dT%H%M%S" if "T" in value else "%Y%m%d")
+
+
+def recurrence_end(text: str, start: datetime, end: datetime) -> datetime:
+    """End of the last occurrence, or ``UNBOUNDED`` for a series without COUNT or UNTIL.
+
+    For UNTIL the bound is UNTIL itself rather than the last occurrence, so the
+    rule is never iterated; the value is only used to skip series that ended
+    before a queried window. COUNT series are walked, at most ``MAX_COUNT`` steps.
+    """
+    parts = _parts(text)
+    duration = end - start
+    if "UNTIL" in parts:
+        last = max(_until(parts["UNTIL"]), start)
+    elif "COUNT" in parts:
+        last = build_rule(text, start).before(UNBOUNDED, inc=True) or start
+    else:
+        return UNBOUNDED
+    return min(last, UNBOUNDED - duration) + duration
+
+
+def is_occurrence(text: str, dtstart: datetime, value: datetime) -> bool:
+    return bool(build_rule(text, dtstart).between(value, value, inc=True))
+
+
+def _month_floor(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _month_ceil(value: datetime) -> datetime:
+    if value.year == UNBOUNDED.year and value.month == 12:
+        return UNBOUNDED
+    year, month = (value.year + 1, 1) if value.month == 12 else (value.year, value.month + 1)
+    return datetime(year, month, 1) - timedelta(microseconds=1)
+
+
+def occurrence_starts(
+    event_id: int, text: str, dtstart: datetime, window_start: datetime, window_end: datetime
+) -> List[datetime]:
+    """Starts of the rule's occurrences within [window_start, window_end].
+
+    The rule is expanded over whole months and cached, so neighbouring day and
+    week views of the same month are answered from the cache. At most
+    ``MAX_WINDOW_OCCURRENCES`` are expanded; the rest of a denser window is cut off.
+    """
+    cached = _occurrence_cache.get(event_id)
+    if (
+        cached is None
+        or (cached.rrule, cached.dtstart) != (text, dtstart)
+        or not (cached.window_start <= window_start and window_end <= cached.window_end)
+    ):
+        expand_from, expand_to = _month_floor(window_start), _month_ceil(window_end)
+        rule = build_rule(text, dtstart)
+        in_window = takewhile(lambda value: value <= expand_to, rule.xafter(expand_from, inc=True))
+        starts = tuple(islice(in_window, MAX_WINDOW_OCCURRENCES))
+        if len(starts) == MAX_WINDOW_OCCURRENCES:
+            # Truncated: the cached expansion only covers up to the last start kept.
+            expand_to = starts[-1]
+        cached = _Expansion(text, dtstart, expand_from, expand_to, starts)
+        _occurrence_cache.set(event_id, cached)
+    return list(cached.starts[bisect_left(cached.starts, window_start) : bisect_right(cached.starts, window_end)])
+
+
+def invalidate_occurrences(event_id: Optional[int] = None) -> None:
+    if event_id is None:
+        _occurrence_cache.clear()
+    else:
+        _occurrence_cache.invalidate(event_id)
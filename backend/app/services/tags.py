@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, List, Literal
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.sql import Select
+from sqlmodel import Session, select
+
+from app.models.tag import FileTag, LinkTag, Tag
+from app.schemas.tag import TagCount
+
+TagMode = Literal["all", "any"]
+
+
+def _normalize(names: Iterable[str]) -> List[str]:
+    return sorted({name.strip() for name in names if name and name.strip()})
+
+
+def _tag_ids(session: Session, names: List[str]) -> Dict[str, int]:
+    if not names:
+        return {}
+    existing = dict(session.exec(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    missing = [name for name in names if name not in existing]
+    if missing:
+        session.execute(insert(Tag), [{"name": name} for name in missing])
+        existing.update(session.exec(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+    return existing
+
+
+def sync_link_tags(session: Session, link_id: int, names: Iterable[str]) -> None:
+    wanted = set(_tag_ids(session, _normalize(names)).values())
+    current = set(session.exec(select(LinkTag.tag_id).where(LinkTag.link_id == link_id)).all())
+    if current - wanted:
+        session.execute(delete(LinkTag).where(LinkTag.link_id == link_id, LinkTag.tag_id.in_(current - wanted)))
+    if wanted - current:
+        session.execute(insert(LinkTag), [{"link_id": link_id, "tag_id": tag_id} for tag_id in wanted - current])
+
+
+def sync_file_tags(session: Session, file_id: int, names: Iterable[str]) -> None:
+    wanted = set(_tag_ids(session, _normalize(names)).values())
+    current = set(session.exec(select(FileTag.tag_id).where(FileTag.file_id == file_id)).all())
+    if current - wanted:
+        session.execute(delete(FileTag).where(FileTag.file_id == file_id, FileTag.tag_id.in_(current - wanted)))
+    if wanted - current:
+        session.execute(insert(FileTag), [{"file_id": file_id, "tag_id": tag_id} for tag_id in wanted - current])
+
+
+def delete_link_tags(session: Session, link_id: int) -> None:
+    session.execute(delete(LinkTag).where(LinkTag.link_id == link_id))
+
+
+def delete_file_tags(session: Session, file_id: int) -> None:
+    session.execute(delete(FileTag).where(FileTag.file_id == file_id))
+
+
+def link_ids_with_tags(names: Iterable[str], mode: TagMode = "all") -> Select:
+    """Link ids carrying all (or any) of the tags, resolved on the (tag_id, link_id) index."""
+    wanted = _normalize(names)
+    statement = select(LinkTag.link_id).join(Tag, Tag.id == LinkTag.tag_id).where(Tag.name.in_(wanted))
+    if mode == "all":
+        statement = statement.group_by(LinkTag.link_id).having(func.count() == len(wanted))
+    return statement
+
+
+def file_ids_with_tags(names: Iterable[str], mode: TagMode = "all") -> Select:
+    wanted = _normalize(names)
+    statement = select(FileTag.file_id).join(Tag, Tag.id == FileTag.tag_id).where(Tag.name.in_(wanted))
+    if mode == "all":
+        statement = statement.group_by(FileTag.file_id).having(func.count() == len(wanted))
+    return statement
+
+
+def _facets(session: Session, association, tag_id_column) -> List[TagCount]:
+    # Drive the aggregate from the covering (tag_id, item_id) index and look names up by primary key.
+    total = func.count().label("total")
+    statement = (
+        select(Tag.name, total)
+        .select_from(association)
+        .join(Tag, Tag.id == tag_id_column)
+        .group_by(tag_id_column)
+        .order_by(total.desc(), Tag.name.asc())
+    )
+    return [TagCount(name=name, count=count) for name, count in session.exec(statement).all()]
+
+
+def link_tag_facets(session: Session) -> List[TagCount]:
+    return _facets(session, LinkTag, LinkTag.tag_id)
+
+
+def file_tag_facets(session: Session) -> List[TagCount]:
+    return _facets(session, FileTag, FileTag.tag_id)
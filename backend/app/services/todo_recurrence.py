@@ -0,0 +1,270 @@
+"""Repeating todos: ``repeat_rule`` parsing, next-instance spawning and the batched catch-up pass.
+
+A repeating todo is a chain of instances sharing ``series_id``. The latest
+instance (``spawned_next`` false) is the head; completing it spawns the next
+instance, and the catch-up pass creates every instance that has come due
+since. Each head stores ``next_due`` so the pass reads only series with work. ``repeat_rule`` accepts an RRULE body or a short phrase such as
+"weekly", "毎週月曜", "3日ごと" or "毎月末", anchored on the instance's due date.
+"""
+
+import logging
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dateutil.rrule import rrule
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.tasks import PeriodicTask
+from app.db.session import session_scope
+from app.models.todo import Todo, TodoStatus
+from app.services import recurrence
+from app.services.recurrence import UNBOUNDED, InvalidRecurrence
+
+logger = logging.getLogger(__name__)
+
+# Instances created per series in one catch-up pass; older missed ones are skipped.
+MAX_CATCH_UP = 100
+BATCH_SIZE = 500
+
+_WEEKDAYS = "MO,TU,WE,TH,FR"
+_KEYWORDS = {
+    "daily": "FREQ=DAILY",
+    "weekly": "FREQ=WEEKLY",
+    "biweekly": "FREQ=WEEKLY;INTERVAL=2",
+    "monthly": "FREQ=MONTHLY",
+    "yearly": "FREQ=YEARLY",
+    "annually": "FREQ=YEARLY",
+    "weekdays": f"FREQ=WEEKLY;BYDAY={_WEEKDAYS}",
+    "weekends": "FREQ=WEEKLY;BYDAY=SA,SU",
+    "毎日": "FREQ=DAILY",
+    "毎週": "FREQ=WEEKLY",
+    "隔週": "FREQ=WEEKLY;INTERVAL=2",
+    "毎月": "FREQ=MONTHLY",
+    "毎年": "FREQ=YEARLY",
+    "平日": f"FREQ=WEEKLY;BYDAY={_WEEKDAYS}",
+    "毎平日": f"FREQ=WEEKLY;BYDAY={_WEEKDAYS}",
+    "週末": "FREQ=WEEKLY;BYDAY=SA,SU",
+    "毎月末": "FREQ=MONTHLY;BYMONTHDAY=-1",
+}
+_JA_DAYS = {"月": "MO", "火": "TU", "水": "WE", "木": "TH", "金": "FR", "土": "SA", "日": "SU"}
+_EN_DAYS = {"mon": "MO", "tue": "TU", "wed": "WE", "thu": "TH", "fri": "FR", "sat": "SA", "sun": "SU"}
+_JA_UNITS = {
+    "日": "DAILY",
+    "週": "WEEKLY",
+    "週間": "WEEKLY",
+    "年": "YEARLY",
+    **dict.fromkeys(("か月", "ヶ月", "ヵ月", "カ月"), "MONTHLY"),
+}
+_EN_UNITS = {"day": "DAILY", "week": "WEEKLY", "month": "MONTHLY", "year": "YEARLY"}
+
+_JA_WEEKLY = re.compile(r"^(毎週|隔週)([月火水木金土日](?:[・、,]?[月火水木金土日])*)(?:曜日?)?$")
+_JA_EVERY = re.compile(r"^([1-9]\d*)(日|週間?|か月|ヶ月|ヵ月|カ月|年)(?:ごと|毎|おき)$")
+_JA_MONTH_DAY = re.compile(r"^毎月(\d{1,2})日$")
+_EN_EVERY = re.compile(r"^every\s+(?:([1-9]\d*)\s+)?(day|week|month|year)s?$")
+_EN_DAY = r"(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*"
+_EN_WEEKLY = re.compile(rf"^every\s+({_EN_DAY}(?:\s*(?:,|and)\s*{_EN_DAY})*)$")
+
+
+def _phrase_rule(text: str) -> Optional[str]:
+    lowered = " ".join(text.lower().split())
+    if lowered in _KEYWORDS:
+        return _KEYWORDS[lowered]
+    if match := _JA_WEEKLY.match(text):
+        days = ",".join(dict.fromkeys(_JA_DAYS[char] for char in match.group(2) if char in _JA_DAYS))
+        interval = ";INTERVAL=2" if match.group(1) == "隔週" else ""
+        return f"FREQ=WEEKLY{interval};BYDAY={days}"
+    if match := _JA_EVERY.match(text):
+        return f"FREQ={_JA_UNITS[match.group(2)]};INTERVAL={int(match.group(1))}"
+    if match := _JA_MONTH_DAY.match(text):
+        return f"FREQ=MONTHLY;BYMONTHDAY={int(match.group(1))}"
+    if match := _EN_EVERY.match(lowered):
+        return f"FREQ={_EN_UNITS[match.group(2)]};INTERVAL={int(match.group(1) or 1)}"
+    if match := _EN_WEEKLY.match(lowered):
+        days = re.findall(r"mon|tue|wed|thu|fri|sat|sun", match.group(1))
+        return "FREQ=WEEKLY;BYDAY=" + ",".join(dict.fromkeys(_EN_DAYS[day] for day in days))
+    return None
+
+
+@lru_cache(maxsize=256)
+def parse_repeat_rule(text: str) -> str:
+    """The RRULE body for a ``repeat_rule``; raises ``InvalidRecurrence`` when it cannot be understood."""
+    stripped = text.strip()
+    rule = _phrase_rule(stripped)
+    if rule is None and "FREQ=" not in stripped.upper():
+        raise InvalidRecurrence(f"Unrecognized repeat rule: {stripped!r}")
+    rule = recurrence.normalize_rrule(rule or stripped)
+    if rule is None:
+        raise InvalidRecurrence("Repeat rule is empty")
+    if "COUNT=" in rule:
+        # Each instance re-anchors the rule on its own due date, so a count would never run out.
+        raise InvalidRecurrence("COUNT is not supported for repeating todos; use UNTIL")
+    return rule
+
+
+@lru_cache(maxsize=256)
+def _template(text: str) -> rrule:
+    return recurrence.build_rule(parse_repeat_rule(text), datetime(2000, 1, 1))
+
+
+def _rule(text: str, anchor: datetime) -> rrule:
+    # Parsing is cached per distinct rule text; only the anchor changes per instance.
+    return _template(text).replace(dtstart=anchor)
+
+
+def occurrence_after(text: str, anchor: datetime) -> Optional[datetime]:
+    """The first occurrence strictly after ``anchor``, or None once an UNTIL has passed."""
+    return _rule(text, anchor).after(anchor)
+
+
+def head_next_due(text: Optional[str], due: Optional[datetime]) -> Optional[datetime]:
+    """``next_due`` of a series head: when its successor comes due, ``UNBOUNDED`` if never."""
+    if text is None:
+        return None
+    if due is None:
+        return UNBOUNDED
+    try:
+        return occurrence_after(text, due) or UNBOUNDED
+    except InvalidRecurrence:
+        return UNBOUNDED
+
+
+def clean_repeat_rule(value: Optional[str]) -> Optional[str]:
+    """A submitted ``repeat_rule`` with blank treated as none; raises ``InvalidRecurrence`` if unparseable."""
+    if value is None or not value.strip():
+        return None
+    parse_repeat_rule(value)
+    return value.strip()
+
+
+def _instance(head: Any, due: datetime, next_due: Optional[datetime]) -> Dict[str, Any]:
+    # Only the last instance created for a series is its new head; earlier ones are already spawned.
+    return {
+        "title": head.title,
+        "status": TodoStatus.open,
+        "due": due,
+        "assignee_id": head.assignee_id,
+        "repeat_rule": head.repeat_rule,
+        "list_id": head.list_id,
+        "series_id": head.series_id or head.id,
+        "spawned_next": next_due is None,
+        "next_due": next_due,
+    }
+
+
+def _insert_instances(session: Session, rows: Sequence[Dict[str, Any]]) -> None:
+    # (series_id, due) is unique, so an instance created concurrently by another pass is skipped, not duplicated.
+    # A Core insert on the table keeps each batch one executemany; the ORM would split it on NULL columns.
+    for offset in range(0, len(rows), BATCH_SIZE):
+        statement = sqlite_insert(Todo.__table__).on_conflict_do_nothing(index_elements=["series_id", "due"])
+        session.execute(statement, list(rows[offset : offset + BATCH_SIZE]))
+
+
+def _mark_spawned(session: Session, ids: Sequence[int]) -> None:
+    for offset in range(0, len(ids), BATCH_SIZE):
+        session.execute(
+            update(Todo).where(Todo.id.in_(ids[offset : offset + BATCH_SIZE])).values(spawned_next=True, next_due=None)
+        )
+
+
+def spawn_next(session: Session, todo: Todo) -> Optional[datetime]:
+    """Create the instance following ``todo`` if it is the head of a repeating series; the caller commits.
+
+    Returns the new instance's due date.
+    """
+    if todo.repeat_rule is None or todo.spawned_next:
+        return None
+    anchor = todo.due or todo.completed_at or datetime.utcnow()
+    try:
+        due = occurrence_after(todo.repeat_rule, anchor)
+    except InvalidRecurrence:
+        # Rules stored before they were validated must not block completing the todo.
+        logger.warning("Not repeating todo %s with unrecognized repeat rule %r", todo.id, todo.repeat_rule)
+        return None
+    todo.spawned_next, todo.next_due = True, None
+    if due is not None:
+        _insert_instances(session, [_instance(todo, due, head_next_due(todo.repeat_rule, due))])
+    return due
+
+
+def _due_instances(head: Any, now: datetime) -> Tuple[List[datetime], datetime]:
+    """Dues of the instances to create after ``head``, and the next due after the last of them."""
+    anchor = head.due or head.completed_at
+    if anchor is None:
+        return [], UNBOUNDED
+    rule = _rule(head.repeat_rule, anchor)
+    dues = rule.between(anchor, now, inc=False)[-MAX_CATCH_UP:]
+    if not dues and head.status == TodoStatus.done:
+        # A completed head always gets its successor, even when that is not due yet.
+        following = rule.after(anchor)
+        dues = [following] if following is not None else []
+    return dues, rule.after(dues[-1] if dues else anchor) or UNBOUNDED
+
+
+def catch_up(session: Session, now: Optional[datetime] = None) -> int:
+    """Create every instance of every repeating series that has come due, in a single transaction.
+
+    Only series heads whose ``next_due`` has passed (or is not known yet) are
+    read, through a partial index, so a pass with nothing due costs one empty
+    index probe. Each distinct rule is parsed once and the new instances are
+    bulk-inserted. Returns the number of instances created.
+    """
+    now = now or datetime.now()
+    heads = session.execute(
+        select(
+            Todo.id,
+            Todo.title,
+            Todo.status,
+            Todo.due,
+            Todo.completed_at,
+            Todo.assignee_id,
+            Todo.repeat_rule,
+            Todo.list_id,
+            Todo.series_id,
+        ).where(
+            Todo.repeat_rule.is_not(None),
+            Todo.spawned_next == False,  # noqa: E712 - must read "= 0" to match the partial index
+            or_(Todo.next_due <= now, Todo.next_due.is_(None)),
+        )
+    ).all()
+
+    rows: List[Dict[str, Any]] = []
+    spawned: List[int] = []
+    rescheduled: List[Dict[str, Any]] = []
+    for head in heads:
+        try:
+            dues, following = _due_instances(head, now)
+        except InvalidRecurrence:
+            logger.warning("Not repeating todo %s with unrecognized repeat rule %r", head.id, head.repeat_rule)
+            rescheduled.append({"id": head.id, "next_due": UNBOUNDED})
+            continue
+        if dues or head.status == TodoStatus.done:
+            # A completed head whose rule has ended has no successor to wait for either.
+            spawned.append(head.id)
+        else:
+            rescheduled.append({"id": head.id, "next_due": following})
+        rows.extend(
+            _instance(head, due, following if index == len(dues) - 1 else None) for index, due in enumerate(dues)
+        )
+
+    _insert_instances(session, rows)
+    _mark_spawned(session, spawned)
+    if rescheduled:
+        session.execute(update(Todo), rescheduled)
+    session.commit()
+    return len(rows)
+
+
+def run_catch_up() -> int:
+    with session_scope() as session:
+        created = catch_up(session)
+    if created:
+        logger.info("Created %d repeating todo instances", created)
+    return created
+
+
+todo_scheduler = PeriodicTask("todo-catch-up", settings.todo_catch_up_interval_seconds, run_catch_up, run_on_stop=False)
@@ -1,35 +1,60 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Optional, Sequence
 
 from sqlmodel import Session, select
 
 from app.models.todo import Todo
 from app.schemas.todo import TodoCreate, TodoUpdate
+from app.services import todo_recurrence
+from app.services.pagination import Page, SortKey, paginate
 
+TODO_ORDER = (SortKey(Todo.status), SortKey(Todo.due, nulls_last=True), SortKey(Todo.title), SortKey(Todo.id))
 
-def list_todos(session: Session) -> list[Todo]:
-    statement = select(Todo).order_by(Todo.status.asc(), Todo.due.asc().nulls_last(), Todo.title.asc())
-    return list(session.exec(statement).all())
+
+def list_todos(
+    session: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Page:
+    return paginate(session, select(Todo), TODO_ORDER, limit, cursor, fields)
 
 
 def create_todo(session: Session, payload: TodoCreate) -> Todo:
     todo = Todo(**payload.dict())
+    todo.repeat_rule = todo_recurrence.clean_repeat_rule(todo.repeat_rule)
     session.add(todo)
+    if todo.repeat_rule is not None:
+        session.flush()
+        todo.series_id = todo.id
+        todo.next_due = todo_recurrence.head_next_due(todo.repeat_rule, todo.due)
     session.commit()
     session.refresh(todo)
     return todo
 
 
 def update_todo(session: Session, todo_id: int, payload: TodoUpdate) -> Todo:
+    """Update a todo; completing the head of a repeating series also creates its next instance."""
     todo = session.get(Todo, todo_id)
     if todo is None:
         raise ValueError("Todo not found")
+    was_done = todo.status == "done"
     update_data = payload.dict(exclude_unset=True)
+    if "repeat_rule" in update_data:
+        # Validate before touching the row so a rejected rule leaves the session clean.
+        update_data["repeat_rule"] = todo_recurrence.clean_repeat_rule(update_data["repeat_rule"])
     for field, value in update_data.items():
         setattr(todo, field, value)
+    if todo.repeat_rule is not None and todo.series_id is None:
+        todo.series_id = todo.id
+    if not todo.spawned_next and update_data.keys() & {"repeat_rule", "due"}:
+        todo.next_due = todo_recurrence.head_next_due(todo.repeat_rule, todo.due)
     if todo.status == "done" and todo.completed_at is None:
         todo.completed_at = datetime.utcnow()
+    if todo.status == "done" and not was_done:
+        todo_recurrence.spawn_next(session, todo)
     session.add(todo)
     session.commit()
     session.refresh(todo)
@@ -1,20 +1,62 @@
-from typing import List, Optional
+from typing import Any, Optional, Sequence
 
 from fastapi import HTTPException, status
+from sqlalchemy import event
 from sqlmodel import Session, select
 
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import get_password_hash
 from app.models.user import User
 from app.schemas.auth import RegisterRequest
-from app.schemas.user import UserRead
-from app.core.config import settings
+from app.services.pagination import Page, SortKey, paginate
+
+DEFAULT_USER_EMAIL = "default@local"
+USER_ORDER = (SortKey(User.name), SortKey(User.id))
+
+# Detached copies of authenticated users keyed by token subject (email).
+_user_cache: TTLCache[str, User] = TTLCache(ttl_seconds=settings.auth_user_cache_ttl_seconds, max_entries=256)
+
+
+def get_cached_user(email: str) -> Optional[User]:
+    return _user_cache.get(email)
+
+
+def invalidate_cached_user(email: Optional[str] = None) -> None:
+    if email is None:
+        _user_cache.clear()
+    else:
+        _user_cache.invalidate(email)
+
+
+def _cache_user(user: User) -> User:
+    detached = User(**user.model_dump())
+    if user.email:
+        _user_cache.set(user.email, detached)
+    return detached
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper: Any, connection: Any, target: User) -> None:
+    invalidate_cached_user()
 
 
 def get_user_by_email(session: Session, email: str) -> Optional[User]:
     return session.exec(select(User).where(User.email == email)).first()
 
 
-def create_user(session: Session, payload: RegisterRequest) -> User:
+def load_user_for_auth(session: Session, email: str) -> Optional[User]:
+    cached = get_cached_user(email)
+    if cached is not None:
+        return cached
+    user = get_user_by_email(session, email)
+    if user is None:
+        return None
+    return _cache_user(user)
+
+
+def create_user(session: Session, payload: RegisterRequest, password_hash: str) -> User:
     existing = get_user_by_email(session, payload.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
@@ -22,29 +64,33 @@ def create_user(session: Session, payload: RegisterRequest) -> User:
         name=payload.name,
         email=payload.email,
         role=payload.role,  # type: ignore[arg-type]
-        password_hash=get_password_hash(payload.password),
+        password_hash=password_hash,
     )
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_cached_user(user.email)
     return user
 
 
-def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(session, email)
-    if user is None or user.password_hash is None:
-        return None
-    if not verify_password(password, user.password_hash):
-        return None
-    return user
+def list_users(
+    session: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Page:
+    return paginate(session, select(User), USER_ORDER, limit, cursor, fields)
 
 
-def list_users(session: Session) -> List[UserRead]:
-    users = session.exec(select(User).order_by(User.name.asc())).all()
-    return [
-        UserRead(id=user.id, name=user.name, role=user.role, email=user.email)
-        for user in users
-    ]
+def ensure_default_user(session: Session) -> User:
+    existing = load_user_for_auth(session, DEFAULT_USER_EMAIL)
+    if existing is not None:
+        return existing
+    user = User(name="Household", role="admin", email=DEFAULT_USER_EMAIL, password_hash=get_password_hash("changeme"))
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return _cache_user(user)
 
 
 def ensure_default_admin(session: Session) -> None:
@@ -63,3 +109,4 @@ def ensure_default_admin(session: Session) -> None:
     )
     session.add(admin)
     session.commit()
+    invalidate_cached_user(admin.email)
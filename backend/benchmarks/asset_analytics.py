@@ -0,0 +1,118 @@
+"""Vectorized asset series/latest computations versus a per-row Python loop.
+
+Usage: python -m benchmarks.asset_analytics [--accounts 60] [--days 3650] [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.models.asset_snapshot import AssetSnapshot
+from app.services import asset_analytics
+
+
+def naive_series(session: Session, window: int) -> Dict[Tuple[str, str], List[Tuple[str, float, float, float]]]:
+    """The straightforward ORM + loop version, in the style of the old summarize_assets."""
+    closing: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(dict)
+    statement = select(AssetSnapshot).order_by(AssetSnapshot.date.asc())
+    for snapshot in session.exec(statement).all():
+        closing[(snapshot.account_name, snapshot.currency)][snapshot.date.strftime("%Y-%m")] = snapshot.balance
+    result = {}
+    for key, months in closing.items():
+        points, history = [], []
+        previous = None
+        for month in sorted(months):
+            balance = months[month]
+            history.append(balance)
+            recent = history[-window:]
+            delta = None if previous is None else balance - previous
+            points.append((month, balance, delta, sum(recent) / len(recent)))
+            previous = balance
+        result[key] = points
+    return result
+
+
+def naive_latest(session: Session) -> Dict[Tuple[str, str], Tuple[date, float]]:
+    latest: Dict[Tuple[str, str], Tuple[date, float]] = {}
+    for snapshot in session.exec(select(AssetSnapshot)).all():
+        key = (snapshot.account_name, snapshot.currency)
+        if key not in latest or snapshot.date > latest[key][0]:
+            latest[key] = (snapshot.date, snapshot.balance)
+    return latest
+
+
+def _time(call: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=60)
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--window", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        engine = create_db_engine(url, Settings(database_url=url))
+        SQLModel.metadata.create_all(engine)
+        rng = random.Random(5)
+        first_day = date(2010, 1, 1)
+        with Session(engine) as session:
+            for account in range(args.accounts):
+                balance = rng.uniform(1e3, 1e6)
+                rows = []
+                for day in range(args.days):
+                    balance *= rng.uniform(0.99, 1.011)
+                    rows.append(
+                        {
+                            "date": first_day + timedelta(days=day),
+                            "account_name": f"Account {account:03d}",
+                            "balance": round(balance, 2),
+                            "currency": "JPY" if account % 3 else "USD",
+                        }
+                    )
+                session.execute(insert(AssetSnapshot), rows)
+            session.commit()
+        total_rows = args.accounts * args.days
+
+        with Session(engine) as session:
+            naive_ms, naive = _time(lambda: naive_series(session, args.window), args.repeat)
+            vector_ms, vector = _time(lambda: asset_analytics.monthly_series(session, window=args.window), args.repeat)
+            naive_latest_ms, _ = _time(lambda: naive_latest(session), args.repeat)
+            vector_latest_ms, _ = _time(lambda: asset_analytics.latest_balances(session), args.repeat)
+
+        for item in vector.series:
+            expected = naive[(item.account_name, item.currency)]
+            got = [(point.month, point.balance, point.delta, point.rolling_average) for point in item.points]
+            assert len(got) == len(expected)
+            for (month, balance, delta, average), (e_month, e_balance, e_delta, e_average) in zip(got, expected):
+                assert month == e_month and balance == e_balance
+                assert (delta is None) == (e_delta is None) and abs((delta or 0) - (e_delta or 0)) < 1e-6
+                assert abs(average - e_average) < 1e-6
+        engine.dispose()
+
+    print(f"snapshots: {total_rows} ({args.accounts} accounts x {args.days} days)")
+    print(f"series  naive={naive_ms:8.1f}ms  vectorized={vector_ms:8.1f}ms  x{naive_ms / vector_ms:.1f}")
+    print(f"latest  naive={naive_latest_ms:8.1f}ms  vectorized={vector_latest_ms:8.1f}ms  x{naive_latest_ms / vector_latest_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Peak memory and throughput of the streaming asset CSV importer.
+
+The import runs in a fresh child process so its peak RSS is measured in isolation.
+The same file is then imported a second time to time the no-op upsert path.
+
+Usage: python -m benchmarks.asset_import [--rows 1000000]
+"""
+
+import argparse
+import multiprocessing
+import random
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.services import assets as asset_service
+
+ACCOUNTS = ["Savings", "Checking", "Brokerage", "Pension", "Wallet", "Card"]
+CURRENCIES = ["JPY", "USD", "EUR"]
+
+
+def write_csv(path: Path, rows: int) -> None:
+    rng = random.Random(11)
+    first_day = date(2000, 1, 1)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        handle.write("date,account_name,balance,currency\n")
+        for index in range(rows):
+            day = first_day + timedelta(days=index // len(ACCOUNTS))
+            account = f"{ACCOUNTS[index % len(ACCOUNTS)]} {index % 97}"
+            handle.write(f"{day.isoformat()},{account},{rng.uniform(0, 1e6):.2f},{rng.choice(CURRENCIES)}\n")
+
+
+def _import(csv_path: str, database_url: str, results: "multiprocessing.Queue[tuple]") -> None:
+    engine = create_db_engine(database_url, Settings(database_url=database_url))
+    SQLModel.metadata.create_all(engine)
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    passes = []
+    for _ in range(2):
+        started = time.perf_counter()
+        with Session(engine) as session, open(csv_path, "rb") as stream:
+            response = asset_service.import_asset_csv(session, stream)
+        passes.append((response, time.perf_counter() - started))
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put(([(result.model_dump(exclude={"failed"}), elapsed) for result, elapsed in passes], baseline_kib, peak_kib))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = Path(directory) / "export.csv"
+        write_csv(csv_path, args.rows)
+        size_mib = csv_path.stat().st_size / 2**20
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=_import, args=(str(csv_path), url, results))
+        process.start()
+        passes, baseline_kib, peak_kib = results.get()
+        process.join()
+
+    print(f"file: {args.rows} rows, {size_mib:.1f} MiB")
+    for label, (counts, elapsed) in zip(["first import", "re-import"], passes):
+        print(
+            f"{label:>12}: inserted={counts['inserted']} updated={counts['updated']} "
+            f"unchanged={counts['unchanged']} failed={counts['failed_count']} "
+            f"in {elapsed:.1f}s ({counts['imported'] / elapsed:,.0f} rows/s)"
+        )
+    print(f"peak RSS {peak_kib / 1024:.1f} MiB (startup {baseline_kib / 1024:.1f} MiB, +{(peak_kib - baseline_kib) / 1024:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
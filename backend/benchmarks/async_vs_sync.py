@@ -0,0 +1,70 @@
+"""Drive the same GET /links load against a sync and an async backend.
+
+Each mode runs in its own uvicorn process on a fresh SQLite file; the load
+generator keeps ``--concurrency`` requests in flight for ``--seconds``.
+
+Usage: python -m benchmarks.async_vs_sync [--seconds 10] [--concurrency 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.common import percentile, run_backend, wait_until_ready
+
+
+async def _drive(base_url: str, seconds: float, concurrency: int, links: int) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        await wait_until_ready(client, base_url)
+        for index in range(links):
+            await client.post(f"{base_url}/links", json={"title": f"Link {index}", "url": f"https://example.com/{index}"})
+
+        latencies: List[float] = []
+        errors = 0
+        deadline = time.perf_counter() + seconds
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(f"{base_url}/links")
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    print(
+        f"req/s={len(latencies) / seconds:8.1f} "
+        f"p50={statistics.median(latencies) if latencies else 0:8.2f}ms "
+        f"p99={percentile(latencies, 99):8.2f}ms errors={errors}"
+    )
+
+
+def run_mode(async_mode: bool, port: int, seconds: float, concurrency: int, links: int) -> None:
+    with run_backend(port, {"DATABASE_ASYNC": "true" if async_mode else "false"}) as base_url:
+        print(f"{'async' if async_mode else 'sync':>5}: ", end="", flush=True)
+        asyncio.run(_drive(base_url, seconds, concurrency, links))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--links", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    run_mode(False, args.port, args.seconds, args.concurrency, args.links)
+    run_mode(True, args.port + 1, args.seconds, args.concurrency, args.links)
+
+
+if __name__ == "__main__":
+    main()
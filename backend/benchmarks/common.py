@@ -0,0 +1,52 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def percentile(samples: List[float], value: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(value / 100 * (len(ordered) - 1))))]
+
+
+@contextmanager
+def run_backend(port: int, env: Dict[str, str]) -> Iterator[str]:
+    """Start uvicorn on a throwaway SQLite file and yield its base URL."""
+    with tempfile.TemporaryDirectory() as directory:
+        process_env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(directory) / 'bench.db'}",
+            "APP_AUTH_ENABLED": "false",
+            **env,
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=process_env,
+        )
+        try:
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            process.terminate()
+            process.wait()
+
+
+async def wait_until_ready(client: httpx.AsyncClient, base_url: str) -> None:
+    for _ in range(100):
+        try:
+            if (await client.get(f"{base_url}/healthz")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"{base_url} did not become ready")
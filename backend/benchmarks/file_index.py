@@ -0,0 +1,90 @@
+"""Incremental uploads indexing: first full index, unchanged rescan and a rescan after a few edits.
+
+Builds a tree of ``--files`` small files, indexes it into a throwaway database
+with hashing on a process pool (and, for comparison, in one process), then
+times the rescans that should only stat the tree.
+
+Usage: python -m benchmarks.file_index [--files 100000] [--size-kib 4] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.services import file_indexer
+from app.services import files as file_service
+
+
+def _build_tree(root: Path, files: int, size_kib: int) -> None:
+    rng = random.Random(25)
+    for index in range(files):
+        directory = root / f"album-{index % 100:02d}" / f"{index // 10000:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"photo-{index:06d}.jpg").write_bytes(rng.randbytes(rng.randint(1, size_kib * 2048)))
+
+
+def _index(url: str, root: Path, workers: int) -> file_indexer.IndexReport:
+    engine = create_db_engine(url, Settings(database_url=url))
+    SQLModel.metadata.create_all(engine)
+    # Session is its own context manager; index_files commits the batches itself.
+    factory = lambda: Session(engine)  # noqa: E731
+    report = file_indexer.index_files(root, workers, session_factory=factory, read_session_factory=factory)
+    engine.dispose()
+    return report
+
+
+def _line(label: str, report: file_indexer.IndexReport) -> str:
+    return (
+        f"{label:<22} {report.elapsed_seconds:7.2f}s  {report.files_per_second:9.0f} files/s  "
+        f"hashed {report.hashed}, new {report.created}, changed {report.updated}, removed {report.deleted}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--size-kib", type=int, default=4, help="mean file size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory) / "uploads"
+        started = time.perf_counter()
+        _build_tree(root, args.files, args.size_kib)
+        print(f"tree: {args.files} files, ~{args.size_kib} KiB each, built in {time.perf_counter() - started:.1f}s")
+
+        parallel_url = f"sqlite:///{Path(directory) / 'parallel.db'}"
+        serial_url = f"sqlite:///{Path(directory) / 'serial.db'}"
+        serial = _index(serial_url, root, 1)
+        # Both first passes pay for copying each file into its blob.
+        shutil.rmtree(root / file_service.BLOB_DIRECTORY)
+        first = _index(parallel_url, root, args.workers)
+        unchanged = _index(parallel_url, root, args.workers)
+
+        rng = random.Random(26)
+        edited = rng.sample(sorted(root.rglob("*.jpg")), max(1, args.files // 100))
+        for path in edited:
+            replacement = path.with_name(".edit")
+            replacement.write_bytes(rng.randbytes(128))
+            replacement.replace(path)
+        after_edits = _index(parallel_url, root, args.workers)
+
+    assert first.created == serial.created == args.files
+    assert unchanged.hashed == 0 and after_edits.hashed == len(edited)
+    print(f"hash workers: {min(args.workers, os.cpu_count() or 1)} (capped at the CPU count)")
+    print(_line("first index, pool", first))
+    print(_line("first index, inline", serial))
+    print(_line("unchanged rescan", unchanged))
+    print(_line(f"rescan, {len(edited)} edited", after_edits))
+
+
+if __name__ == "__main__":
+    main()
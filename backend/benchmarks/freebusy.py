@@ -0,0 +1,137 @@
+"""Sweep-line free/busy and conflict detection versus pairwise comparisons on a year of dense calendars.
+
+Usage: python -m benchmarks.freebusy [--assignees 4] [--per-day 6] [--days 365] [--repeat 3]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, List, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.models.event import Event
+from app.schemas.event import EventCreate
+from app.services import events, freebusy
+
+Interval = Tuple[datetime, datetime]
+
+
+def naive_busy(intervals: Sequence[Interval]) -> List[Interval]:
+    """Union by comparing each interval with every merged block so far."""
+    merged: List[Interval] = []
+    for start, end in intervals:
+        touching = [block for block in merged if block[0] <= end and start <= block[1]]
+        for block in touching:
+            merged.remove(block)
+            start, end = min(start, block[0]), max(end, block[1])
+        merged.append((start, end))
+    return sorted(merged)
+
+
+def naive_conflicts(mine: Sequence[Interval], others: Sequence[Tuple[Interval, Any]]) -> List[Any]:
+    return [
+        payload
+        for (start, end), payload in others
+        if start < end and any(own_start < end and start < own_end for own_start, own_end in mine if own_start < own_end)
+    ]
+
+
+def _time(call: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def _seed(session: Session, args: argparse.Namespace, first_day: datetime) -> int:
+    rng = random.Random(19)
+    rows = []
+    for day in range(args.days):
+        for assignee in range(1, args.assignees + 1):
+            for _ in range(args.per_day):
+                start = first_day + timedelta(days=day, minutes=rng.randrange(7 * 60, 21 * 60, 15))
+                rows.append(
+                    {
+                        "title": f"Busy {assignee}",
+                        "start": start,
+                        "end": start + timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120))),
+                        "assignee_id": assignee,
+                    }
+                )
+        if day % 7 == 5:
+            start = first_day + timedelta(days=day, hours=12)
+            rows.append({"title": "Family", "start": start, "end": start + timedelta(hours=2), "assignee_id": None})
+    session.execute(insert(Event), [{"all_day": False, "source": "local", "exdates": [], **row} for row in rows])
+    for assignee in range(1, args.assignees + 1):
+        standup = first_day + timedelta(hours=8, minutes=30)
+        events.create_event(
+            session,
+            EventCreate(
+                title=f"Standup {assignee}",
+                start=standup,
+                end=standup + timedelta(minutes=15),
+                assignee_id=assignee,
+                rrule="FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+            ),
+            creator_fallback=None,
+        )
+    session.commit()
+    return len(rows) + args.assignees
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assignees", type=int, default=4)
+    parser.add_argument("--per-day", type=int, default=6)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    first_day = datetime(2030, 1, 1)
+    last_day = first_day + timedelta(days=args.days)
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        engine = create_db_engine(url, Settings(database_url=url))
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            stored = _seed(session, args, first_day)
+
+        with Session(engine) as session:
+            service_ms, result = _time(lambda: freebusy.free_busy(session, first_day, last_day), args.repeat)
+            items = events.list_events(session, first_day.isoformat(), last_day.isoformat()).items
+        engine.dispose()
+
+    intervals = [freebusy.event_interval(item) for item in items]
+    shuffled = intervals[:]
+    random.Random(7).shuffle(shuffled)
+    naive_busy_ms, naive_merged = _time(lambda: naive_busy(shuffled), 1)
+    sweep_busy_ms, merged = _time(lambda: freebusy.merge_intervals(sorted(shuffled)), args.repeat)
+    assert merged == naive_merged == result.busy
+
+    mine = [interval for interval, item in zip(intervals, items) if item.assignee_id == 1]
+    others = [(interval, index) for index, (interval, item) in enumerate(zip(intervals, items)) if item.assignee_id != 1]
+    naive_conflicts_ms, expected = _time(lambda: naive_conflicts(mine, others), 1)
+    sweep_conflicts_ms, found = _time(lambda: freebusy.overlapping(mine, others), args.repeat)
+    assert sorted(found) == sorted(expected)
+
+    print(f"events: {len(items)} occurrences from {stored} rows ({args.assignees} assignees x {args.days} days)")
+    print(f"free_busy service (query + expansion + sweep) for the year: {service_ms:8.1f}ms, {len(merged)} busy blocks")
+    print(f"busy union  naive={naive_busy_ms:9.1f}ms  sweep={sweep_busy_ms:7.1f}ms  x{naive_busy_ms / sweep_busy_ms:.0f}")
+    print(
+        f"conflicts   naive={naive_conflicts_ms:9.1f}ms  sweep={sweep_conflicts_ms:7.1f}ms  "
+        f"x{naive_conflicts_ms / sweep_conflicts_ms:.0f} ({len(mine)} x {len(others)}, {len(found)} overlapping)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the FTS5 link search with the previous ILIKE scan on a large table.
+
+Usage: python -m benchmarks.link_search [--links 100000] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.models.link import Link
+from app.services import links as link_service
+from benchmarks.common import percentile
+
+WORDS = ["school", "calendar", "garbage", "recipe", "bank", "clinic", "train", "weather", "学校", "病院", "天気予報"]
+QUERIES = ["calendar", "recipe bank", "clin", "天気予報", "example.com/7"]
+
+
+def _ilike_search(session: Session, query: str) -> List[Link]:
+    like_query = f"%{query.lower()}%"
+    statement = (
+        select(Link)
+        .where(Link.title.ilike(like_query) | Link.url.ilike(like_query))
+        .order_by(Link.click_count.desc(), Link.title.asc())
+    )
+    return list(session.exec(statement).all())
+
+
+def _time(call: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        engine = create_db_engine(url, Settings(database_url=url))
+        SQLModel.metadata.create_all(engine)
+        rng = random.Random(7)
+        rows = [
+            {
+                "title": " ".join(rng.sample(WORDS, 3)) + f" {index}",
+                "url": f"https://example.com/{index}",
+                "tags": [rng.choice(WORDS)],
+                "click_count": rng.randint(0, 1000),
+            }
+            for index in range(args.links)
+        ]
+        started = time.perf_counter()
+        with Session(engine) as session:
+            session.execute(insert(Link), rows)
+            session.commit()
+        print(f"seeded {args.links} links (FTS kept in sync by triggers) in {time.perf_counter() - started:.1f}s")
+
+        with Session(engine) as session:
+            for query in QUERIES:
+                ilike = _time(lambda: _ilike_search(session, query), args.repeat)
+                fts = _time(lambda: link_service.search_links(session, query, None), args.repeat)
+                print(
+                    f"{query!r:>18}: ilike p50={statistics.median(ilike):8.2f}ms p99={percentile(ilike, 99):8.2f}ms | "
+                    f"fts p50={statistics.median(fts):7.2f}ms p99={percentile(fts, 99):7.2f}ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
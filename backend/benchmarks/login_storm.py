@@ -0,0 +1,81 @@
+"""GET /links latency before and during a burst of /auth/login calls.
+
+Usage: python -m benchmarks.login_storm [--seconds 10] [--logins 64] [--readers 8]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.common import percentile, run_backend, wait_until_ready
+
+ADMIN_EMAIL = "bench@example.com"
+ADMIN_PASSWORD = "bench-password"
+
+
+async def _read_loop(client: httpx.AsyncClient, base_url: str, deadline: float, latencies: List[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(f"{base_url}/links")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def _login_loop(client: httpx.AsyncClient, base_url: str, deadline: float, outcomes: List[int]) -> None:
+    while time.perf_counter() < deadline:
+        response = await client.post(f"{base_url}/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        outcomes.append(response.status_code)
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    print(
+        f"{label:>12}: /links p50={statistics.median(latencies) if latencies else 0:7.2f}ms "
+        f"p99={percentile(latencies, 99):7.2f}ms n={len(latencies)}"
+    )
+
+
+async def _drive(base_url: str, seconds: float, logins: int, readers: int) -> None:
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=logins + readers)) as client:
+        await wait_until_ready(client, base_url)
+
+        quiet: List[float] = []
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(_read_loop(client, base_url, deadline, quiet) for _ in range(readers)))
+        _report("quiet", quiet)
+
+        storm: List[float] = []
+        outcomes: List[int] = []
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(_read_loop(client, base_url, deadline, storm) for _ in range(readers)),
+            *(_login_loop(client, base_url, deadline, outcomes) for _ in range(logins)),
+        )
+        _report("login storm", storm)
+        print(
+            f"{'logins':>12}: ok/s={outcomes.count(200) / seconds:7.1f} "
+            f"rejected_503={outcomes.count(503)} other={len(outcomes) - outcomes.count(200) - outcomes.count(503)}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login loops")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent GET /links loops")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    env = {
+        "APP_AUTH_ENABLED": "true",
+        "DEFAULT_ADMIN_EMAIL": ADMIN_EMAIL,
+        "DEFAULT_ADMIN_PASSWORD": ADMIN_PASSWORD,
+    }
+    with run_backend(args.port, env) as base_url:
+        asyncio.run(_drive(base_url, args.seconds, args.logins, args.readers))
+
+
+if __name__ == "__main__":
+    main()
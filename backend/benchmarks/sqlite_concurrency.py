@@ -0,0 +1,101 @@
+"""Read latency under concurrent writes for the SQLite engine profiles.
+
+Usage: python -m benchmarks.sqlite_concurrency [--seconds 10] [--readers 8] [--writers 2]
+"""
+
+import argparse
+import datetime as dt
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from sqlmodel import Session, SQLModel
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.models.link import Link
+from app.services import links as link_service
+from benchmarks.common import percentile
+
+PROFILES: Dict[str, Dict[str, object]] = {
+    "baseline": {
+        "sqlite_journal_mode": "delete",
+        "sqlite_synchronous": "full",
+        "sqlite_cache_size": -2000,
+        "sqlite_mmap_size": 0,
+        "sqlite_temp_store": "default",
+    },
+    "tuned": {},
+}
+
+
+def run_profile(name: str, overrides: Dict[str, object], seconds: float, readers: int, writers: int, links: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        config = Settings(database_url=url, database_pool_size=readers + writers, **overrides)
+        engine = create_db_engine(url, config)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            for index in range(links):
+                session.add(Link(title=f"Link {index:05d}", url=f"https://example.com/{index}", tags=["bench"]))
+            session.commit()
+
+        stop = threading.Event()
+        read_latencies: List[float] = []
+        write_count = [0]
+        lock = threading.Lock()
+
+        def reader() -> None:
+            samples: List[float] = []
+            while not stop.is_set():
+                started = time.perf_counter()
+                with Session(engine) as session:
+                    link_service.list_links(session)
+                samples.append((time.perf_counter() - started) * 1000)
+            with lock:
+                read_latencies.extend(samples)
+
+        def writer() -> None:
+            count = 0
+            while not stop.is_set():
+                with Session(engine) as session:
+                    link_service.apply_click_deltas(session, {random.randint(1, links): (1, dt.datetime.utcnow())})
+                count += 1
+            with lock:
+                write_count[0] += count
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    print(
+        f"{name:>8}: reads={len(read_latencies):6d} "
+        f"p50={statistics.median(read_latencies) if read_latencies else 0:7.2f}ms "
+        f"p99={percentile(read_latencies, 99):7.2f}ms "
+        f"writes/s={write_count[0] / seconds:8.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--links", type=int, default=500)
+    args = parser.parse_args()
+    for name, overrides in PROFILES.items():
+        run_profile(name, overrides, args.seconds, args.readers, args.writers, args.links)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Batched repeating-todo catch-up versus spawning one instance at a time through the ORM.
+
+Seeds thousands of repeating todos whose heads fell behind by up to ``--behind-days``
+and times how long it takes to create every instance that has come due.
+
+Usage: python -m benchmarks.todo_catch_up [--series 5000] [--behind-days 14]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, select
+
+from app.core.config import Settings
+from app.db.session import create_db_engine
+from app.models.todo import Todo
+from app.services import todo_recurrence
+
+RULES = ["daily", "weekly", "毎週月・木曜", "3日ごと", "平日", "毎月末", "every 2 weeks", "FREQ=DAILY;INTERVAL=2"]
+
+
+def naive_catch_up(session: Session, now: datetime) -> int:
+    """Walk each series forward one ORM instance at a time, committing per series."""
+    created = 0
+    statement = select(Todo).where(Todo.repeat_rule.is_not(None), Todo.spawned_next.is_(False), Todo.due <= now)
+    for head in session.exec(statement).all():
+        current = head
+        while True:
+            due = todo_recurrence.occurrence_after(current.repeat_rule, current.due)
+            if due is None or due > now:
+                break
+            successor = Todo(
+                title=current.title,
+                due=due,
+                assignee_id=current.assignee_id,
+                repeat_rule=current.repeat_rule,
+                list_id=current.list_id,
+                series_id=current.series_id,
+            )
+            current.spawned_next = True
+            session.add_all([current, successor])
+            session.flush()
+            created += 1
+            current = successor
+        session.commit()
+    return created
+
+
+def _seed(url: str, series: int, behind_days: int, now: datetime) -> None:
+    engine = create_db_engine(url, Settings(database_url=url))
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(20)
+    rows = []
+    for index in range(series):
+        due = now - timedelta(days=rng.uniform(0, behind_days))
+        rule = RULES[index % len(RULES)]
+        rows.append(
+            {
+                "id": index + 1,
+                "series_id": index + 1,
+                "title": f"Chore {index}",
+                "status": "open",
+                "due": due,
+                "repeat_rule": rule,
+                "list_id": "家事",
+                "spawned_next": False,
+                "next_due": todo_recurrence.head_next_due(rule, due),
+            }
+        )
+    # A backlog of ordinary todos that the catch-up query must not read.
+    rows.extend(
+        {"title": f"One-off {index}", "status": "open", "due": now - timedelta(days=rng.uniform(0, 365)), "spawned_next": False}
+        for index in range(series * 4)
+    )
+    with Session(engine) as session:
+        session.execute(insert(Todo), rows)
+        session.commit()
+    engine.dispose()
+
+
+def _run(url: str, call: Callable[[Session], int]) -> List[float]:
+    engine = create_db_engine(url, Settings(database_url=url))
+    with Session(engine) as session:
+        started = time.perf_counter()
+        created = call(session)
+        elapsed = time.perf_counter() - started
+        total = session.exec(select(func.count()).select_from(Todo).where(Todo.series_id.is_not(None))).one()
+    engine.dispose()
+    return [elapsed, created, total]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, default=5000)
+    parser.add_argument("--behind-days", type=int, default=14)
+    args = parser.parse_args()
+
+    now = datetime(2030, 6, 1, 12)
+    with tempfile.TemporaryDirectory() as directory:
+        batched_url = f"sqlite:///{Path(directory) / 'batched.db'}"
+        naive_url = f"sqlite:///{Path(directory) / 'naive.db'}"
+        _seed(batched_url, args.series, args.behind_days, now)
+        _seed(naive_url, args.series, args.behind_days, now)
+
+        batched_seconds, created, batched_total = _run(batched_url, lambda session: todo_recurrence.catch_up(session, now))
+        naive_seconds, naive_created, naive_total = _run(naive_url, lambda session: naive_catch_up(session, now))
+        again_seconds, again, _ = _run(batched_url, lambda session: todo_recurrence.catch_up(session, now))
+
+    assert created == naive_created and batched_total == naive_total, (created, naive_created)
+    assert again == 0
+    print(f"series: {args.series} repeating todos up to {args.behind_days} days behind, {args.series * 4} one-off todos")
+    print(f"batched catch-up: {batched_seconds * 1000:8.1f}ms for {created} instances")
+    print(f"per-series ORM:   {naive_seconds * 1000:8.1f}ms  x{naive_seconds / batched_seconds:.0f}")
+    print(f"second pass (nothing due): {again_seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
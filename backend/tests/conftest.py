@@ -1,10 +1,13 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 from typing import Any, Dict
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import sys
 
@@ -12,13 +15,20 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from app.api.deps import get_session  # noqa: E402
+from app.api import deps  # noqa: E402
+from app.api.deps import Database, get_read_session, get_session  # noqa: E402
 from app.main import app  # noqa: E402
 
 
+@pytest.fixture(scope="session", params=["sync", "async"])
+def database_mode(request: pytest.FixtureRequest) -> str:
+    """Runs the suite once per ``DATABASE_ASYNC`` mode, each on its own database."""
+    return request.param
+
+
 @pytest.fixture(scope="session")
-def engine(tmp_path_factory: pytest.TempPathFactory):
-    db_path = tmp_path_factory.mktemp("data") / "test.db"
+def engine(database_mode: str, tmp_path_factory: pytest.TempPathFactory):
+    db_path = tmp_path_factory.mktemp(f"data-{database_mode}") / "test.db"
     engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
     SQLModel.metadata.create_all(engine)
     return engine
@@ -30,12 +40,36 @@ def session(engine) -> Generator[Session, None, None]:
         yield session
 
 
+@pytest.fixture(scope="session")
+def async_engine(engine):
+    # NullPool: each TestClient runs its own event loop, so connections must not outlive a request.
+    return create_async_engine(str(engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1), poolclass=NullPool)
+
+
 @pytest.fixture()
-def client(session: Session) -> Generator[TestClient, None, None]:
+def client(database_mode: str, session: Session, async_engine) -> Generator[TestClient, None, None]:
+    """The app on the test database; ``get_db``/``get_read_db`` follow ``database_mode``, not the environment."""
+
     def get_session_override() -> Generator[Session, None, None]:
         yield session
 
+    async def get_async_db_override() -> AsyncGenerator[Database, None]:
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield Database(async_session)
+            await async_session.commit()
+
+    async def get_async_read_db_override() -> AsyncGenerator[Database, None]:
+        async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as async_session:
+            yield Database(async_session, release_after_run=True)
+
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    if database_mode == "async":
+        app.dependency_overrides[deps.get_db] = get_async_db_override
+        app.dependency_overrides[deps.get_read_db] = get_async_read_db_override
+    else:
+        app.dependency_overrides[deps.get_db] = deps._get_sync_db
+        app.dependency_overrides[deps.get_read_db] = deps._get_sync_read_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,160 @@
+import io
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models.asset_import_job import AssetImportJob, ImportJobStatus
+from app.services import asset_imports as import_service
+from app.services import assets as asset_service
+
+CSV_HEADER = "date,account_name,balance,currency\n"
+
+
+@pytest.fixture()
+def import_worker_on_test_db(engine, tmp_path, monkeypatch):
+    @contextmanager
+    def test_session_scope():
+        with Session(engine) as session:
+            yield session
+            session.commit()
+
+    monkeypatch.setattr(settings, "asset_import_directory", tmp_path)
+    monkeypatch.setattr(import_service.import_worker, "session_factory", test_session_scope)
+
+
+def _wait_for_job(client, job_id):
+    for _ in range(100):
+        job = client.get(f"/assets/import/{job_id}").json()
+        if job["status"] in {"succeeded", "failed"}:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"import job {job_id} did not finish: {job}")
+
+
+def test_import_runs_in_background_job(client, monkeypatch, import_worker_on_test_db, tmp_path):
+    monkeypatch.setattr(asset_service, "IMPORT_CHUNK_SIZE", 2)
+    csv_body = "\ufeff" + CSV_HEADER
+    csv_body += "2023-01-31,Savings,1000,JPY\n"
+    csv_body += "2023-01-31,Brokerage,250.5,USD\n"
+    csv_body += "not-a-date,Savings,1,JPY\n"
+    csv_body += "2023-02-28,Savings,1200,JPY\n"
+    csv_body += "2023-02-28,Wallet,oops,JPY\n"
+
+    response = client.post(
+        "/assets/import",
+        files={"file": ("export.csv", csv_body.encode("utf-8"), "text/csv")},
+        headers={"Authorization": "Bearer test-token"},
+    )
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+
+    job = _wait_for_job(client, response.json()["id"])
+    assert job["status"] == "succeeded"
+    assert job["rows_processed"] == 5
+    assert job["imported"] == 3
+    assert job["failed_count"] == 2
+    assert [error["line_number"] for error in job["failed"]] == [4, 6]
+    assert job["rows_per_second"] > 0
+    assert list(tmp_path.iterdir()) == []
+
+    summary = client.get("/assets/summary", params={"from_month": "2023-01", "to_month": "2023-02"}).json()
+    assert summary["items"] == [
+        {"month": "2023-01", "totals": {"JPY": 1000.0, "USD": 250.5}},
+        {"month": "2023-02", "totals": {"JPY": 1200.0}},
+    ]
+    assert client.get("/assets/import/999999").status_code == 404
+
+
+def test_interrupted_job_resumes_after_committed_rows(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_service, "IMPORT_CHUNK_SIZE", 1)
+    path = tmp_path / "resume.csv"
+    path.write_text(CSV_HEADER + "".join(f"1999-0{month}-01,Resume,{month},CHF\n" for month in range(1, 5)))
+    job = AssetImportJob(file_path=str(path), filename="resume.csv")
+    session.add(job)
+    session.commit()
+
+    stop_after_first_chunk = iter([True])
+    interrupted = import_service.run_import_job(session, job.id, lambda: next(stop_after_first_chunk, False))
+    assert interrupted.status == ImportJobStatus.running
+    assert interrupted.rows_processed == 1
+
+    resumed = import_service.run_import_job(session, job.id)
+    assert resumed.status == ImportJobStatus.succeeded
+    assert (resumed.rows_processed, resumed.imported) == (4, 4)
+    summary = asset_service.summarize_assets(session, "1999-01", "1999-04")
+    assert [item.totals for item in summary.items] == [{"CHF": 1.0}, {"CHF": 2.0}, {"CHF": 3.0}, {"CHF": 4.0}]
+
+
+def test_reimport_upserts_on_date_account_currency(session):
+    first = CSV_HEADER + "1998-01-31,Upsert,10,EUR\n1998-02-28,Upsert,20,EUR\n"
+    overlapping = CSV_HEADER + "1998-02-28,Upsert,20,EUR\n1998-02-28,Upsert,25,USD\n1998-03-31,Upsert,30,EUR\n"
+    corrected = CSV_HEADER + "1998-01-31,Upsert,15,EUR\n"
+
+    result = asset_service.import_asset_csv(session, io.BytesIO(first.encode()))
+    assert (result.inserted, result.updated, result.unchanged) == (2, 0, 0)
+    result = asset_service.import_asset_csv(session, io.BytesIO(first.encode()))
+    assert (result.inserted, result.updated, result.unchanged) == (0, 0, 2)
+    result = asset_service.import_asset_csv(session, io.BytesIO(overlapping.encode()))
+    assert (result.inserted, result.updated, result.unchanged) == (2, 0, 1)
+    result = asset_service.import_asset_csv(session, io.BytesIO(corrected.encode()))
+    assert (result.inserted, result.updated, result.unchanged) == (0, 1, 0)
+
+    summary = asset_service.summarize_assets(session, "1998-01", "1998-03")
+    assert [item.totals for item in summary.items] == [{"EUR": 15.0}, {"EUR": 20.0, "USD": 25.0}, {"EUR": 30.0}]
+
+
+def test_monthly_rollup_tracks_imports_and_matches_raw_rows(client, session):
+    csv_body = CSV_HEADER + "1997-05-01,Rollup,100,GBP\n1997-05-20,Rollup,50,GBP\n1997-06-01,Rollup,70,GBP\n"
+    asset_service.import_asset_csv(session, io.BytesIO(csv_body.encode()))
+    asset_service.import_asset_csv(session, io.BytesIO((CSV_HEADER + "1997-05-20,Rollup,80,GBP\n").encode()))
+
+    summary = asset_service.summarize_assets(session, "1997-5", "1997-06")
+    assert [(item.month, item.totals) for item in summary.items] == [("1997-05", {"GBP": 180.0}), ("1997-06", {"GBP": 70.0})]
+    assert asset_service.aggregate_monthly_totals(session, "1997-05", "1997-06") == {
+        ("1997-05", "GBP"): (180.0, 2),
+        ("1997-06", "GBP"): (70.0, 1),
+    }
+
+    check = client.get("/assets/summary/check", headers={"Authorization": "Bearer test-token"}).json()
+    assert check["consistent"] is True
+
+    session.execute(text("UPDATE asset_monthly_rollup SET total = total + 1 WHERE month = '1997-06'"))
+    session.commit()
+    check = asset_service.check_monthly_rollup(session, "1997-01", "1997-12")
+    assert [(item.month, item.rollup_total, item.actual_total) for item in check.mismatches] == [("1997-06", 71.0, 70.0)]
+    assert asset_service.rebuild_monthly_rollup(session, "1997-06", "1997-06").consistent
+
+
+def test_series_and_latest_balances(client, session):
+    csv_body = CSV_HEADER + "".join(
+        [
+            "1996-01-10,Series A,100,SEK\n",
+            "1996-01-31,Series A,110,SEK\n",
+            "1996-02-29,Series A,130,SEK\n",
+            "1996-04-30,Series A,100,SEK\n",
+            "1996-02-29,Series B,5,SEK\n",
+            "1996-03-31,Series B,7,NOK\n",
+        ]
+    )
+    asset_service.import_asset_csv(session, io.BytesIO(csv_body.encode()))
+
+    response = client.get("/assets/series", params={"currency": "SEK", "from_month": "1996-01", "to_month": "1996-12", "window": 2})
+    assert response.status_code == 200
+    series = {item["account_name"]: item["points"] for item in response.json()["series"]}
+    assert series["Series A"] == [
+        {"month": "1996-01", "balance": 110.0, "delta": None, "rolling_average": 110.0},
+        {"month": "1996-02", "balance": 130.0, "delta": 20.0, "rolling_average": 120.0},
+        {"month": "1996-04", "balance": 100.0, "delta": -30.0, "rolling_average": 115.0},
+    ]
+    assert series["Series B"] == [{"month": "1996-02", "balance": 5.0, "delta": None, "rolling_average": 5.0}]
+
+    latest = client.get("/assets/latest", params={"currency": "SEK"}).json()
+    assert {(item["account_name"], item["date"], item["balance"]) for item in latest["items"]} == {
+        ("Series A", "1996-04-30", 100.0),
+        ("Series B", "1996-02-29", 5.0),
+    }
+    assert latest["totals"] == {"SEK": 105.0}
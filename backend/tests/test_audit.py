@@ -0,0 +1,153 @@
+import asyncio
+from datetime import datetime
+
+from sqlmodel import Session, select
+
+from app.models.audit_log import AuditLog
+from app.models.contact import Contact
+from app.schemas.event import EventCreate, EventOccurrenceUpdate
+from app.services import audit, audit_archive
+from app.services import events as event_service
+
+
+def _audit_rows(session, entity, entity_id):
+    statement = select(AuditLog).where(AuditLog.entity == entity, AuditLog.entity_id == str(entity_id))
+    return session.exec(statement.order_by(AuditLog.id)).all()
+
+
+def test_committed_changes_are_audited_as_compact_diffs(client, session, engine, monkeypatch):
+    def flush_into_test_database():
+        with Session(engine) as writer_session:
+            return audit.audit_queue.flush(writer_session)
+
+    monkeypatch.setattr(audit.audit_writer, "callback", flush_into_test_database)
+    headers = {"Authorization": "Bearer test-token"}
+    contact = client.post("/contacts", json={"name": "Audited clinic", "category": "health"}, headers=headers).json()
+    client.patch(f"/contacts/{contact['id']}", json={"phone": "03-0000-0000", "name": "Audited clinic"}, headers=headers)
+    client.delete(f"/contacts/{contact['id']}", headers=headers)
+    todo = client.post("/todos", json={"title": "Audited chore", "repeat_rule": "daily"}, headers=headers).json()
+    client.delete(f"/todos/{todo['id']}", headers=headers)
+
+    # A rolled-back change never reaches the log.
+    session.add(Contact(name="Rolled back", category="health"))
+    session.flush()
+    session.rollback()
+    audit.audit_queue.flush(session)
+
+    rows = _audit_rows(session, "contact", contact["id"])
+    assert [row.action for row in rows] == ["create", "update", "delete"]
+    assert rows[0].user_id is not None
+    assert rows[0].diff_json == {"id": contact["id"], "name": "Audited clinic", "category": "health"}
+    assert rows[1].diff_json == {"phone": [None, "03-0000-0000"]}
+    assert rows[2].diff_json["phone"] == "03-0000-0000"
+    # The follow-up write that sets series_id is folded into the create entry of the same transaction.
+    todo_rows = _audit_rows(session, "todo", todo["id"])
+    assert [row.action for row in todo_rows] == ["create", "delete"]
+    assert todo_rows[0].diff_json["series_id"] == todo["id"]
+    assert not session.exec(select(AuditLog).where(AuditLog.diff_json["name"].as_string() == "Rolled back")).all()
+
+
+def test_audit_queue_applies_backpressure_and_drops_when_full(session):
+    woken = []
+    bounded = audit.AuditQueue(max_entries=2, flush_threshold=2, enqueue_timeout=0.01)
+    at = datetime(2030, 1, 1)
+    entries = [
+        {"user_id": None, "action": "create", "entity": "note", "entity_id": str(index), "diff_json": {}, "at": at}
+        for index in range(3)
+    ]
+
+    bounded.put(entries, on_full=lambda: woken.append(True))
+    assert bounded.dropped == 1 and woken == [True]
+    assert bounded.should_flush()
+    assert bounded.flush(session) == 2
+    assert len(bounded) == 0
+    assert [row.entity_id for row in _audit_rows(session, "note", 0)] == ["0"]
+
+
+def test_full_queue_is_drained_on_the_event_loop_instead_of_dropping():
+    bounded = audit.AuditQueue(max_entries=1, flush_threshold=1, enqueue_timeout=60)
+    at = datetime(2030, 1, 1)
+    entries = [
+        {"user_id": None, "action": "create", "entity": "note", "entity_id": str(index), "diff_json": {}, "at": at}
+        for index in range(3)
+    ]
+    drained = []
+
+    async def commit_on_the_loop():
+        # As an async session's commit does: the writer cannot be woken while this blocks.
+        bounded.put(entries, on_full=lambda: None, drain=lambda: drained.extend(bounded._take(10)))
+
+    asyncio.run(commit_on_the_loop())
+    assert bounded.dropped == 0
+    assert [entry["entity_id"] for entry in [*drained, *bounded._take(10)]] == ["0", "1", "2"]
+
+
+def test_deleting_a_series_audits_its_overrides(session):
+    payload = EventCreate(
+        title="Audited series", start=datetime(2037, 1, 5, 9), end=datetime(2037, 1, 5, 10), rrule="FREQ=WEEKLY"
+    )
+    series = event_service.create_event(session, payload, None)
+    override = event_service.update_occurrence(
+        session, series.id, datetime(2037, 1, 12, 9), EventOccurrenceUpdate(title="Moved")
+    )
+    override_id = override.id
+    event_service.delete_event(session, series.id)
+    audit.audit_queue.flush(session)
+
+    rows = _audit_rows(session, "event", override_id)
+    assert [row.action for row in rows] == ["create", "delete"]
+    assert rows[1].diff_json["title"] == "Moved" and rows[1].diff_json["recurrence_id"] == series.id
+
+
+def test_retention_archives_old_entries_and_queries_span_archives(session, tmp_path):
+    def entry(entity_id, at, action="update"):
+        return AuditLog(action=action, entity="archived", entity_id=entity_id, diff_json={"at": at.isoformat()}, at=at)
+
+    old = [entry("1", datetime(2001, 1, 5), "create"), entry("1", datetime(2001, 2, 1)), entry("2", datetime(2001, 2, 3))]
+    session.add_all([*old, entry("1", datetime(2031, 1, 1))])
+    session.commit()
+
+    assert audit_archive.archive_audit_log(session, datetime(2002, 1, 1), tmp_path, chunk_size=2) == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["audit-2001-01.jsonl.gz", "audit-2001-02.jsonl.gz"]
+    assert len(_audit_rows(session, "archived", 1)) == 1
+
+    history = audit_archive.query_audit(session, "archived", "1", directory=tmp_path)
+    assert [(entry.action, entry.at.year) for entry in history] == [("update", 2031), ("update", 2001), ("create", 2001)]
+    assert [entry.entity_id for entry in audit_archive.query_audit(session, "archived", limit=2, directory=tmp_path)] == [
+        "1",
+        "2",
+    ]
+    older = audit_archive.query_audit(session, "archived", until=datetime(2001, 2, 2), directory=tmp_path)
+    assert [entry.at.day for entry in older] == [1, 5]
+
+
+def test_committed_entries_are_queued_after_the_connection_is_released(engine, monkeypatch):
+    checked_out = []
+    monkeypatch.setattr(audit.audit_queue, "put", lambda entries, **callbacks: checked_out.append(engine.pool.checkedout()))
+    with Session(engine) as writer_session:
+        before = engine.pool.checkedout()
+        contact = Contact(name="Queued after release", category="health")
+        writer_session.add(contact)
+        writer_session.commit()
+        writer_session.delete(contact)
+        writer_session.commit()
+    # A full queue may block the committing thread, but never while it holds its connection.
+    assert checked_out == [before, before]
+
+
+def test_paging_back_keeps_entries_that_share_a_timestamp(session, tmp_path):
+    def add(count):
+        session.add_all(AuditLog(action="import", entity="tied", entity_id="chunk", diff_json={}, at=at) for _ in range(count))
+        session.commit()
+
+    at = datetime(2002, 3, 4, 5, 6, 7)
+    add(2)
+    audit_archive.archive_audit_log(session, datetime(2003, 1, 1), tmp_path)
+    add(2)
+
+    ids, until, before_id = [], None, None
+    while page := audit_archive.query_audit(session, "tied", limit=1, until=until, before_id=before_id, directory=tmp_path):
+        ids.append(page[-1].id)
+        until, before_id = page[-1].at, page[-1].id
+    # Two pages from the table, then two from the archive, all with the same at.
+    assert len(ids) == 4 and ids == sorted(ids, reverse=True)
@@ -0,0 +1,38 @@
+from app.core.config import settings
+from app.core.security import get_password_hash, password_hasher
+from app.models.user import User
+
+
+def test_login_verifies_password_off_thread(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "app_auth_enabled", True)
+    session.add(User(name="Parent", role="admin", email="parent@example.com", password_hash=get_password_hash("secret")))
+    session.commit()
+    submitted = []
+    executor = password_hasher._get_executor()
+
+    class SpyExecutor:
+        def submit(self, fn, *args):
+            submitted.append(fn.__name__)
+            return executor.submit(fn, *args)
+
+    monkeypatch.setattr(password_hasher, "_get_executor", SpyExecutor)
+
+    response = client.post("/auth/login", json={"email": "parent@example.com", "password": "secret"})
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    response = client.post("/auth/login", json={"email": "parent@example.com", "password": "wrong"})
+    assert response.status_code == 401
+    # Both checks ran on the hashing pool, not on the request thread.
+    assert submitted == ["verify_password", "verify_password"]
+
+
+def test_login_returns_503_when_hash_queue_is_full(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "app_auth_enabled", True)
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    session.add(User(name="Guest", role="user", email="guest@example.com", password_hash=get_password_hash("secret")))
+    session.commit()
+
+    response = client.post("/auth/login", json={"email": "guest@example.com", "password": "secret"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
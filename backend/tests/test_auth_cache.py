@@ -0,0 +1,47 @@
+from sqlalchemy import event
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services import users as user_service
+
+
+def test_warm_token_skips_database_and_signature_check(client, session, engine, monkeypatch):
+    monkeypatch.setattr(settings, "app_auth_enabled", True)
+    session.add(User(name="Cached", role="user", email="cached@example.com"))
+    session.commit()
+    user_service.invalidate_cached_user()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'cached@example.com'})}"}
+
+    assert client.get("/me", headers=headers).json()["name"] == "Cached"
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("signature re-verified for a memoized token")
+
+    monkeypatch.setattr(security.jwt, "decode", fail_decode)
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get("/me", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_user_changes_invalidate_cache(session):
+    user = User(name="Before", role="user", email="rename@example.com")
+    session.add(user)
+    session.commit()
+    assert user_service.load_user_for_auth(session, "rename@example.com").name == "Before"
+
+    user.name = "After"
+    session.add(user)
+    session.commit()
+    assert user_service.get_cached_user("rename@example.com") is None
+    assert user_service.load_user_for_auth(session, "rename@example.com").name == "After"
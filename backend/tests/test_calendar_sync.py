@@ -0,0 +1,311 @@
+import json
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.calendar_source import CalendarKind, CalendarSource
+from app.models.event import Event
+from app.services import calendar_sync, google_calendar
+
+COLLECTION = "/dav/family/"
+
+
+class StandInCalendars:
+    """In-memory CalDAV collection and Google events.list backing the stand-in server."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.resources: Dict[str, Tuple[str, str]] = {}
+        self.dav_log: List[Tuple[int, str]] = []
+        self.reject_sync_tokens = False
+        self.google_items: Dict[str, dict] = {}
+        self.google_log: List[Tuple[int, str]] = []
+        self.google_page_size = 2
+        self.requests: List[Tuple[str, str, str]] = []
+
+    def put(self, name: str, ics: str) -> None:
+        self.version += 1
+        self.resources[COLLECTION + name] = (f'"{self.version}"', ics)
+        self.dav_log.append((self.version, COLLECTION + name))
+
+    def delete(self, name: str) -> None:
+        self.version += 1
+        self.resources.pop(COLLECTION + name)
+        self.dav_log.append((self.version, COLLECTION + name))
+
+    def put_google(self, item: dict) -> None:
+        self.version += 1
+        self.google_items[item["id"]] = {**item, "etag": f'"g{self.version}"'}
+        self.google_log.append((self.version, item["id"]))
+
+
+def _multistatus(responses: List[str], extra: str = "") -> bytes:
+    body = '<?xml version="1.0"?><d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav" '
+    body += 'xmlns:cs="http://calendarserver.org/ns/">' + "".join(responses) + extra + "</d:multistatus>"
+    return body.encode()
+
+
+def _ok(href: str, props: str) -> str:
+    return f"<d:response><d:href>{href}</d:href><d:propstat><d:prop>{props}</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+
+
+def make_handler(state: StandInCalendars):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _body(self) -> str:
+            return self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+
+        def _send(self, status: int, body: bytes, content_type: str = "application/xml") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_PROPFIND(self):
+            body = self._body()
+            depth = self.headers.get("Depth")
+            state.requests.append(("PROPFIND", depth, body))
+            if depth == "0":
+                props = f"<cs:getctag>{state.version}</cs:getctag><d:sync-token>token-{state.version}</d:sync-token>"
+                return self._send(207, _multistatus([_ok(COLLECTION, props)]))
+            responses = [_ok(COLLECTION, "<d:resourcetype><d:collection/></d:resourcetype>")]
+            responses += [_ok(href, f"<d:getetag>{etag}</d:getetag>") for href, (etag, _) in state.resources.items()]
+            self._send(207, _multistatus(responses))
+
+        def do_REPORT(self):
+            body = self._body()
+            if "sync-collection" in body:
+                state.requests.append(("REPORT", "sync-collection", body))
+                if state.reject_sync_tokens:
+                    return self._send(403, b"")
+                since = int(re.search(r"token-(\d+)", body).group(1))
+                responses = []
+                for href in dict.fromkeys(href for version, href in state.dav_log if version > since):
+                    if href in state.resources:
+                        responses.append(_ok(href, f"<d:getetag>{state.resources[href][0]}</d:getetag>"))
+                    else:
+                        responses.append(f"<d:response><d:href>{href}</d:href><d:status>HTTP/1.1 404 Not Found</d:status></d:response>")
+                return self._send(207, _multistatus(responses, f"<d:sync-token>token-{state.version}</d:sync-token>"))
+            hrefs = re.findall(r"<d:href>(.*?)</d:href>", body)
+            state.requests.append(("REPORT", "multiget", ",".join(hrefs)))
+            responses = [
+                _ok(href, f"<d:getetag>{state.resources[href][0]}</d:getetag><c:calendar-data>{state.resources[href][1]}</c:calendar-data>")
+                for href in hrefs
+                if href in state.resources
+            ]
+            self._send(207, _multistatus(responses))
+
+        def do_POST(self):
+            body = self._body()
+            state.requests.append(("POST", self.path, body))
+            assert "assertion=" in body
+            self._send(200, json.dumps({"access_token": "stand-in", "expires_in": 3600}).encode(), "application/json")
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            state.requests.append(("GET", unquote(url.path), json.dumps(params)))
+            assert self.headers["Authorization"] == "Bearer stand-in"
+            token = params.get("syncToken")
+            if token is not None and (token == "expired" or not token.startswith("g")):
+                return self._send(410, b"{}", "application/json")
+            since = int(token[1:]) if token else 0
+            changed = list(dict.fromkeys(item_id for version, item_id in state.google_log if version > since))
+            items = [state.google_items[item_id] for item_id in changed]
+            if token is None:
+                items = [item for item in items if item.get("status") != "cancelled" or item.get("recurringEventId")]
+            offset = int(params.get("pageToken", 0))
+            page = items[offset : offset + state.google_page_size]
+            payload = {"items": page}
+            if offset + state.google_page_size < len(items):
+                payload["nextPageToken"] = str(offset + state.google_page_size)
+            else:
+                payload["nextSyncToken"] = f"g{state.version}"
+            self._send(200, json.dumps(payload).encode(), "application/json")
+
+    return Handler
+
+
+@pytest.fixture()
+def stand_in():
+    state = StandInCalendars()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def sync(engine, stand_in):
+    @contextmanager
+    def test_session_scope():
+        with Session(engine) as session:
+            yield session
+            session.commit()
+
+    with httpx.Client(timeout=5) as client:
+        yield lambda source_id: calendar_sync.sync_calendars([source_id], test_session_scope, client)[0]
+
+
+def _add_source(session: Session, **values) -> CalendarSource:
+    source = CalendarSource(**values)
+    session.add(source)
+    session.commit()
+    session.refresh(source)
+    return source
+
+
+def _events(session: Session, calendar_id: int) -> Dict[str, Event]:
+    session.expire_all()
+    rows = session.exec(select(Event).where(Event.calendar_id == calendar_id)).all()
+    return {row.external_id: row for row in rows}
+
+
+SINGLE = "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:a\r\nSUMMARY:{title}\r\nDTSTART:20320105T090000\r\nDTEND:20320105T100000\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+WEEKLY = (
+    "BEGIN:VCALENDAR\r\n"
+    "BEGIN:VEVENT\r\nUID:b\r\nSUMMARY:Piano\\, weekly\r\nDTSTART:20320106T170000\r\nDURATION:PT45M\r\n"
+    "RRULE:FREQ=WEEKLY;COUNT=4\r\nEXDATE:20320113T170000\r\n"
+    "BEGIN:VALARM\r\nACTION:DISPLAY\r\nTRIGGER:-PT10M\r\nEND:VALARM\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:b\r\nRECURRENCE-ID:20320120T170000\r\nSUMMARY:Piano recital\r\n"
+    "DTSTART:20320120T180000\r\nDTEND:20320120T190000\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:b\r\nRECURRENCE-ID:20320127T170000\r\nSTATUS:CANCELLED\r\n"
+    "DTSTART:20320127T170000\r\nEND:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def test_caldav_sync_is_incremental(session, stand_in, sync):
+    stand_in.put("a.ics", SINGLE.format(title="Dentist"))
+    stand_in.put("b.ics", WEEKLY)
+    source = _add_source(session, kind=CalendarKind.caldav, name="Family", url=stand_in.base_url + COLLECTION)
+
+    first = sync(source.id)
+    assert (first.fetched, first.changed, first.skipped, first.deleted, first.error) == (2, 4, 0, 0, None)
+    events = _events(session, source.id)
+    master = events[COLLECTION + "b.ics"]
+    assert master.title == "Piano, weekly"
+    assert master.end == datetime(2032, 1, 6, 17, 45)
+    assert master.rrule == "FREQ=WEEKLY;COUNT=4"
+    assert master.exdates == ["2032-01-13T17:00:00", "2032-01-27T17:00:00"]
+    override = events[f"{COLLECTION}b.ics#2032-01-20T17:00:00"]
+    assert (override.recurrence_id, override.title, override.source) == (master.id, "Piano recital", "caldav")
+
+    stand_in.requests.clear()
+    unchanged = sync(source.id)
+    assert (unchanged.fetched, unchanged.changed, unchanged.skipped) == (0, 0, 2)
+    assert [request[0] for request in stand_in.requests] == ["PROPFIND"]
+
+    stand_in.put("a.ics", SINGLE.format(title="Dentist (moved)"))
+    stand_in.delete("b.ics")
+    stand_in.put("c.ics", SINGLE.replace("UID:a", "UID:c").format(title="Swim"))
+    stand_in.requests.clear()
+    delta = sync(source.id)
+    assert (delta.fetched, delta.changed, delta.deleted) == (2, 2, 2)
+    assert ("REPORT", "multiget", f"{COLLECTION}a.ics,{COLLECTION}c.ics") in stand_in.requests
+    assert not any(request[:2] == ("PROPFIND", "1") for request in stand_in.requests)
+    assert {key: row.title for key, row in _events(session, source.id).items()} == {
+        COLLECTION + "a.ics": "Dentist (moved)",
+        COLLECTION + "c.ics": "Swim",
+    }
+
+    # A server that forgot the token falls back to an ETag listing and still fetches only what changed.
+    stand_in.reject_sync_tokens = True
+    stand_in.put("c.ics", SINGLE.replace("UID:a", "UID:c").format(title="Swim lesson"))
+    stand_in.requests.clear()
+    fallback = sync(source.id)
+    assert (fallback.fetched, fallback.changed, fallback.skipped) == (1, 1, 1)
+    assert ("REPORT", "multiget", f"{COLLECTION}c.ics") in stand_in.requests
+
+    stored = session.get(CalendarSource, source.id)
+    session.refresh(stored)
+    assert (stored.last_fetched, stored.last_changed, stored.last_skipped, stored.last_error) == (1, 1, 1, None)
+
+
+@pytest.fixture()
+def google_auth(stand_in, monkeypatch):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    credentials = {
+        "client_email": "sync@example.iam.gserviceaccount.com",
+        "private_key": pem.decode(),
+        "token_uri": stand_in.base_url + "/token",
+    }
+    monkeypatch.setattr(google_calendar, "_auth", google_calendar.ServiceAccountAuth(credentials))
+    monkeypatch.setattr(settings, "google_calendar_api_url", stand_in.base_url + "/google")
+
+
+def test_google_sync_uses_sync_tokens_and_etags(session, stand_in, sync, google_auth):
+    stand_in.put_google(
+        {"id": "g1", "summary": "School trip", "start": {"date": "2032-02-01"}, "end": {"date": "2032-02-02"}}
+    )
+    stand_in.put_google(
+        {
+            "id": "g2",
+            "summary": "Yoga",
+            "start": {"dateTime": "2032-02-02T07:00:00"},
+            "end": {"dateTime": "2032-02-02T08:00:00"},
+            "recurrence": ["RRULE:FREQ=DAILY;COUNT=5"],
+        }
+    )
+    stand_in.put_google(
+        {
+            "id": "g2_20320203",
+            "status": "cancelled",
+            "recurringEventId": "g2",
+            "originalStartTime": {"dateTime": "2032-02-03T07:00:00"},
+        }
+    )
+    source = _add_source(session, kind=CalendarKind.google, name="Google", url="family@example.com")
+
+    first = sync(source.id)
+    assert (first.fetched, first.changed, first.error) == (3, 3, None)
+    events = _events(session, source.id)
+    assert events["g1"].all_day is True
+    assert events["g2"].exdates == ["2032-02-03T07:00:00"]
+    assert sum(1 for request in stand_in.requests if request[0] == "GET") == 2
+
+    stand_in.put_google(
+        {
+            "id": "g2_20320204",
+            "summary": "Yoga (outdoors)",
+            "recurringEventId": "g2",
+            "originalStartTime": {"dateTime": "2032-02-04T07:00:00"},
+            "start": {"dateTime": "2032-02-04T07:30:00"},
+            "end": {"dateTime": "2032-02-04T08:30:00"},
+        }
+    )
+    stand_in.requests.clear()
+    delta = sync(source.id)
+    assert (delta.fetched, delta.changed, delta.skipped) == (1, 1, 0)
+    assert json.loads(stand_in.requests[-1][2])["syncToken"].startswith("g")
+    events = _events(session, source.id)
+    assert events["g2_20320204"].recurrence_id == events["g2"].id
+    assert events["g2"].exdates == ["2032-02-03T07:00:00"]
+
+    # An expired token triggers a full listing; matching ETags mean nothing is rewritten.
+    stored = session.get(CalendarSource, source.id)
+    stored.sync_token = "expired"
+    session.add(stored)
+    session.commit()
+    resync = sync(source.id)
+    assert (resync.fetched, resync.changed, resync.skipped, resync.deleted) == (4, 0, 3, 0)
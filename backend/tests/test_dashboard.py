@@ -0,0 +1,71 @@
+from sqlalchemy import update
+
+from datetime import date
+
+from app.models.asset_monthly_rollup import AssetMonthlyRollup
+from app.models.link import Link
+from app.services import dashboard as dashboard_service
+
+
+def test_dashboard_gathers_every_section_and_caches_it(client, session):
+    dashboard_service.invalidate_dashboard()
+    headers = {"Authorization": "Bearer test-token"}
+    link = client.post("/links", json={"title": "Dashboard top", "url": "https://top.example.com"}, headers=headers).json()
+    events = [
+        client.post("/events", json=payload, headers=headers).json()
+        for payload in [
+            {"title": "Yesterday", "start": "2036-05-09T00:00:00", "end": "2036-05-10T00:00:00", "all_day": True},
+            {"title": "Dentist", "start": "2036-05-10T15:00:00", "end": "2036-05-10T16:00:00"},
+            {"title": "Tomorrow", "start": "2036-05-11T00:00:00", "end": "2036-05-11T00:00:00", "all_day": True},
+        ]
+    ]
+    todo = client.post("/todos", json={"title": "Overdue", "due": "1999-01-01T09:00:00"}, headers=headers).json()
+    session.get(Link, link["id"]).click_count = 1_000_000
+    rollup = AssetMonthlyRollup(month="2099-12", currency="JPY", total=1500.0, snapshot_count=2)
+    session.add(rollup)
+    session.commit()
+
+    params = {"day": "2036-05-10", "links": 1, "todos": 1, "months": 1}
+    try:
+        dashboard = client.get("/dashboard", params=params).json()
+        assert dashboard["day"] == "2036-05-10"
+        assert [item["title"] for item in dashboard["links"]] == ["Dashboard top"]
+        assert [item["title"] for item in dashboard["events"]] == ["Dentist"]
+        assert [item["title"] for item in dashboard["todos"]] == ["Overdue"]
+        assert dashboard["assets"] == [{"month": "2099-12", "totals": {"JPY": 1500.0}}]
+
+        # Served from the cache until it expires or a change to one of its sections commits.
+        # A Core update (like the click flusher's) leaves no audit entry, so the cached page stays.
+        session.execute(update(Link).where(Link.id == link["id"]).values(click_count=0))
+        session.commit()
+        assert client.get("/dashboard", params=params).json() == dashboard
+        client.patch(f"/todos/{todo['id']}", json={"status": "done"}, headers=headers)
+        assert "Overdue" not in [item["title"] for item in client.get("/dashboard", params=params).json()["todos"]]
+    finally:
+        client.delete(f"/links/{link['id']}", headers=headers)
+        for event in events:
+            client.delete(f"/events/{event['id']}", headers=headers)
+        client.delete(f"/todos/{todo['id']}", headers=headers)
+        session.delete(rollup)
+        session.commit()
+        dashboard_service.invalidate_dashboard()
+
+
+def test_load_interrupted_by_an_invalidation_is_not_cached(session, monkeypatch):
+    dashboard_service.invalidate_dashboard()
+    key = (date(2036, 5, 10), 1, 1, 1, 1)
+    recent_months = dashboard_service._recent_months
+
+    def commit_meanwhile(*args):
+        # A section changes after the load has read part of the page.
+        dashboard_service.invalidate_dashboard()
+        return recent_months(*args)
+
+    monkeypatch.setattr(dashboard_service, "_recent_months", commit_meanwhile)
+    dashboard_service.load_dashboard(session, key)
+    assert dashboard_service.get_cached_dashboard(key) is None
+
+    monkeypatch.setattr(dashboard_service, "_recent_months", recent_months)
+    dashboard_service.load_dashboard(session, key)
+    assert dashboard_service.get_cached_dashboard(key) is not None
+    dashboard_service.invalidate_dashboard()
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from app.services import recurrence
+
 
 def test_create_and_list_events(client):
     payload = {
@@ -27,3 +29,177 @@ def test_create_and_list_events(client):
     assert list_response.status_code == 200
     events = list_response.json()
     assert any(event["title"] == "Planning" for event in events)
+
+
+def _window(client, start, end, **params):
+    response = client.get("/events", params={"start": start, "end": end, **params})
+    assert response.status_code == 200
+    return response
+
+
+def test_recurring_event_expands_with_exceptions(client):
+    payload = {
+        "title": "Swimming",
+        "start": "2031-03-03T17:00:00",
+        "end": "2031-03-03T18:00:00",
+        "rrule": "RRULE:freq=weekly;byday=MO;count=8",
+    }
+    created = client.post("/events", json=payload)
+    assert created.status_code == 201
+    series = created.json()
+    assert series["rrule"] == "FREQ=WEEKLY;BYDAY=MO;COUNT=8"
+
+    march = _window(client, "2031-03-01T00:00:00", "2031-03-31T23:59:59").json()
+    swims = [event for event in march if event["id"] == series["id"]]
+    assert [event["start"] for event in swims] == [f"2031-03-{day:02d}T17:00:00" for day in (3, 10, 17, 24, 31)]
+    assert all(event["original_start"] == event["start"] for event in swims)
+
+    moved = client.patch(
+        f"/events/{series['id']}/occurrences/2031-03-10T17:00:00",
+        json={"start": "2031-03-11T17:00:00", "end": "2031-03-11T18:00:00", "title": "Swimming (Tue)"},
+    )
+    assert moved.status_code == 200
+    assert moved.json()["recurrence_id"] == series["id"]
+    assert client.delete(f"/events/{series['id']}/occurrences/2031-03-17T17:00:00").status_code == 204
+    assert client.delete(f"/events/{series['id']}/occurrences/2031-03-18T17:00:00").status_code == 404
+
+    march = _window(client, "2031-03-01T00:00:00", "2031-03-31T23:59:59").json()
+    titles = [(event["title"], event["start"]) for event in march if series["id"] in (event["id"], event["recurrence_id"])]
+    assert titles == [
+        ("Swimming", "2031-03-03T17:00:00"),
+        ("Swimming (Tue)", "2031-03-11T17:00:00"),
+        ("Swimming", "2031-03-24T17:00:00"),
+        ("Swimming", "2031-03-31T17:00:00"),
+    ]
+
+    first_page = _window(client, "2031-03-01T00:00:00", "2031-03-31T23:59:59", limit=2)
+    second_page = _window(
+        client, "2031-03-01T00:00:00", "2031-03-31T23:59:59", limit=2, cursor=first_page.headers["X-Next-Cursor"]
+    )
+    paged = [event["start"] for event in first_page.json() + second_page.json()]
+    assert paged == [start for _, start in titles]
+
+    # Editing the series invalidates the cached expansion for the month.
+    client.patch(f"/events/{series['id']}", json={"rrule": "FREQ=WEEKLY;BYDAY=MO;COUNT=2"})
+    march = _window(client, "2031-03-01T00:00:00", "2031-03-31T23:59:59").json()
+    assert [event["start"] for event in march if event["id"] == series["id"]] == ["2031-03-03T17:00:00"]
+
+    assert client.delete(f"/events/{series['id']}").status_code == 204
+    assert _window(client, "2031-03-01T00:00:00", "2031-03-31T23:59:59").json() == []
+
+
+def test_invalid_rrule_is_rejected(client):
+    payload = {"title": "Broken", "start": "2031-01-01T09:00:00", "end": "2031-01-01T10:00:00", "rrule": "FREQ=SOMETIMES"}
+    assert client.post("/events", json=payload).status_code == 422
+    payload["rrule"] = "FREQ=MINUTELY;UNTIL=20300101T000000"
+    assert client.post("/events", json=payload).status_code == 422
+    # Degenerate rules, and rules that never occur, are rejected instead of being expanded.
+    for rule in ("FREQ=DAILY;INTERVAL=0", "FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30;COUNT=5"):
+        payload["rrule"] = rule
+        assert client.post("/events", json=payload).status_code == 422
+
+
+def test_utc_until_is_accepted(client):
+    payload = {"title": "Class", "start": "2031-01-06T09:00:00", "end": "2031-01-06T10:00:00"}
+    payload["rrule"] = "FREQ=WEEKLY;UNTIL=20310201T000000Z"
+    created = client.post("/events", json=payload)
+    assert created.status_code == 201
+    # Stored in local time, like the UNTIL of synced events.
+    assert created.json()["rrule"].startswith("FREQ=WEEKLY;UNTIL=2031") and not created.json()["rrule"].endswith("Z")
+    assert client.delete(f"/events/{created.json()['id']}").status_code == 204
+
+
+def test_dense_rules_are_bounded_without_iterating_them():
+    start = datetime(2031, 1, 1, 9)
+    assert recurrence.recurrence_end("FREQ=DAILY;UNTIL=20990101T000000", start, start) == datetime(2099, 1, 1)
+    dense = "FREQ=DAILY;BYHOUR=" + ",".join(map(str, range(24))) + ";BYMINUTE=" + ",".join(map(str, range(60)))
+    starts = recurrence.occurrence_starts(-1, dense, start, start, datetime(2032, 1, 1))
+    assert len(starts) == recurrence.MAX_WINDOW_OCCURRENCES
+    recurrence.invalidate_occurrences(-1)
+
+
+def test_ics_feed_streams_events_and_honours_etag(client):
+    series = client.post(
+        "/events",
+        json={
+            "title": "Piano; lesson",
+            "start": "2032-05-04T16:00:00",
+            "end": "2032-05-04T17:00:00",
+            "rrule": "FREQ=WEEKLY;COUNT=4",
+            "exdates": ["2032-05-11T16:00:00"],
+        },
+    ).json()
+    client.patch(f"/events/{series['id']}/occurrences/2032-05-18T16:00:00", json={"title": "Piano recital"})
+    client.post(
+        "/events", json={"title": "Holiday", "start": "2032-05-05T00:00:00", "end": "2032-05-05T00:00:00", "all_day": True}
+    )
+
+    feed = client.get("/events/feed.ics")
+    assert feed.status_code == 200
+    assert feed.headers["content-type"].startswith("text/calendar")
+    body = feed.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    uid = f"UID:event-{series['id']}@homeportal\r\n"
+    assert body.count(uid) == 2
+    assert "SUMMARY:Piano\\; lesson\r\nRRULE:FREQ=WEEKLY;COUNT=4\r\nEXDATE:20320511T160000\r\n" in body
+    assert "SUMMARY:Piano recital\r\nRECURRENCE-ID:20320518T160000\r\n" in body
+    assert "DTSTART;VALUE=DATE:20320505\r\nDTEND;VALUE=DATE:20320506\r\n" in body
+
+    etag = feed.headers["etag"]
+    cached = client.get("/events/feed.ics", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.patch(f"/events/{series['id']}", json={"title": "Piano"})
+    changed = client.get("/events/feed.ics", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    client.delete(f"/events/{series['id']}")
+
+
+def test_freebusy_merges_busy_time_and_reports_conflicts(client):
+    def add(title, start, end, assignee_id=None, **extra):
+        payload = {"title": title, "start": start, "end": end, "assignee_id": assignee_id, **extra}
+        response = client.post("/events", json=payload, params={"check_conflicts": "true"})
+        assert response.status_code == 201
+        return response.json()
+
+    add("Dentist", "2033-02-07T09:00:00", "2033-02-07T10:00:00", 901)
+    add("School run", "2033-02-07T09:30:00", "2033-02-07T11:00:00", 902)
+    add("Standup", "2033-02-07T13:00:00", "2033-02-07T13:30:00", 901, rrule="FREQ=DAILY;COUNT=5")
+    add("Family lunch", "2033-02-07T12:00:00", "2033-02-07T13:00:00")
+
+    response = client.get(
+        "/events/freebusy",
+        params={"start": "2033-02-07T08:00:00", "end": "2033-02-07T18:00:00", "assignee_id": [901, 902], "min_minutes": 30},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item["start"], item["end"]) for item in data["busy"]] == [
+        ("2033-02-07T09:00:00", "2033-02-07T11:00:00"),
+        ("2033-02-07T12:00:00", "2033-02-07T13:30:00"),
+    ]
+    assert [(item["start"], item["end"]) for item in data["free"]] == [
+        ("2033-02-07T08:00:00", "2033-02-07T09:00:00"),
+        ("2033-02-07T11:00:00", "2033-02-07T12:00:00"),
+        ("2033-02-07T13:30:00", "2033-02-07T18:00:00"),
+    ]
+    by_assignee = {item["assignee_id"]: item["busy"] for item in data["assignees"]}
+    assert [(item["start"], item["end"]) for item in by_assignee[902]] == [
+        ("2033-02-07T09:30:00", "2033-02-07T11:00:00"),
+        ("2033-02-07T12:00:00", "2033-02-07T13:00:00"),
+    ]
+
+    # Overlaps the dentist, touches the standup, and hits a later standup occurrence; 902's school run is ignored.
+    clash = add("Call", "2033-02-07T09:45:00", "2033-02-07T10:15:00", 901)
+    assert [event["title"] for event in clash["conflicts"]] == ["Dentist"]
+    weekly = add("Gym", "2033-02-01T13:15:00", "2033-02-01T14:00:00", 901, rrule="FREQ=WEEKLY;COUNT=3")
+    assert [(event["title"], event["start"]) for event in weekly["conflicts"]] == [
+        ("Standup", "2033-02-08T13:00:00")
+    ]
+    moved = client.patch(
+        f"/events/{clash['id']}", json={"start": "2033-02-07T11:00:00", "end": "2033-02-07T12:00:00"},
+        params={"check_conflicts": "true"},
+    )
+    assert moved.json()["conflicts"] == []
+    assert client.get("/events/freebusy", params={"start": "2033-02-07T10:00:00", "end": "2033-02-07T09:00:00"}).status_code == 422
@@ -0,0 +1,165 @@
+import hashlib
+from contextlib import contextmanager
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.file import File
+from app.services import file_indexer
+from app.services import files as file_service
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+
+def test_uploads_are_deduplicated_and_served_with_ranges(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_directory", tmp_path)
+    content = bytes(range(256)) * 8
+    checksum = hashlib.sha256(content).hexdigest()
+
+    first = client.put("/files/docs/manual.pdf", content=content, headers=HEADERS, params={"tags": ["home"]})
+    assert first.status_code == 201
+    assert first.json()["checksum"] == checksum and first.json()["size"] == len(content)
+    assert first.json()["content_type"] == "application/pdf"
+    assert client.put("/files/copy/manual.pdf", content=content, headers=HEADERS).status_code == 201
+    assert client.put("/files/third/manual.pdf", content=content, headers=HEADERS).status_code == 201
+    blob = file_service.blob_path(checksum, tmp_path)
+    # Three paths, one copy on disk: a read-only blob and nothing in the tree.
+    stored = [path for path in tmp_path.rglob("*") if path.is_file()]
+    assert stored == [blob] and blob.stat().st_nlink == 1 and not blob.stat().st_mode & 0o222
+    assert client.get("/files/third/manual.pdf").content == content
+    assert client.delete("/files/third/manual.pdf", headers=HEADERS).status_code == 204
+
+    full = client.get("/files/docs/manual.pdf")
+    assert full.status_code == 200 and full.content == content
+    assert full.headers["etag"] == f'"{checksum}"' and full.headers["accept-ranges"] == "bytes"
+    assert client.get("/files/docs/manual.pdf", headers={"If-None-Match": full.headers["etag"]}).status_code == 304
+
+    partial = client.get("/files/docs/manual.pdf", headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206 and partial.content == content[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(content)}"
+    assert client.get("/files/docs/manual.pdf", headers={"Range": "bytes=-5"}).content == content[-5:]
+    stale = client.get("/files/docs/manual.pdf", headers={"Range": "bytes=0-1", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == content
+    unsatisfiable = client.get("/files/docs/manual.pdf", headers={"Range": f"bytes={len(content)}-"})
+    assert unsatisfiable.status_code == 416 and unsatisfiable.headers["content-range"] == f"bytes */{len(content)}"
+    assert client.put("/files/empty.txt", content=b"", headers=HEADERS).status_code == 201
+    empty = client.get("/files/empty.txt", headers={"Range": "bytes=-5"})
+    assert empty.status_code == 416 and empty.headers["content-range"] == "bytes */0"
+    assert client.delete("/files/empty.txt", headers=HEADERS).status_code == 204
+
+    # Replacing the content releases the old blob once no row refers to it.
+    assert client.put("/files/copy/manual.pdf", content=b"new", headers=HEADERS).status_code == 200
+    assert blob.exists()
+    assert client.delete("/files/docs/manual.pdf", headers=HEADERS).status_code == 204
+    assert not blob.exists()
+    assert client.get("/files/docs/manual.pdf").status_code == 404
+    assert client.delete("/files/copy/manual.pdf", headers=HEADERS).status_code == 204
+    assert client.get("/files").json() == []
+
+
+def test_upload_pins_its_blob_until_its_row_is_committed(client, session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_directory", tmp_path)
+    assert client.put("/files/a.txt", content=b"shared", headers=HEADERS).status_code == 201
+    writer = file_service.BlobWriter(tmp_path)
+    writer.write(b"shared")
+    checksum, size = writer.commit()
+    blob = file_service.blob_path(checksum, tmp_path)
+
+    # The only row with that content goes away between the upload's commit and store_file.
+    assert client.delete("/files/a.txt", headers=HEADERS).status_code == 204
+    assert blob.exists()
+    file_service.store_file(session, "b.txt", checksum, size, "text/plain", root=tmp_path)
+    writer.unpin()
+    assert blob.stat().st_nlink == 1 and client.get("/files/b.txt").content == b"shared"
+
+    # Removed by another process meanwhile: the pin restores the blob once the row is committed.
+    writer = file_service.BlobWriter(tmp_path)
+    writer.write(b"shared")
+    writer.commit()
+    blob.unlink()
+    file_service.store_file(session, "c.txt", checksum, size, "text/plain", root=tmp_path)
+    writer.unpin()
+    assert client.get("/files/c.txt").content == b"shared"
+    assert not any((tmp_path / file_service.TEMP_DIRECTORY).iterdir())
+
+    assert client.delete("/files/b.txt", headers=HEADERS).status_code == 204
+    assert client.delete("/files/c.txt", headers=HEADERS).status_code == 204
+    assert not blob.exists()
+
+
+def test_upload_rejects_unsafe_paths_and_oversized_bodies(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "uploads_directory", tmp_path)
+    monkeypatch.setattr(settings, "upload_max_bytes", 4)
+    assert client.put("/files/.blobs/x", content=b"x", headers=HEADERS).status_code == 422
+    assert client.put("/files/a/../../etc", content=b"x", headers=HEADERS).status_code in (404, 422)
+    assert client.put("/files/big.bin", content=b"12345", headers=HEADERS).status_code == 413
+    # Without a Content-Length the limit is enforced while streaming.
+    chunked = client.put("/files/big.bin", content=iter([b"123", b"45"]), headers=HEADERS)
+    assert chunked.status_code == 413
+    assert not any((tmp_path / file_service.TEMP_DIRECTORY).iterdir())
+
+
+def test_indexer_hashes_only_new_or_changed_files(session, tmp_path, monkeypatch):
+    # Hash on a two-process pool even for this small tree.
+    monkeypatch.setattr(file_indexer, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(file_indexer.os, "cpu_count", lambda: 2)
+    (tmp_path / "photos").mkdir()
+    (tmp_path / "photos/a.jpg").write_bytes(b"same")
+    (tmp_path / "b.jpg").write_bytes(b"same")
+    (tmp_path / ".hidden").write_bytes(b"skipped")
+
+    @contextmanager
+    def test_session_scope():
+        yield session
+
+    def index(**options):
+        return file_indexer.index_files(
+            tmp_path, session_factory=test_session_scope, read_session_factory=test_session_scope, **options
+        )
+
+    report = index(workers=2)
+    assert (report.scanned, report.hashed, report.created) == (2, 2, 2)
+    # The content is copied into one private blob; the tree files stay separate.
+    blob = file_service.blob_path(hashlib.sha256(b"same").hexdigest(), tmp_path)
+    assert blob.read_bytes() == b"same" and blob.stat().st_nlink == 1
+    assert file_service.get_file(session, "photos/a.jpg").content_type == "image/jpeg"
+
+    assert index().hashed == 0
+
+    # Content that is already stored is hashed but not copied again.
+    copies = []
+    blob_writer = file_service.BlobWriter
+    monkeypatch.setattr(file_service, "BlobWriter", lambda *args: copies.append(args))
+    (tmp_path / "c.jpg").write_bytes(b"same")
+    assert index().created == 1 and copies == []
+    monkeypatch.setattr(file_service, "BlobWriter", blob_writer)
+    assert not any((tmp_path / file_service.TEMP_DIRECTORY).iterdir())
+
+    # Edited in place: the blob of the old content is untouched and still serves b.jpg.
+    session.execute(update(File).where(File.path == "photos/a.jpg").values(content_type="text/plain"))
+    session.commit()
+    with (tmp_path / "photos/a.jpg").open("wb") as edited:
+        edited.write(b"changed")
+    report = index()
+    assert (report.hashed, report.updated) == (1, 1)
+    assert blob.read_bytes() == b"same"
+    record = file_service.get_file(session, "photos/a.jpg")
+    session.refresh(record)
+    assert record.checksum == hashlib.sha256(b"changed").hexdigest() and record.content_type == "image/jpeg"
+
+    (tmp_path / "b.jpg").unlink()
+    (tmp_path / "c.jpg").unlink()
+    assert index().deleted == 2
+    assert not blob.exists()
+
+    # An uploaded file exists only as its blob, which the indexer must not take for a deleted file.
+    writer = file_service.BlobWriter(tmp_path)
+    writer.write(b"uploaded")
+    checksum, size = writer.commit()
+    file_service.store_file(session, "uploaded.txt", checksum, size, "text/plain", root=tmp_path)
+    writer.unpin()
+    assert index().deleted == 0
+    file_service.delete_file(session, "uploaded.txt", tmp_path)
+
+    (tmp_path / "photos/a.jpg").unlink()
+    assert index(collect_blobs=True).deleted == 1
@@ -17,3 +17,73 @@ def test_create_and_click_link(client):
     assert list_response.status_code == 200
     assert len(list_response.json()) == 1
 
+
+def test_search_links_ranks_matches_and_filters_tags(client):
+    headers = {"Authorization": "Bearer test-token"}
+    for title, url, tags in [
+        ("School newsletter", "https://school.example.com/news", ["kids"]),
+        ("Garbage schedule", "https://city.example.com/schedule", ["home", "kids-club"]),
+        ("学校の連絡網", "https://school.example.jp/renraku", ["kids"]),
+    ]:
+        assert client.post("/links", json={"title": title, "url": url, "tags": tags}, headers=headers).status_code == 201
+
+    results = client.get("/links/search", params={"q": "school"}).json()["results"]
+    assert results[0]["title"] == "School newsletter"
+    assert "<mark>" in results[0]["snippet"]
+    assert {result["title"] for result in results} == {"School newsletter", "学校の連絡網"}
+
+    results = client.get("/links/search", params={"q": "学校の"}).json()["results"]
+    assert [result["title"] for result in results] == ["学校の連絡網"]
+
+    # Tags match whole elements, so "kids" must not match "kids-club".
+    results = client.get("/links/search", params={"tags": ["kids"]}).json()["results"]
+    assert {result["title"] for result in results} == {"School newsletter", "学校の連絡網"}
+
+    link_id = results[0]["id"]
+    client.patch(f"/links/{link_id}", json={"title": "Renamed entry"})
+    results = client.get("/links/search", params={"q": "renamed"}).json()["results"]
+    assert [result["id"] for result in results] == [link_id]
+
+
+def test_tag_facets_and_multi_tag_filters(client):
+    headers = {"Authorization": "Bearer test-token"}
+    created = {}
+    for title, tags in [("Pediatrician", ["health", "kids"]), ("Pharmacy", ["health"]), ("Playground map", ["kids"])]:
+        response = client.post("/links", json={"title": title, "url": "https://facets.example.com", "tags": tags}, headers=headers)
+        created[title] = response.json()["id"]
+
+    facets = {item["name"]: item["count"] for item in client.get("/links/tags").json()["items"]}
+    assert facets["health"] == 2
+
+    both = client.get("/links/search", params={"tags": ["health", "kids"]}).json()["results"]
+    assert [result["title"] for result in both] == ["Pediatrician"]
+    either = client.get("/links/search", params={"tags": ["health", "kids"], "tag_mode": "any", "q": "facets"}).json()
+    assert {result["title"] for result in either["results"]} == {"Pediatrician", "Pharmacy", "Playground map"}
+
+    client.patch(f"/links/{created['Pharmacy']}", json={"tags": ["shopping"]})
+    client.delete(f"/links/{created['Pediatrician']}")
+    facets = {item["name"]: item["count"] for item in client.get("/links/tags").json()["items"]}
+    assert "health" not in facets
+    assert facets["shopping"] == 1
+
+
+def test_clicks_are_buffered_and_flushed_in_one_batch(client, session):
+    from app.services.clicks import click_aggregator
+
+    headers = {"Authorization": "Bearer test-token"}
+    first = client.post("/links", json={"title": "Clicked A", "url": "https://a.example.com"}, headers=headers).json()
+    second = client.post("/links", json={"title": "Clicked B", "url": "https://b.example.com"}, headers=headers).json()
+    click_aggregator.flush(session)
+
+    for _ in range(3):
+        response = client.post(f"/links/{first['id']}/click")
+    assert response.json()["click_count"] == 3
+    assert client.post(f"/links/{second['id']}/click").json()["click_count"] == 1
+    assert client.post("/links/999999/click").status_code == 404
+
+    assert click_aggregator.flush(session) == 4
+    assert click_aggregator.pending(first["id"]) is None
+    counts = {link["id"]: link for link in client.get("/links").json()}
+    assert counts[first["id"]]["click_count"] == 3
+    assert counts[first["id"]]["last_accessed_at"] is not None
+    assert counts[second["id"]]["click_count"] == 1
@@ -0,0 +1,49 @@
+def _walk(client, path, **params):
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return items
+
+
+def test_todo_pages_follow_status_due_title_order(client):
+    headers = {"Authorization": "Bearer test-token"}
+    for title, status, due in [
+        ("Recycling", "open", None),
+        ("Dentist", "open", "2024-03-01T09:00:00"),
+        ("Taxes", "open", "2024-02-15T00:00:00"),
+        ("Bills", "open", "2024-02-15T00:00:00"),
+        ("Groceries", "open", None),
+        ("Laundry", "done", None),
+        ("Passport", "done", "2024-01-05T00:00:00"),
+    ]:
+        payload = {"title": title, "status": status, "due": due}
+        assert client.post("/todos", json=payload, headers=headers).status_code == 201
+
+    full = client.get("/todos").json()
+    assert "X-Next-Cursor" not in client.get("/todos").headers
+    assert [todo["title"] for todo in full][-7:] == [
+        "Passport", "Laundry", "Bills", "Taxes", "Dentist", "Groceries", "Recycling"
+    ]
+    assert _walk(client, "/todos", limit=2) == full
+
+
+def test_field_projection_and_cursor_errors(client):
+    headers = {"Authorization": "Bearer test-token"}
+    for name in ["Clinic", "Bakery", "Library"]:
+        payload = {"name": name, "category": "town", "phone": "000"}
+        assert client.post("/contacts", json=payload, headers=headers).status_code == 201
+
+    response = client.get("/contacts", params={"limit": 2, "fields": "name,category"})
+    assert response.status_code == 200
+    assert [set(item) for item in response.json()] == [{"id", "name", "category"}] * 2
+    rest = client.get("/contacts", params={"fields": "name", "cursor": response.headers["X-Next-Cursor"]}).json()
+    names = [item["name"] for item in response.json() + rest]
+    assert names == sorted(names)
+
+    assert client.get("/contacts", params={"fields": "name,secret"}).status_code == 422
+    assert client.get("/users", params={"fields": "password_hash"}).status_code == 422
+    assert client.get("/contacts", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,105 @@
+import re
+from datetime import date, datetime
+from typing import Callable, List, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.services import assets as asset_service
+from app.services import audit_archive
+from app.services import contacts as contact_service
+from app.services import dashboard as dashboard_service
+from app.services import events as event_service
+from app.services import files as file_service
+from app.services import freebusy as freebusy_service
+from app.services import links as link_service
+from app.services import tags as tag_service
+from app.services import todo_recurrence
+from app.services import todos as todo_service
+from app.services import users as user_service
+from app.services.pagination import encode_cursor
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+SERVICE_QUERIES: List[Tuple[str, Callable[[Session], object]]] = [
+    ("list_links", lambda session: link_service.list_links(session)),
+    ("list_links_page", lambda session: link_service.list_links(session, 20, encode_cursor(["Calendar", 7]))),
+    ("list_links_fields", lambda session: link_service.list_links(session, 20, None, ["id", "title"])),
+    ("search_links", lambda session: link_service.search_links(session, "calendar", None)),
+    ("search_links_short_term", lambda session: link_service.search_links(session, "tv", None)),
+    ("search_links_tags", lambda session: link_service.search_links(session, "calendar", ["family", "kids"])),
+    ("search_links_any_tag", lambda session: link_service.search_links(session, None, ["family", "kids"], 50, "any")),
+    ("link_tag_facets", lambda session: tag_service.link_tag_facets(session)),
+    ("list_contacts", lambda session: contact_service.list_contacts(session)),
+    (
+        "list_contacts_page",
+        lambda session: contact_service.list_contacts(session, 20, encode_cursor(["school", "Hana", 3])),
+    ),
+    ("list_events", lambda session: event_service.list_events(session, None, None)),
+    (
+        "list_events_window",
+        lambda session: event_service.list_events(session, "2024-01-01T00:00:00", "2024-02-01T00:00:00"),
+    ),
+    ("list_events_from", lambda session: event_service.list_events(session, "2024-01-01T00:00:00", None)),
+    (
+        "list_events_window_page",
+        lambda session: event_service.list_events(
+            session, "2024-01-01T00:00:00", "2024-02-01T00:00:00", 20, encode_cursor([{"dt": "2024-01-05T00:00:00"}, 3])
+        ),
+    ),
+    (
+        "free_busy_assignees",
+        lambda session: freebusy_service.free_busy(session, datetime(2024, 1, 1), datetime(2024, 1, 8), [1, 2]),
+    ),
+    ("list_todos", lambda session: todo_service.list_todos(session)),
+    (
+        "list_todos_page",
+        lambda session: todo_service.list_todos(session, 20, encode_cursor(["open", {"dt": "2024-01-01T00:00:00"}, "b", 4])),
+    ),
+    ("todo_catch_up", lambda session: todo_recurrence.catch_up(session, datetime(2024, 1, 1))),
+    ("load_dashboard", lambda session: dashboard_service.load_dashboard(session, (date(2024, 1, 1), 8, 20, 10, 3))),
+    ("archive_audit_log", lambda session: audit_archive.archive_audit_log(session, datetime(2000, 1, 1))),
+    ("query_audit_entity", lambda session: audit_archive.query_audit(session, "todo", "1", limit=1)),
+    ("query_audit_recent", lambda session: audit_archive.query_audit(session, since=datetime(2099, 1, 1), limit=1)),
+    (
+        "query_audit_page",
+        lambda session: audit_archive.query_audit(session, "todo", "1", until=datetime(2099, 1, 1), limit=1, before_id=5),
+    ),
+    ("list_files_page", lambda session: file_service.list_files(session, 20, encode_cursor(["docs/a.pdf", 3]))),
+    ("ensure_file_writable", lambda session: file_service.ensure_writable(session, "docs/a.pdf")),
+    ("list_users", lambda session: user_service.list_users(session)),
+    ("get_user_by_email", lambda session: user_service.get_user_by_email(session, "someone@example.com")),
+    ("list_snapshots", lambda session: asset_service.list_snapshots(session)),
+    ("summarize_assets", lambda session: asset_service.summarize_assets(session, "2024-01", "2024-06")),
+    ("aggregate_monthly_totals", lambda session: asset_service.aggregate_monthly_totals(session, "2024-01", "2024-06")),
+]
+
+
+def _captured_selects(engine, call: Callable[[Session], object]) -> List[Tuple[str, object]]:
+    statements: List[Tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            call(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+@pytest.mark.parametrize("name,call", SERVICE_QUERIES, ids=[name for name, _ in SERVICE_QUERIES])
+def test_service_queries_use_indexes(engine, name, call):
+    statements = _captured_selects(engine, call)
+    assert statements, f"{name} emitted no SELECT"
+
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            details = [row[3] for row in plan]
+            scans = [detail for detail in details if FULL_SCAN.match(detail)]
+            assert not scans, f"{name} falls back to a full table scan: {details}\n{statement}"
@@ -0,0 +1,27 @@
+import asyncio
+import threading
+import time
+
+from app.core.tasks import PeriodicTask
+
+
+def test_stop_waits_for_the_run_in_progress_before_the_final_run():
+    calls = []
+    started = threading.Event()
+
+    def callback():
+        calls.append("start")
+        started.set()
+        time.sleep(0.2)
+        calls.append("end")
+
+    async def scenario():
+        task = PeriodicTask("test", 3600, callback)
+        task.start()
+        task.wake()
+        await asyncio.to_thread(started.wait)
+        await task.stop()
+        return calls[:]
+
+    # The final run starts only after the interrupted one has finished.
+    assert asyncio.run(scenario()) == ["start", "end", "start", "end"]
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from sqlmodel import select
+
+from app.models.todo import Todo
+from app.services import todo_recurrence
+
+
+def test_completing_a_repeating_todo_spawns_the_next_instance(client):
+    created = client.post("/todos", json={"title": "Trash", "due": "2034-03-06T08:00:00", "repeat_rule": "毎週月・木曜"})
+    assert created.status_code == 201
+    todo = created.json()
+    assert todo["series_id"] == todo["id"]
+
+    done = client.patch(f"/todos/{todo['id']}", json={"status": "done"})
+    assert done.status_code == 200
+    # Completing again (or re-saving a done todo) does not spawn a second instance.
+    client.patch(f"/todos/{todo['id']}", json={"status": "open"})
+    client.patch(f"/todos/{todo['id']}", json={"status": "done"})
+
+    series = [item for item in client.get("/todos").json() if item["series_id"] == todo["id"]]
+    assert [(item["status"], item["due"]) for item in series] == [
+        ("done", "2034-03-06T08:00:00"),
+        ("open", "2034-03-09T08:00:00"),
+    ]
+
+    assert client.post("/todos", json={"title": "Bad", "repeat_rule": "sometimes"}).status_code == 422
+    assert client.patch(f"/todos/{todo['id']}", json={"repeat_rule": "FREQ=DAILY;COUNT=3"}).status_code == 422
+    # A zero interval would never advance past the due date.
+    for rule in ("every 0 days", "0日ごと", "FREQ=DAILY;INTERVAL=0"):
+        payload = {"title": "Bad", "due": "2034-03-06T08:00:00", "repeat_rule": rule}
+        assert client.post("/todos", json=payload).status_code == 422
+
+
+def test_catch_up_creates_every_due_instance_once(session):
+    daily = Todo(title="Medicine", due=datetime(2033, 1, 1, 9), repeat_rule="daily")
+    monthly = Todo(title="Rent", due=datetime(2033, 1, 31, 12), repeat_rule="毎月末")
+    finished = Todo(title="Pack", due=datetime(2033, 1, 2), repeat_rule="FREQ=DAILY;UNTIL=20330102T000000")
+    session.add_all([daily, monthly, finished])
+    session.flush()
+    for todo in (daily, monthly, finished):
+        todo.series_id = todo.id
+    finished.status = "done"
+    session.commit()
+
+    now = datetime(2033, 1, 4, 10)
+    assert todo_recurrence.catch_up(session, now) == 3
+    assert todo_recurrence.catch_up(session, now) == 0
+
+    def instances(series_id):
+        statement = select(Todo).where(Todo.series_id == series_id).order_by(Todo.due)
+        return [(todo.due.day, todo.spawned_next) for todo in session.exec(statement).all()]
+
+    assert instances(daily.id) == [(1, True), (2, True), (3, True), (4, False)]
+    assert instances(monthly.id) == [(31, False)]
+    assert instances(finished.id) == [(2, True)]
+
+    # Completing the head spawns the next day; the following pass only adds what has come due since.
+    latest = session.exec(select(Todo).where(Todo.series_id == daily.id, Todo.spawned_next.is_(False))).one()
+    latest.status = "done"
+    todo_recurrence.spawn_next(session, latest)
+    session.commit()
+    assert todo_recurrence.catch_up(session, datetime(2033, 1, 6, 10)) == 1
+    assert [day for day, _ in instances(daily.id)] == [1, 2, 3, 4, 5, 6]